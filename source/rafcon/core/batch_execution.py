@@ -0,0 +1,299 @@
+# Copyright (C) 2014-2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: batch_execution
+   :synopsis: Headless execution of many state machines on a pool of worker processes
+
+The core singletons allow only one running state machine per process. Instead of starting an interpreter per run, the
+batch runner keeps a pool of worker processes. Each worker sets up the environment and loads the configuration once,
+reuses the loaded libraries for all its jobs and resets the state machine manager, the execution engine and the global
+variables after each job.
+
+A job is a dict with the ``state_machine_path`` and optionally the ``inputs`` (values for the input data ports of the
+root state, by name) and the ``start_state_path``. The results of all jobs are merged into one summary.
+"""
+
+import argparse
+import copy
+import json
+import multiprocessing
+import os
+import pickle
+import time
+from collections import Counter
+
+from rafcon.utils import log
+logger = log.get_logger(__name__)
+
+# the timeout of a job, set by the initializer of the worker process
+_job_timeout = None
+
+# the state machines loaded by the worker process, the jobs are executed on copies of them
+_state_machine_templates = {}
+
+
+def _initialize_worker(config_path, timeout, config_values=None):
+    """Sets up the environment of a worker process and loads the configuration and libraries once
+
+    :param str config_path: path to the config.yaml, None for the default config path of the user
+    :param float timeout: the maximum duration of a job in seconds or None
+    :param dict config_values: config values overriding the ones loaded from the config file
+    """
+    global _job_timeout
+    from rafcon.core.start import setup_environment, setup_configuration
+    setup_environment()
+    setup_configuration(config_path, config_values)
+    _job_timeout = timeout
+
+
+def _get_picklable_data(data):
+    """Returns the data in a form that can be sent to the parent process"""
+    picklable_data = {}
+    for key, value in data.items():
+        try:
+            pickle.dumps(value)
+            picklable_data[key] = value
+        except Exception:
+            picklable_data[key] = repr(value)
+    return picklable_data
+
+
+def set_root_state_inputs(state_machine, inputs):
+    """Uses the inputs as default values of the input data ports of the root state
+
+    The root state gets its input data from the default values of its input data ports.
+
+    :param rafcon.core.state_machine.StateMachine state_machine: the state machine to be executed
+    :param dict inputs: the input values by the names of the input data ports
+    :raises ValueError: if the root state has no input data port with one of the names
+    """
+    input_data_ports = {port.name: port for port in state_machine.root_state.input_data_ports.values()}
+    for name, value in (inputs or {}).items():
+        if name not in input_data_ports:
+            raise ValueError("The root state has no input data port '{0}'".format(name))
+        input_data_ports[name].default_value = value
+
+
+def reset_core_singletons():
+    """Stops the execution and removes all state machines and global variables
+
+    The library manager is not reset, thus already loaded libraries are reused by the next run.
+    """
+    import rafcon.core.singleton as core_singletons
+    execution_engine = core_singletons.state_machine_execution_engine
+    if not execution_engine.finished_or_stopped():
+        execution_engine.stop()
+        execution_engine.join()
+    core_singletons.state_machine_manager.active_state_machine_id = None
+    core_singletons.state_machine_manager.delete_all_state_machines()
+    core_singletons.global_variable_manager.reset()
+
+
+def create_run_result(state_machine_path, inputs):
+    """Returns the result of a run, which is filled by :func:`complete_run_result`"""
+    return {'state_machine_path': state_machine_path, 'inputs': inputs or {}, 'outcome': None, 'outcome_id': None,
+            'output_data': {}, 'duration': None, 'execution_log': None, 'error': None, 'worker': os.getpid()}
+
+
+def complete_run_result(result, state_machine, duration):
+    """Adds the final outcome, the output data and the execution log path of the finished run to the result
+
+    :param dict result: the result created by :func:`create_run_result`
+    :param rafcon.core.state_machine.StateMachine state_machine: the executed state machine
+    :param float duration: the duration of the run in seconds
+    """
+    result['duration'] = duration
+    root_state = state_machine.root_state
+    if root_state.final_outcome is not None:
+        result['outcome'] = root_state.final_outcome.name
+        result['outcome_id'] = root_state.final_outcome.outcome_id
+    result['output_data'] = _get_picklable_data(root_state.output_data or {})
+    result['execution_log'] = state_machine.get_last_execution_log_filename()
+
+
+def run_job(job, timeout=None, state_machine=None):
+    """Executes one job in the current process and returns its result
+
+    :param dict job: the job with the ``state_machine_path`` and optionally ``inputs`` and ``start_state_path``
+    :param float timeout: the maximum duration of the execution in seconds, None to wait infinitely
+    :param rafcon.core.state_machine.StateMachine state_machine: the state machine to be executed, if it is not
+        loaded from the ``state_machine_path`` of the job
+    :return: the result with the final outcome, the duration, the output data and the execution log path of the run
+    :rtype: dict
+    """
+    import rafcon.core.singleton as core_singletons
+    from rafcon.core.storage import storage
+    result = create_run_result(job['state_machine_path'], job.get('inputs'))
+    try:
+        if state_machine is None:
+            state_machine = storage.load_state_machine_from_path(job['state_machine_path'])
+        set_root_state_inputs(state_machine, job.get('inputs'))
+        core_singletons.state_machine_manager.add_state_machine(state_machine)
+        execution_engine = core_singletons.state_machine_execution_engine
+        start_time = time.time()
+        execution_engine.start(state_machine.state_machine_id, start_state_path=job.get('start_state_path'))
+        if not execution_engine.join(timeout):
+            execution_engine.stop()
+            execution_engine.join()
+            result['error'] = "Timeout after {0} s".format(timeout)
+        complete_run_result(result, state_machine, time.time() - start_time)
+    except Exception as e:
+        logger.exception("The job {0} failed".format(job))
+        result['error'] = "{0}: {1}".format(type(e).__name__, e)
+    finally:
+        reset_core_singletons()
+    return result
+
+
+def _run_job_in_worker(indexed_job):
+    index, job = indexed_job
+    state_machine_path = job['state_machine_path']
+    try:
+        if state_machine_path not in _state_machine_templates:
+            from rafcon.core.storage import storage
+            _state_machine_templates[state_machine_path] = storage.load_state_machine_from_path(state_machine_path)
+        state_machine = copy.copy(_state_machine_templates[state_machine_path])
+    except Exception as e:
+        logger.exception("The state machine {0} could not be loaded".format(state_machine_path))
+        result = create_run_result(state_machine_path, job.get('inputs'))
+        result['error'] = "{0}: {1}".format(type(e).__name__, e)
+        return index, result
+    return index, run_job(job, _job_timeout, state_machine)
+
+
+def is_successful(result):
+    """A run is successful if it ended without error in an outcome that is not aborted or preempted"""
+    return result['error'] is None and result['outcome_id'] is not None and result['outcome_id'] >= 0
+
+
+def create_summary(results, wall_time):
+    """Merges the results of all runs into one summary
+
+    :param list results: the results of the runs in the order of the jobs
+    :param float wall_time: the duration of the whole batch in seconds
+    :rtype: dict
+    """
+    durations = [result['duration'] for result in results if result['duration'] is not None]
+    return {
+        'jobs': len(results),
+        'succeeded': sum(1 for result in results if is_successful(result)),
+        'failed': sum(1 for result in results if not is_successful(result)),
+        'outcomes': dict(Counter(str(result['outcome']) for result in results)),
+        'wall_time': wall_time,
+        'total_duration': sum(durations),
+        'max_duration': max(durations) if durations else None,
+        'results': results,
+    }
+
+
+def iter_batch(jobs, number_of_workers=None, config_path=None, timeout=None, start_method='spawn',
+               config_values=None):
+    """Executes the jobs on a pool of worker processes and yields the results as the runs complete
+
+    :param list jobs: the jobs, each a dict with the ``state_machine_path`` and optionally ``inputs`` and
+        ``start_state_path``
+    :param int number_of_workers: the number of worker processes, defaults to the number of CPUs
+    :param str config_path: path to the config.yaml used by the workers, None for the default config path of the user
+    :param float timeout: the maximum duration of each run in seconds, None to wait infinitely
+    :param str start_method: the multiprocessing start method of the workers; 'spawn' does not inherit the threads and
+        singletons of the calling process
+    :param dict config_values: config values overriding the ones loaded by the workers from the config file
+    :return: a generator of tuples of the index of the job and its result
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    if number_of_workers is None:
+        number_of_workers = multiprocessing.cpu_count()
+    number_of_workers = max(1, min(number_of_workers, len(jobs)))
+    context = multiprocessing.get_context(start_method)
+    pool = context.Pool(number_of_workers, initializer=_initialize_worker,
+                        initargs=(config_path, timeout, config_values))
+    try:
+        for index, result in pool.imap_unordered(_run_job_in_worker, enumerate(jobs)):
+            yield index, result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def run_batch(jobs, number_of_workers=None, config_path=None, timeout=None, start_method='spawn',
+              config_values=None):
+    """Executes the jobs on a pool of worker processes
+
+    The parameters are described in :func:`iter_batch`.
+
+    :return: the summary of all runs, see :func:`create_summary`
+    :rtype: dict
+    """
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+    start_time = time.time()
+    for index, result in iter_batch(jobs, number_of_workers, config_path, timeout, start_method,
+                                    config_values):
+        results[index] = result
+        logger.info("Finished job {0}/{1} ({2}): {3}".format(
+            index + 1, len(jobs), result['state_machine_path'],
+            result['outcome'] if result['error'] is None else result['error']))
+    return create_summary(results, time.time() - start_time)
+
+
+def create_jobs(state_machine_paths, input_sets=None, start_state_path=None):
+    """Creates a job for each combination of state machine and input set
+
+    :param list state_machine_paths: the paths of the state machines
+    :param list input_sets: dicts with the input values of the root states, None to use the default values
+    :param str start_state_path: the path of the state from which the executions start
+    :rtype: list
+    """
+    return [{'state_machine_path': state_machine_path, 'inputs': inputs, 'start_state_path': start_state_path}
+            for state_machine_path in state_machine_paths for inputs in (input_sets or [{}])]
+
+
+def main(optional_args=None):
+    """Executes the passed state machines with all input sets and writes the summary"""
+    from yaml_configuration.config import config_path
+    from rafcon.core.start import parse_state_machine_path
+    from rafcon.utils.filesystem import get_default_config_path
+
+    parser = argparse.ArgumentParser(description="Execute state machines headless on a pool of worker processes")
+    parser.add_argument('state_machine_paths', metavar='path', nargs='+', type=parse_state_machine_path,
+                        help="directories of the state machines to be executed")
+    parser.add_argument('-i', '--inputs', dest='inputs_path', metavar='path', default=None,
+                        help="JSON file with a list of input sets, each a dict with the input values of the root state "
+                             "by port name; each state machine is executed once per input set")
+    parser.add_argument('-j', '--jobs', dest='number_of_workers', type=int, default=None,
+                        help="number of worker processes, defaults to the number of CPUs")
+    parser.add_argument('-c', '--config', dest='config_path', type=config_path, default=get_default_config_path(),
+                        metavar='path', help="path to the configuration file config.yaml")
+    parser.add_argument('-s', '--start_state_path', dest='start_state_path', default=None, metavar='path',
+                        help="path within the state machines to the state that should be launched")
+    parser.add_argument('-t', '--timeout', dest='timeout', type=float, default=None,
+                        help="maximum duration of each run in seconds")
+    parser.add_argument('--summary', dest='summary_path', metavar='path', default=None,
+                        help="JSON file the summary is written to")
+    user_input = parser.parse_args(optional_args)
+
+    input_sets = None
+    if user_input.inputs_path:
+        with open(user_input.inputs_path) as inputs_file:
+            input_sets = json.load(inputs_file)
+    jobs = create_jobs(user_input.state_machine_paths, input_sets, user_input.start_state_path)
+    summary = run_batch(jobs, user_input.number_of_workers, user_input.config_path, user_input.timeout)
+
+    logger.info("{0} of {1} runs succeeded in {2:.3f} s, outcomes: {3}".format(
+        summary['succeeded'], summary['jobs'], summary['wall_time'], summary['outcomes']))
+    if user_input.summary_path:
+        with open(user_input.summary_path, 'w') as summary_file:
+            json.dump(summary, summary_file, indent=4, default=repr)
+        logger.info("Summary written to {0}".format(user_input.summary_path))
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    exit(main())
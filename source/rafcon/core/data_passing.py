@@ -0,0 +1,256 @@
+# Copyright (C) 2014-2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: data_passing
+   :synopsis: A module to define how data is passed between the states of a state machine
+
+The data passing policy defines how values are handed from one state to another through data flows and how they are
+stored in the execution history:
+
+* ``DEEPCOPY``: every consumer receives its own deep copy of the value (the classical behaviour)
+* ``COPY_ON_WRITE``: a value is copied once, when it is written to the scoped data. All consumers share this immutable
+  snapshot: dicts, lists and sets are converted into their frozen subclasses and numpy arrays are made read-only, so
+  that in-place modifications fail and a script has to create a copy (e.g. with ``copy.deepcopy``) before writing.
+  Values that cannot be frozen, like instances of custom classes, are still copied for each consumer.
+* ``BY_REFERENCE``: values of registered reference types (immutable builtin types and numpy types by default) are
+  passed by reference without being copied. All other values are deep-copied.
+
+The policy can be set per data port, per state machine and globally with the ``DATA_PASSING_POLICY`` config value. The
+policy of a data port defines how the values written by that port are passed on.
+"""
+
+import sys
+from copy import deepcopy
+from enum import Enum
+
+from rafcon.core.config import global_config
+
+DataPassingPolicy = Enum('DATA_PASSING_POLICY', 'DEEPCOPY COPY_ON_WRITE BY_REFERENCE')
+
+# values of these types cannot be changed and are thus never copied
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, range)
+
+_reference_types = set(IMMUTABLE_TYPES)
+
+
+def _get_numpy():
+    """Returns the numpy module if it was imported by anyone, as otherwise no value can be a numpy type"""
+    return sys.modules.get('numpy')
+
+
+def register_reference_type(data_type):
+    """Registers a type whose values are passed by reference with the ``BY_REFERENCE`` policy
+
+    :param type data_type: the type to register, subclasses are registered implicitly
+    """
+    if not isinstance(data_type, type):
+        raise TypeError("data_type must be a type")
+    _reference_types.add(data_type)
+
+
+def unregister_reference_type(data_type):
+    """Removes a type from the types whose values are passed by reference
+
+    :param type data_type: the type to unregister
+    """
+    _reference_types.discard(data_type)
+
+
+def is_reference_type(value):
+    """Checks whether a value is of a registered reference type
+
+    :param value: the value to check
+    :return: True if the value can be passed by reference with the ``BY_REFERENCE`` policy
+    :rtype: bool
+    """
+    value_type = type(value)
+    if value_type in _reference_types:
+        return True
+    numpy = _get_numpy()
+    if numpy is not None and isinstance(value, (numpy.ndarray, numpy.generic)):
+        return True
+    return any(issubclass(value_type, data_type) for data_type in list(_reference_types))
+
+
+def convert_data_passing_policy(policy):
+    """Converts the passed policy into a member of :class:`DataPassingPolicy`
+
+    :param policy: a policy, the name of a policy or None
+    :return: the policy or None if None was passed
+    :rtype: DataPassingPolicy
+    :raises exceptions.ValueError: if the policy is not known
+    """
+    if policy is None or isinstance(policy, DataPassingPolicy):
+        return policy
+    if isinstance(policy, str) and policy.upper() in DataPassingPolicy.__members__:
+        return DataPassingPolicy[policy.upper()]
+    raise ValueError("Unknown data passing policy '{0}', valid policies are: {1}".format(
+        policy, ", ".join(DataPassingPolicy.__members__)))
+
+
+def get_default_data_passing_policy():
+    """Returns the globally configured data passing policy
+
+    :rtype: DataPassingPolicy
+    """
+    return convert_data_passing_policy(global_config.get_config_value("DATA_PASSING_POLICY", "DEEPCOPY"))
+
+
+def _raise_immutable(self, *args, **kwargs):
+    raise TypeError("The {0} is an immutable snapshot, copy it before modifying it".format(type(self).__name__))
+
+
+class FrozenList(list):
+    """A list that cannot be modified, used for snapshots of the ``COPY_ON_WRITE`` policy
+
+    Copies of the list are mutable lists and pickling stores a list.
+    """
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _raise_immutable
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [deepcopy(item, memo) for item in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified, used for snapshots of the ``COPY_ON_WRITE`` policy
+
+    Copies of the dict are mutable dicts and pickling stores a dict.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _raise_immutable
+    clear = pop = popitem = setdefault = update = _raise_immutable
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {deepcopy(key, memo): deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenSet(set):
+    """A set that cannot be modified, used for snapshots of the ``COPY_ON_WRITE`` policy
+
+    Copies of the set are mutable sets and pickling stores a set.
+    """
+
+    __ior__ = __iand__ = __isub__ = __ixor__ = _raise_immutable
+    add = discard = remove = pop = clear = update = _raise_immutable
+    intersection_update = difference_update = symmetric_difference_update = _raise_immutable
+
+    def __copy__(self):
+        return set(self)
+
+    def __deepcopy__(self, memo):
+        return {deepcopy(item, memo) for item in self}
+
+    def __reduce__(self):
+        return set, (set(self),)
+
+
+FROZEN_TYPES = (FrozenList, FrozenDict, FrozenSet)
+
+
+class _NotFreezable(Exception):
+    pass
+
+
+def _freeze(value):
+    """Creates an immutable copy of the value
+
+    :raises _NotFreezable: if the value or one of its elements cannot be made immutable
+    """
+    value_type = type(value)
+    if value_type in IMMUTABLE_TYPES or value_type in FROZEN_TYPES:
+        return value
+    if value_type is list:
+        return FrozenList(_freeze(item) for item in value)
+    if value_type is dict:
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if value_type in (set, frozenset):
+        frozen_items = (_freeze(item) for item in value)
+        return FrozenSet(frozen_items) if value_type is set else frozenset(frozen_items)
+    if value_type is tuple:
+        return tuple(_freeze(item) for item in value)
+    numpy = _get_numpy()
+    if numpy is not None:
+        if isinstance(value, numpy.generic):
+            return value
+        if isinstance(value, numpy.ndarray) and value.dtype != object:
+            if not value.flags.writeable and value.base is None:
+                # the array is already a read-only snapshot
+                return value
+            value = value.copy()
+            value.flags.writeable = False
+            return value
+    raise _NotFreezable()
+
+
+def is_frozen(value):
+    """Checks whether a value is an immutable snapshot, which can be shared by all consumers
+
+    :param value: the value to check
+    :return: True if the value and all its elements cannot be modified
+    :rtype: bool
+    """
+    value_type = type(value)
+    if value_type in IMMUTABLE_TYPES or value_type in FROZEN_TYPES:
+        return True
+    if value_type in (tuple, frozenset):
+        return all(is_frozen(item) for item in value)
+    numpy = _get_numpy()
+    if numpy is not None:
+        if isinstance(value, numpy.generic):
+            return True
+        if isinstance(value, numpy.ndarray):
+            return value.dtype != object and not value.flags.writeable and value.base is None
+    return False
+
+
+def take_snapshot(value, policy):
+    """Prepares a value for being stored in the scoped data of a container state
+
+    Only the ``COPY_ON_WRITE`` policy creates a snapshot of the value, all other policies store the value as it is.
+    Values that cannot be frozen are deep-copied, their consumers receive further copies, see :func:`pass_value`.
+
+    :param value: the value written by a state
+    :param DataPassingPolicy policy: the policy of the data port that wrote the value
+    :return: the value to store in the scoped data
+    """
+    if policy is not DataPassingPolicy.COPY_ON_WRITE or type(value) in IMMUTABLE_TYPES:
+        return value
+    try:
+        return _freeze(value)
+    except _NotFreezable:
+        return deepcopy(value)
+
+
+def pass_value(value, policy):
+    """Returns the value to be handed to a consumer of the scoped data, e.g. the input of a state
+
+    :param value: the value stored in the scoped data
+    :param DataPassingPolicy policy: the policy of the data port that wrote the value, None for the default behaviour
+    :return: the (copied) value
+    """
+    if type(value) in IMMUTABLE_TYPES:
+        return value
+    if policy is DataPassingPolicy.COPY_ON_WRITE and is_frozen(value):
+        return value
+    if policy is DataPassingPolicy.BY_REFERENCE and is_reference_type(value):
+        return value
+    return deepcopy(value)
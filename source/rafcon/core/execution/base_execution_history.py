@@ -22,6 +22,9 @@ class BaseExecutionHistory(object):
         # saves the last history item in this variable in order to be able to get the pervious item id
         self.last_history_item = None
         self.destroyed = False
+        # the scoped data copies of the last history item of each container state of the run, which are reused by the
+        # next history item of the state for all scoped data that did not change in the meantime
+        self._scoped_data_cache = {}
         logger.debug("BaseExecutionHistory has been created")
 
     def destroy(self):
@@ -29,6 +32,7 @@ class BaseExecutionHistory(object):
         """
         self.initial_prev = None
         self.last_history_item = None
+        self._scoped_data_cache.clear()
         self.consumer_manager.stop_consumers()
 
     def shutdown(self):
@@ -88,7 +92,8 @@ class BaseExecutionHistory(object):
         from rafcon.core.states.library_state import LibraryState  # delayed imported on purpose
         if isinstance(state_for_scoped_data, LibraryState):
             state_for_scoped_data = state_for_scoped_data.state_copy
-        history_item = CallItem(state, call_type, state_for_scoped_data, input_data, state.run_id)
+        history_item = CallItem(state, call_type, state_for_scoped_data, input_data, state.run_id,
+                                self._scoped_data_cache)
         if link_and_feed_item_to_consumers and self.consumer_manager.consumers_exist:
             self._link_item(history_item)
             self.feed_consumers(history_item)
@@ -111,7 +116,7 @@ class BaseExecutionHistory(object):
         if isinstance(state_for_scoped_data, LibraryState):
             state_for_scoped_data = state_for_scoped_data.state_copy
         history_item = ReturnItem(state, call_type, state_for_scoped_data, output_data,
-                                  state.run_id)
+                                  state.run_id, self._scoped_data_cache)
         if link_and_feed_item_to_consumers and self.consumer_manager.consumers_exist:
             self._link_item(history_item)
             self.feed_consumers(history_item)
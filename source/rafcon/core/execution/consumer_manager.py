@@ -1,9 +1,9 @@
 import threading
 
-from queue import Queue
-
 from rafcon.core.config import global_config
 from rafcon.core.execution.consumers.file_system_consumer import FileSystemConsumer
+from rafcon.core.execution.consumers.execution_log_file_consumer import ExecutionLogFileConsumer
+from rafcon.core.execution.history_item_queue import HistoryItemQueue
 
 from rafcon.utils import plugins
 from rafcon.utils import log
@@ -18,14 +18,18 @@ class ExecutionHistoryConsumerManager(object):
 
     def __init__(self, root_state_name):
         self.consumers = dict()
-        # Queue with infinite space
-        self.execution_history_item_queue = Queue()
-        self.condition = threading.Condition()
+        # The queue is bounded by the EXECUTION_HISTORY_QUEUE_SIZE config value; if it is full, the
+        # EXECUTION_HISTORY_QUEUE_OVERFLOW_POLICY decides whether the execution is blocked or items are dropped
+        self.execution_history_item_queue = HistoryItemQueue()
         self.interrupt = False
         self._consumers_exist = False
         self._file_system_consumer_exists = False
         if global_config.get_config_value("FILE_SYSTEM_EXECUTION_HISTORY_ENABLE", False):
-            self.register_consumer(self.FILE_SYSTEM_CONSUMER_NAME, FileSystemConsumer(root_state_name))
+            if global_config.get_config_value("EXECUTION_LOG_FORMAT", "SHELVE").upper() == "BINARY":
+                file_system_consumer = ExecutionLogFileConsumer(root_state_name)
+            else:
+                file_system_consumer = FileSystemConsumer(root_state_name)
+            self.register_consumer(self.FILE_SYSTEM_CONSUMER_NAME, file_system_consumer)
             self._file_system_consumer_exists = True
         plugins.run_hook("register_execution_history_consumer", self)
         # Only have one thread here that will call the notify function of each consumer
@@ -49,7 +53,7 @@ class ExecutionHistoryConsumerManager(object):
         return self._file_system_consumer_exists
 
     def get_file_system_consumer_file_name(self):
-        """ Get the filename of the shelve
+        """ Get the filename of the execution log file
         """
         if self.FILE_SYSTEM_CONSUMER_NAME in self.consumers.keys():
             return self.consumers[self.FILE_SYSTEM_CONSUMER_NAME].filename
@@ -65,8 +69,7 @@ class ExecutionHistoryConsumerManager(object):
         """ Stop the working thread by setting interrupt to true
         """
         self.interrupt = True
-        with self.condition:
-            self.condition.notify()
+        self.execution_history_item_queue.close()
         self.worker_thread.join()
 
     def register_consumer(self, consumer_name, consumer):
@@ -85,19 +88,14 @@ class ExecutionHistoryConsumerManager(object):
 
         :param execution_history_item: the execution history item
         """
-        with self.condition:
-            self.execution_history_item_queue.put(execution_history_item)
-            self.condition.notify()
+        self.execution_history_item_queue.put(execution_history_item)
 
     def _feed_consumers(self):
         """ Distribute the available execution history items to the consumers
         """
-        while not self.interrupt:
-            with self.condition:
-                self.condition.wait_for(lambda: not self.execution_history_item_queue.empty() or self.interrupt)
-                while not self.execution_history_item_queue.empty():
-                    next_execution_history_event = self.execution_history_item_queue.get(block=False)
-                    self._notifyConsumers(next_execution_history_event)
+        while not self.interrupt or len(self.execution_history_item_queue):
+            for next_execution_history_event, _ in self.execution_history_item_queue.get_batch():
+                self._notifyConsumers(next_execution_history_event)
 
     def _notifyConsumers(self, execution_history_event):
         """ Add execution history item to the dedicated queue of all consumers
@@ -105,6 +103,22 @@ class ExecutionHistoryConsumerManager(object):
         for client in self.consumers.values():
             client.enqueue(execution_history_event)
 
+    def get_metrics(self):
+        """ Get the throughput and lag counters of all consumers
+
+        :return: dictionary of the metrics of each consumer, see :meth:`AbstractExecutionHistoryConsumer.get_metrics`,
+            and the counters of the queue of the manager stored with the key ``None``
+        :rtype: dict
+        """
+        metrics = {consumer_name: consumer.get_metrics() for consumer_name, consumer in self.consumers.items()
+                   if hasattr(consumer, "get_metrics")}
+        metrics[None] = {
+            'received_items': self.execution_history_item_queue.put_count,
+            'dropped_items': self.execution_history_item_queue.dropped_count,
+            'queue_depth': len(self.execution_history_item_queue)
+        }
+        return metrics
+
     def unregister_consumer(self, consumer):
         """ Unegister a specific consumer
 
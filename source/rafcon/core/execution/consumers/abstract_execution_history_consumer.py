@@ -1,14 +1,31 @@
-from queue import Queue
-from threading import Thread, Condition
+import time
+from threading import Thread, Lock
+
+from rafcon.core.config import global_config
+from rafcon.core.execution.history_item_queue import HistoryItemQueue
 
 
 class AbstractExecutionHistoryConsumer(object):
     """A class that should be the base for every defined consumer
+
+    The execution history items are passed to the consumer in batches. A batch is consumed as soon as
+    ``batch_size`` items are queued or, at the latest, after ``flush_interval`` seconds.
+
+    :ivar int batch_size: the number of items triggering the consumption of a batch, 0 to consume all queued items as
+                          soon as possible
+    :ivar float flush_interval: the maximum time in seconds an item waits for its batch to be filled
     """
     def __init__(self):
-        self._queue = Queue()
+        self.batch_size = global_config.get_config_value("EXECUTION_HISTORY_CONSUMER_BATCH_SIZE", 0)
+        self.flush_interval = global_config.get_config_value("EXECUTION_HISTORY_CONSUMER_FLUSH_INTERVAL", 1.)
+        self._queue = HistoryItemQueue()
+        self._metrics_lock = Lock()
+        self._consumed_items = 0
+        self._consumed_batches = 0
+        self._last_lag = 0.
+        self._max_lag = 0.
+        self._start_time = time.time()
         self._thread = Thread(target=self.worker)
-        self._condition = Condition()
         self._stop = False
         self._thread.start()
 
@@ -23,6 +40,14 @@ class AbstractExecutionHistoryConsumer(object):
         """
         raise NotImplementedError("The consume function has to be implemented")
 
+    def consume_batch(self, execution_history_items):
+        """ Override to consume several execution history items at once, by default each item is consumed separately
+
+        :param list execution_history_items: the execution history items in the order of their creation
+        """
+        for execution_history_item in execution_history_items:
+            self.consume(execution_history_item)
+
     def unregister(self):
         """ Override the register for the consumer to run the required procedures when a consumer stops
         """
@@ -31,26 +56,71 @@ class AbstractExecutionHistoryConsumer(object):
     def enqueue(self, execution_history_item):
         """ Add the execution history item to the local consumer queue
 
+        Depending on the overflow policy of the queue, the call blocks or drops items if the queue is full.
+
         :param execution_history_item: the execution history item
         """
-        with self._condition:
-            self._queue.put(execution_history_item, block=False)
-            self._condition.notify()
+        self._queue.put(execution_history_item)
 
     def worker(self):
-        """ Consume the available execution history item until the thread stops
+        """ Consume the available execution history items in batches until the thread stops
+        """
+        while not self._stop or len(self._queue):
+            batch = self._queue.get_batch(self.batch_size, self.flush_interval)
+            if not batch:
+                continue
+            self.consume_batch([item for item, _ in batch])
+            lag = time.time() - batch[0][1]
+            with self._metrics_lock:
+                self._consumed_items += len(batch)
+                self._consumed_batches += 1
+                self._last_lag = lag
+                self._max_lag = max(self._max_lag, lag)
+
+    def get_metrics(self):
+        """ Returns the throughput and lag counters of the consumer
+
+        :return: dictionary of the number of received, dropped and consumed items, the number of consumed batches,
+            the current queue depth, the throughput in items per second and the last and maximum lag in seconds
+        :rtype: dict
         """
-        while not self._stop:
-            with self._condition:
-                self._condition.wait_for(lambda: not self._queue.empty() or self._stop)
-                while not self._queue.empty():
-                    item = self._queue.get(block=False)
-                    self.consume(item)
+        with self._metrics_lock:
+            duration = time.time() - self._start_time
+            return {
+                'received_items': self._queue.put_count,
+                'dropped_items': self._queue.dropped_count,
+                'consumed_items': self._consumed_items,
+                'consumed_batches': self._consumed_batches,
+                'queue_depth': len(self._queue),
+                'throughput': self._consumed_items / duration if duration > 0 else 0.,
+                'last_lag': self._last_lag,
+                'max_lag': self._max_lag
+            }
 
     def stop(self):
-        """ Stop the consumer thread
+        """ Stop the consumer thread after all queued items have been consumed
         """
         self._stop = True
-        with self._condition:
-            self._condition.notify()
+        self._queue.close()
         self._thread.join()
+
+
+class AbstractExecutionHistoryRecordConsumer(AbstractExecutionHistoryConsumer):
+    """A base class for consumers working on the dictionary records of the execution history items
+
+    The records are created with :meth:`rafcon.core.execution.execution_history_items.HistoryItem.to_dict` in the
+    thread of the consumer.
+    """
+
+    def consume(self, execution_history_item):
+        self.consume_records([execution_history_item.to_dict()])
+
+    def consume_batch(self, execution_history_items):
+        self.consume_records([execution_history_item.to_dict() for execution_history_item in execution_history_items])
+
+    def consume_records(self, records):
+        """ Override to consume a batch of execution history records
+
+        :param list records: the dictionaries of the execution history items in the order of their creation
+        """
+        raise NotImplementedError("The consume_records function has to be implemented")
@@ -0,0 +1,75 @@
+from rafcon.core.config import global_config
+from rafcon.core.execution.consumers.file_system_consumer import FileSystemConsumer
+from rafcon.utils.execution_log_file import ExecutionLogWriter, FILE_EXTENSION
+from rafcon.utils import log
+logger = log.get_logger(__name__)
+
+
+class ExecutionLogFileConsumer(FileSystemConsumer):
+    """ A class that writes the execution history records into an append-only binary execution log file
+
+    Each batch of records is appended as one (optionally compressed) block, see :mod:`rafcon.utils.execution_log_file`.
+    The file can be read with :class:`rafcon.utils.execution_log_file.ExecutionLogReader`.
+    """
+    FILE_EXTENSION = FILE_EXTENSION
+
+    def __init__(self, root_state_name):
+        self.compression = global_config.get_config_value("EXECUTION_LOG_COMPRESSION", None)
+        self.writer = None
+        super(ExecutionLogFileConsumer, self).__init__(root_state_name)
+
+    def register(self):
+        """ Open the execution log file
+        """
+        try:
+            self.writer = ExecutionLogWriter(self.filename, self.compression)
+            logger.debug('Openend log file for writing %s' % self.filename)
+        except Exception:
+            logger.exception('Exception:')
+
+    def consume_records(self, records):
+        """ Append a batch of records as block to the execution log file
+        """
+        with self.store_lock:
+            try:
+                self.writer.write_records(records)
+                self.writer.flush()
+            except Exception:
+                logger.exception('Exception:')
+
+    def _store_items(self, items):
+        self.consume_records([value for _, value in items])
+
+    def _flush(self):
+        """ Flush the execution log file
+        """
+        with self.store_lock:
+            try:
+                self.writer.flush()
+            except Exception:
+                if not self.destroyed:
+                    logger.exception('Exception:')
+
+    def _close(self, make_read_and_writable_for_all=False):
+        """ Write the footer index and close the execution log file
+        """
+        with self.store_lock:
+            try:
+                self.writer.close()
+                logger.debug('Closed log file %s' % self.filename)
+                if make_read_and_writable_for_all:
+                    self._make_read_and_writable_for_all()
+            except Exception:
+                logger.exception('Exception:')
+
+    def __del__(self):
+        """ Close the execution log file
+        """
+        with self.store_lock:
+            self.destroyed = True
+            try:
+                if self.writer is not None and not self.writer.closed:
+                    self.writer.close()
+                    logger.debug('Closed log file %s' % self.filename)
+            except Exception:
+                logger.exception('Exception:')
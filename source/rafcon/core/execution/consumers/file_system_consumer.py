@@ -5,19 +5,22 @@ import subprocess
 from threading import Lock
 
 from rafcon.core.config import global_config
-from rafcon.core.execution.consumers.abstract_execution_history_consumer import AbstractExecutionHistoryConsumer
+from rafcon.core.execution.consumers.abstract_execution_history_consumer import \
+    AbstractExecutionHistoryRecordConsumer
 from rafcon.utils.constants import RAFCON_TEMP_PATH_BASE
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
 
-class FileSystemConsumer(AbstractExecutionHistoryConsumer):
+class FileSystemConsumer(AbstractExecutionHistoryRecordConsumer):
     """ A class that consumes an execution history event and writes it onto the file system.
     """
+    FILE_EXTENSION = 'shelve'
+
     def __init__(self, root_state_name):
         super(FileSystemConsumer, self).__init__()
         self.destroyed = False
-        self.filename = self._get_storage_path_on_file_system(root_state_name)
+        self.filename = self._get_storage_path_on_file_system(root_state_name, self.FILE_EXTENSION)
         self.store_lock = Lock()
 
     def register(self):
@@ -32,10 +35,10 @@ class FileSystemConsumer(AbstractExecutionHistoryConsumer):
         except Exception:
             logger.exception('Exception:')
 
-    def consume(self, execution_history_item):
-        """ Write to the store variable corresponding to a shelve file
+    def consume_records(self, records):
+        """ Write a batch of records to the store variable corresponding to a shelve file
         """
-        self._store_item(execution_history_item.history_item_id, execution_history_item.to_dict())
+        self._store_items([(record['history_item_id'], record) for record in records])
 
     def unregister(self):
         """ Flush & close the shelve file
@@ -46,29 +49,36 @@ class FileSystemConsumer(AbstractExecutionHistoryConsumer):
         self._close(set_read_and_writable_for_all)
 
     @staticmethod
-    def _get_storage_path_on_file_system(root_state_name):
+    def _get_storage_path_on_file_system(root_state_name, file_extension='shelve'):
         """ Get the shelve file of a specific state machine
 
         :param root_state_name: the root name
+        :param file_extension: the extension of the log file
         """
         base_dir = global_config.get_config_value("EXECUTION_LOG_PATH", "%RAFCON_TEMP_PATH_BASE/execution_logs")
         if base_dir.startswith('%RAFCON_TEMP_PATH_BASE'):
             base_dir = base_dir.replace('%RAFCON_TEMP_PATH_BASE', RAFCON_TEMP_PATH_BASE)
         if not os.path.exists(base_dir):
             os.makedirs(base_dir)
-        shelve_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.shelve' %
+        shelve_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.%s' %
                                    (str(datetime.datetime.now()),
-                                    root_state_name.replace(' ', '-')))
+                                    root_state_name.replace(' ', '-'), file_extension))
         return shelve_name
 
     def _store_item(self, key, value):
-        """ Flush & close the shelve file
+        """ Write a single item to the shelve file
+        """
+        self._store_items([(key, value)])
+
+    def _store_items(self, items):
+        """ Write several items to the shelve file, while holding the store lock only once
         """
         with self.store_lock:
-            try:
-                self.store[key] = value
-            except Exception:
-                logger.exception('Exception:')
+            for key, value in items:
+                try:
+                    self.store[key] = value
+                except Exception:
+                    logger.exception('Exception:')
 
     def _flush(self):
         """ Flush the shelve file
@@ -92,14 +102,19 @@ class FileSystemConsumer(AbstractExecutionHistoryConsumer):
                 self.store.close()
                 logger.debug('Closed log file %s' % self.filename)
                 if make_read_and_writable_for_all:
-                    ret = subprocess.call(['chmod', 'a+rw', self.filename])
-                    if ret:
-                        logger.debug('Could not make log file readable for all. chmod a+rw failed on %s.' % self.filename)
-                    else:
-                        logger.debug('Set log file readable for all via chmod a+rw, file %s' % self.filename)
+                    self._make_read_and_writable_for_all()
             except Exception:
                 logger.exception('Exception:')
 
+    def _make_read_and_writable_for_all(self):
+        """ Make the log file readable and writable for all users
+        """
+        ret = subprocess.call(['chmod', 'a+rw', self.filename])
+        if ret:
+            logger.debug('Could not make log file readable for all. chmod a+rw failed on %s.' % self.filename)
+        else:
+            logger.debug('Set log file readable for all via chmod a+rw, file %s' % self.filename)
+
     def __del__(self):
         """ Close the shelve file
         """
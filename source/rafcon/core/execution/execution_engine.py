@@ -18,15 +18,21 @@
    :synopsis: A module that cares for the execution of the state machine
 
 """
+import asyncio
 import copy
+import itertools
 import threading
+import time
 import queue
+from concurrent.futures import Future
 from threading import Lock
 
 from rafcon.design_patterns.singleton import Singleton
 from rafcon.design_patterns.observer.observable import Observable
+from rafcon.core.execution.execution_profiler import ExecutionProfiler
 from rafcon.core.execution.execution_status import ExecutionStatus
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.execution.thread_pool import StateThreadPool
 from rafcon.core.config import global_config
 from rafcon.utils import log
 from rafcon.utils import plugins
@@ -41,6 +47,7 @@ class ExecutionEngine(Observable):
     :ivar state_machine_manager: holds the state machine manager of all states that can be executed
     :ivar status: holds the current execution status of the state machine
     :ivar execution_history: the history of the execution TODO: should be an list
+    :ivar thread_pool: the pool of worker threads executing the states
 
     """
 
@@ -61,11 +68,21 @@ class ExecutionEngine(Observable):
         # the thread, that wants to synchronize, has to acquire the self._status.execution_condition_variable
         # then it can read or set the synchronization_counter; this is only relevant for tests
         self.synchronization_counter = 0
-        # counts how often a state asks for the current execution status
+        # counts how often a state asks for the current execution status; the values are drawn from an itertools.count,
+        # which is atomic, thus no lock is required
         self.state_counter = 0
-        self.state_counter_lock = Lock()
+        self._state_counter_values = itertools.count(1)
         self.new_execution_command_handled = True
         self.stop_state_machine_after_finishing_step = False
+        # the profiler of the current or last execution, if enabled by EXECUTION_PROFILING_ENABLE
+        self.execution_profiler = None
+        self.thread_pool = StateThreadPool()
+        # done when the current or last execution finished, its result is the executed state machine
+        self._execution_finished = None
+        # the copies of the state machine executed by a parameter sweep in thread mode by their ids
+        self._sweep_state_machines = {}
+        self._sweep_lock = Lock()
+        self._sweep_start_lock = Lock()
 
     @Observable.observed
     def pause(self):
@@ -157,6 +174,9 @@ class ExecutionEngine(Observable):
         logger.debug("Stop the state machine execution ...")
         if self.state_machine_manager.get_active_state_machine() is not None:
             self.state_machine_manager.get_active_state_machine().root_state.recursively_preempt_states()
+        with self._sweep_lock:
+            for state_machine in self._sweep_state_machines.values():
+                state_machine.root_state.recursively_preempt_states()
         self.__set_execution_mode_to_stopped()
 
         # Notifies states waiting in step mode or those that are paused about execution stop
@@ -185,6 +205,36 @@ class ExecutionEngine(Observable):
             logger.warning("Cannot join as state machine was not started yet.")
             return False
 
+    @property
+    def execution_finished(self):
+        """A future, which is done as soon as the current or last execution finished
+
+        The result of the future is the executed state machine. In contrast to :meth:`join`, callbacks can be added
+        to the future and it can be awaited in asyncio event loops with :func:`asyncio.wrap_future`.
+
+        :rtype: concurrent.futures.Future
+        :return: the future of the execution or None, if no state machine was started yet
+        """
+        return self._execution_finished
+
+    async def join_async(self, timeout=None):
+        """Awaitable variant of :meth:`join` for asyncio event loops
+
+        :param float timeout: Maximum time to wait or None for infinitely
+        :return: True if the execution finished, False if no state machine was started or a timeout occurred
+        :rtype: bool
+        """
+        execution_finished = self._execution_finished
+        if execution_finished is None:
+            logger.warning("Cannot join as state machine was not started yet.")
+            return False
+        try:
+            # the shield prevents that a timeout cancels the future of the execution
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(execution_finished)), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
     def __set_execution_mode_to_stopped(self):
         """Stop and reset execution engine"""
         self.run_to_states = []
@@ -206,6 +256,12 @@ class ExecutionEngine(Observable):
         self.__running_state_machine.root_state.concurrency_queue = queue.Queue(maxsize=0)
 
         if self.__running_state_machine:
+            if global_config.get_config_value("EXECUTION_PROFILING_ENABLE", False):
+                self.execution_profiler = ExecutionProfiler(self.__running_state_machine)
+            else:
+                self.execution_profiler = None
+            self._execution_finished = Future()
+            self._execution_finished.set_running_or_notify_cancel()
             self.__running_state_machine.start()
 
             self.__wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing)
@@ -217,11 +273,23 @@ class ExecutionEngine(Observable):
     def _wait_for_finishing(self):
         """Observe running state machine and stop engine if execution has finished"""
         self.state_machine_running = True
-        self.__running_state_machine.join()
-        self.__set_execution_mode_to_finished()
-        self.state_machine_manager.active_state_machine_id = None
-        plugins.run_on_state_machine_execution_finished()
-        self.state_machine_running = False
+        state_machine = self.__running_state_machine
+        execution_finished = self._execution_finished
+        try:
+            state_machine.join()
+            self.__set_execution_mode_to_finished()
+            if self.execution_profiler is not None:
+                self.execution_profiler.finish()
+                try:
+                    self.execution_profiler.write_report()
+                except (IOError, OSError) as e:
+                    logger.error("Could not write the execution profile: {0}".format(e))
+            self.state_machine_manager.active_state_machine_id = None
+            plugins.run_on_state_machine_execution_finished()
+            self.state_machine_running = False
+        finally:
+            # waiting threads and coroutines must not block, even if the finishing failed
+            execution_finished.set_result(state_machine)
 
     def backward_step(self):
         """Take a backward step for all active states in the state machine
@@ -385,17 +453,19 @@ class ExecutionEngine(Observable):
         :param woke_up_from_pause_or_step_mode: a flag to check if the execution just woke up from paused- or step-mode
         """
         wait = True
+        next_child_state_path = None
+        # can be None in case of no transition given
+        if next_child_state_to_execute:
+            next_child_state_path = next_child_state_to_execute.get_path()
+        container_state_path = container_state.get_path()
         # if there is a state in self.run_to_states then RAFCON was commanded
         #    a) a step_over
         #    b) a step_out
         #    c) a run_until
         #    c) a run-selected-state
-        for state_path in copy.deepcopy(self.run_to_states):
-            next_child_state_path = None
-            # can be None in case of no transition given
-            if next_child_state_to_execute:
-                next_child_state_path = next_child_state_to_execute.get_path()
-            if state_path == container_state.get_path():
+        # the paths are immutable strings, thus a shallow copy of the list suffices for the iteration
+        for state_path in list(self.run_to_states):
+            if state_path == container_state_path:
                 # the execution did a whole step_over inside hierarchy state "state" (case a) )
                 # or a whole step_out into the hierarchy state "state" (case b) )
                 # thus we delete its state path from self.run_to_states
@@ -463,9 +533,15 @@ class ExecutionEngine(Observable):
         :param next_child_state_to_execute: is the next child state of :param state to be executed
         :return: the current state machine execution status
         """
-        with self.state_counter_lock:
-            self.state_counter += 1
+        self.state_counter = next(self._state_counter_values)
+
+        # fast path for free running executions: no waiting and no run-to states have to be handled
+        execution_mode = self._status.execution_mode
+        if execution_mode is StateMachineExecutionStatus.STARTED:
+            self.new_execution_command_handled = True
+            return execution_mode
 
+        wait_start_time = time.time()
         woke_up_from_pause_or_step_mode = False
 
         if (self._status.execution_mode is StateMachineExecutionStatus.PAUSED) \
@@ -525,6 +601,8 @@ class ExecutionEngine(Observable):
                 # "run_to_states" were already updated thus doing nothing
                 pass
 
+        if self.execution_profiler is not None:
+            self.execution_profiler.record_wait(container_state, time.time() - wait_start_time)
         self.new_execution_command_handled = True
 
         # in the case that the stop method wakes up the paused or step mode a StateMachineExecutionStatus.STOPPED
@@ -581,6 +659,94 @@ class ExecutionEngine(Observable):
             self.stop()
         return state_machine
 
+    def execute_parameter_sweep(self, state_machine, input_sets, mode='thread', number_of_workers=None, timeout=None):
+        """Executes a state machine once for each input set and yields the results as the runs complete
+
+        The runs are independent of each other: each run executes a copy of the state machine with its own scoped
+        data, execution history and global variable manager. In the thread mode, the copies are executed concurrently
+        in this process, while no other state machine may be executed. In the process mode, the runs are executed by a
+        pool of worker processes, which load the state machine from its file system path.
+
+        :param rafcon.core.state_machine.StateMachine state_machine: the state machine to be executed
+        :param list input_sets: dicts with the input values of the root state by the names of the input data ports
+        :param str mode: 'thread' or 'process'
+        :param int number_of_workers: the maximum number of concurrent runs, defaults to the number of input sets in
+            the thread mode and to the number of CPUs in the process mode
+        :param float timeout: the maximum duration of each run in seconds, None to wait infinitely
+        :return: a generator of tuples of the index of the input set and the result of its run, see
+            :func:`rafcon.core.batch_execution.create_run_result`
+        :raises ValueError: if the mode is unknown or the state machine was not saved for the process mode
+        """
+        from rafcon.core.batch_execution import create_jobs, iter_batch
+        input_sets = list(input_sets)
+        if mode == 'process':
+            if state_machine.file_system_path is None:
+                raise ValueError("The state machine has to be saved to be executed in the process mode")
+            jobs = create_jobs([state_machine.file_system_path], input_sets)
+            config_path = getattr(global_config, 'config_file_path', None)
+            # the workers load the config file, the values changed at runtime are passed on top of it
+            config_values = {key: global_config.get_config_value(key) for key in global_config.get_all_keys()}
+            return iter_batch(jobs, number_of_workers, config_path, timeout, config_values=config_values)
+        elif mode != 'thread':
+            raise ValueError("Unknown parameter sweep mode '{0}'".format(mode))
+        with self._sweep_start_lock:
+            if not self.finished_or_stopped():
+                raise RuntimeError("A parameter sweep cannot be started while a state machine is executed")
+            self.start_state_paths = []
+            self.execution_profiler = None
+            self.set_execution_mode(StateMachineExecutionStatus.STARTED)
+        # the engine is claimed and the runs are submitted before the generator is returned to the caller
+        sweep = self._execute_parameter_sweep_in_threads(state_machine, input_sets, number_of_workers, timeout)
+        next(sweep)
+        return sweep
+
+    def _execute_parameter_sweep_in_threads(self, state_machine, input_sets, number_of_workers, timeout):
+        """Submits the runs of a parameter sweep and yields their results, the engine has to be set to STARTED
+
+        The first item yielded is None, once the runs are submitted. The engine is set to FINISHED, when the generator
+        is exhausted or closed.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, number_of_workers or len(input_sets))) as executor:
+                futures = {executor.submit(self._execute_sweep_run, state_machine, inputs, timeout): index
+                           for index, inputs in enumerate(input_sets)}
+                yield
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+        finally:
+            if self._status.execution_mode is StateMachineExecutionStatus.STARTED:
+                self.__set_execution_mode_to_finished()
+
+    def _execute_sweep_run(self, state_machine, inputs, timeout):
+        """Executes a copy of the state machine with the given inputs and returns the result of the run"""
+        from rafcon.core.batch_execution import set_root_state_inputs, create_run_result, complete_run_result
+        from rafcon.core.global_variable_manager import GlobalVariableManager
+        result = create_run_result(state_machine.file_system_path, inputs)
+        state_machine = copy.copy(state_machine)
+        state_machine.global_variable_manager = GlobalVariableManager.create_independent_instance()
+        try:
+            set_root_state_inputs(state_machine, inputs)
+            state_machine.root_state.concurrency_queue = queue.Queue(maxsize=0)
+            with self._sweep_lock:
+                self._sweep_state_machines[id(state_machine)] = state_machine
+            start_time = time.time()
+            state_machine.start()
+            state_machine.root_state.thread.join(timeout)
+            if state_machine.root_state.thread.is_alive():
+                state_machine.root_state.recursively_preempt_states()
+                result['error'] = "Timeout after {0} s".format(timeout)
+            state_machine.join()
+            complete_run_result(result, state_machine, time.time() - start_time)
+        except Exception as e:
+            logger.exception("The parameter sweep run with the inputs {0} failed".format(inputs))
+            result['error'] = "{0}: {1}".format(type(e).__name__, e)
+        finally:
+            with self._sweep_lock:
+                self._sweep_state_machines.pop(id(state_machine), None)
+            state_machine.destroy_execution_histories()
+        return result
+
     def recompile_execution_scripts_recursively(self):
         from rafcon.core.states.execution_state import ExecutionState
         from rafcon.core.states.container_state import ContainerState
@@ -642,4 +808,4 @@ class ExecutionEngine(Observable):
         if not isinstance(run_to_states, list):
             raise TypeError("run_to_states must be of type list")
         with self.execution_engine_lock:
-            self._run_to_states = run_to_states
\ No newline at end of file
+            self._run_to_states = run_to_states
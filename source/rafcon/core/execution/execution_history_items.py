@@ -2,13 +2,18 @@ import copy
 import json
 import os
 import pickle
+import sys
 import time
 from enum import Enum
 
-from rafcon.core.id_generator import history_item_id_generator
+from rafcon.core.data_passing import DataPassingPolicy, pass_value
+from rafcon.core.id_generator import history_item_number_generator, history_item_id_from_number
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
+# scoped data written with these policies is shared between the states and the execution history
+SHARING_POLICIES = (DataPassingPolicy.COPY_ON_WRITE, DataPassingPolicy.BY_REFERENCE)
+
 
 class HistoryItem(object):
     """Class representing an entry within the history
@@ -23,15 +28,18 @@ class HistoryItem(object):
     :ivar next: the next history item
     """
 
+    # history items are created for each state execution, thus they are kept as small as possible
+    __slots__ = ('_state_reference', 'path', 'timestamp', 'run_id', '_prev', '_next', '_history_item_number')
+
     def __init__(self, state, run_id):
         self._state_reference = state
-        self.path = copy.deepcopy(state.get_path())
+        # all items of a state share the same path string
+        self.path = sys.intern(state.get_path())
         self.timestamp = time.time()
         self.run_id = run_id
         self._prev = None
         self._next = None
-        self.history_item_id = history_item_id_generator()
-        self.state_type = str(type(state).__name__)
+        self._history_item_number = history_item_number_generator()
 
     def destroy(self):
         self._state_reference = None
@@ -40,8 +48,23 @@ class HistoryItem(object):
         self.run_id = None
         self._prev = None
         self._next = None
-        self.history_item_id = None
-        self.state_type = None
+        self._history_item_number = None
+
+    @property
+    def history_item_id(self):
+        """The unique id of the history item, derived from its number
+        """
+        if self._history_item_number is None:
+            return None
+        return history_item_id_from_number(self._history_item_number)
+
+    @property
+    def state_type(self):
+        """The class name of the referenced state
+        """
+        if self._state_reference is None:
+            return None
+        return type(self._state_reference).__name__
 
     @property
     def prev(self):
@@ -131,6 +154,8 @@ class HistoryItem(object):
 
 
 class StateMachineStartItem(HistoryItem):
+    __slots__ = ('sm_dict', 'os_environment')
+
     def __init__(self, state_machine, run_id):
         HistoryItem.__init__(self, state_machine.root_state, run_id)
         from rafcon.core.state_machine import StateMachine
@@ -163,17 +188,78 @@ class ScopedDataItem(HistoryItem):
     :ivar call_type: the call type of the execution step, i.e. if it refers to a container state or an execution state
     :ivar state_for_scoped_data: the state of which the scoped data will be stored as the context data that is necessary
         to re-execute the state
+    :ivar scoped_data_cache: the scoped data copies of the last history items of the states of the run, which are
+        reused for all scoped data that did not change in the meantime, see :meth:`_copy_scoped_data`
     """
 
-    def __init__(self, state, call_type, state_for_scoped_data, child_state_input_output_data, run_id):
+    __slots__ = ('call_type', 'scoped_data', 'child_state_input_output_data')
+
+    def __init__(self, state, call_type, state_for_scoped_data, child_state_input_output_data, run_id,
+                 data_ports=None, scoped_data_cache=None):
         HistoryItem.__init__(self, state, run_id)
-        if call_type in CallType:
-            self.call_type_str = call_type.name
-        else:
+        if call_type not in CallType:
             raise Exception('unkown calltype, neither CONTAINER nor EXECUTE')
         self.call_type = call_type
-        self.scoped_data = {} if state_for_scoped_data is None else copy.deepcopy(state_for_scoped_data._scoped_data)
-        self.child_state_input_output_data = copy.deepcopy(child_state_input_output_data)
+        self.scoped_data = {} if state_for_scoped_data is None else \
+            self._copy_scoped_data(state_for_scoped_data, scoped_data_cache)
+        self.child_state_input_output_data = self._copy_input_output_data(state, child_state_input_output_data,
+                                                                          data_ports)
+
+    @property
+    def call_type_str(self):
+        return self.call_type.name
+
+    @staticmethod
+    def _copy_scoped_data(state, scoped_data_cache=None):
+        """Copies the scoped data of a state
+
+        Scoped data written with a policy sharing its value is never changed, but only replaced. Thus, it can be
+        referenced instead of being copied. The copies of all other scoped data are shared with the previous history
+        item of the state, as long as the scoped data was not written in the meantime.
+
+        :param state: the state whose scoped data is copied
+        :param dict scoped_data_cache: the copies of the previous history items by state id, kept by the execution
+            history for the duration of a run; if None, nothing is reused
+        """
+        state_key = id(state)
+        previous_entry = scoped_data_cache.get(state_key) if scoped_data_cache is not None else None
+        # the state is stored with its copies, as the id could be reused by another state
+        if previous_entry is not None and previous_entry[0] is state:
+            previous_copies = previous_entry[1]
+        else:
+            previous_copies = {}
+
+        scoped_data_copies = {}
+        copies = {}
+        for key, scoped_data_item in list(state._scoped_data.items()):
+            if scoped_data_item.data_passing_policy in SHARING_POLICIES:
+                scoped_data_copies[key] = scoped_data_item
+                continue
+            previous_copy = previous_copies.get(key)
+            if previous_copy is not None and previous_copy[0] is scoped_data_item and \
+                    previous_copy[1] is scoped_data_item._value and previous_copy[2] == scoped_data_item._timestamp:
+                scoped_data_copy = previous_copy[3]
+            else:
+                scoped_data_copy = copy.deepcopy(scoped_data_item)
+            copies[key] = (scoped_data_item, scoped_data_item._value, scoped_data_item._timestamp, scoped_data_copy)
+            scoped_data_copies[key] = scoped_data_copy
+        if scoped_data_cache is not None:
+            scoped_data_cache[state_key] = (state, copies)
+        return scoped_data_copies
+
+    @staticmethod
+    def _copy_input_output_data(state, input_output_data, data_ports):
+        """Copies the input or output data of a state according to the data passing policies of its data ports"""
+        if data_ports is None:
+            return copy.deepcopy(input_output_data)
+        default_policy = state.get_data_passing_policy()
+        policy_by_name = {data_port.name: data_port.data_passing_policy for data_port in list(data_ports.values())
+                          if data_port.data_passing_policy is not None}
+        if default_policy is DataPassingPolicy.DEEPCOPY and \
+                all(policy is DataPassingPolicy.DEEPCOPY for policy in policy_by_name.values()):
+            return copy.deepcopy(input_output_data)
+        return {name: pass_value(value, policy_by_name.get(name, default_policy))
+                for name, value in input_output_data.items()}
 
     def to_dict(self, pickled=True):
         record = HistoryItem.to_dict(self, pickled=pickled)
@@ -202,8 +288,11 @@ class ScopedDataItem(HistoryItem):
 class CallItem(ScopedDataItem):
     """A history item to represent a state call
     """
-    def __init__(self, state, call_type, state_for_scoped_data, input_data, run_id):
-        ScopedDataItem.__init__(self, state, call_type, state_for_scoped_data, input_data, run_id)
+    __slots__ = ('outcome', )
+
+    def __init__(self, state, call_type, state_for_scoped_data, input_data, run_id, scoped_data_cache=None):
+        ScopedDataItem.__init__(self, state, call_type, state_for_scoped_data, input_data, run_id,
+                                state.input_data_ports, scoped_data_cache)
         self.outcome = None
 
     def __str__(self):
@@ -217,8 +306,11 @@ class CallItem(ScopedDataItem):
 class ReturnItem(ScopedDataItem):
     """A history item to represent the return of a root state call
     """
-    def __init__(self, state, call_type, state_for_scoped_data, output_data, run_id):
-        ScopedDataItem.__init__(self, state, call_type, state_for_scoped_data, output_data, run_id)
+    __slots__ = ('outcome', )
+
+    def __init__(self, state, call_type, state_for_scoped_data, output_data, run_id, scoped_data_cache=None):
+        ScopedDataItem.__init__(self, state, call_type, state_for_scoped_data, output_data, run_id,
+                                state.output_data_ports, scoped_data_cache)
         self.outcome = copy.deepcopy(state.final_outcome)
 
     def __str__(self):
@@ -238,6 +330,8 @@ class ReturnItem(ScopedDataItem):
 class ConcurrencyItem(HistoryItem):
     """A class to hold all the data for an invocation of several concurrent threads.
     """
+    __slots__ = ('execution_histories', )
+
     def __init__(self, container_state, number_concurrent_threads, run_id, consumer_manager):
         HistoryItem.__init__(self, container_state, run_id)
         self.execution_histories = []
@@ -0,0 +1,235 @@
+# Copyright (C) 2014-2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: execution_profiler
+   :synopsis: Timing histograms of the execution of a state machine
+
+The profiler is enabled with ``EXECUTION_PROFILING_ENABLE`` or the ``--execution-profiling`` option of
+:mod:`rafcon.core.start`. For each state path it records
+
+* the wall time of the state runs (``run``),
+* the time spent in the scripts of execution states (``script``) and the remaining framework overhead of these
+  states (``overhead``),
+* the time container states wait in :meth:`ExecutionEngine.handle_execution_mode`, e.g. in the step mode or when
+  paused (``wait``),
+* the latency between the end of a child of a concurrency state and its join by the concurrency state (``join``).
+
+The durations are aggregated in histograms with a bounded relative error and thus constant memory per state path. A
+report is written at the end of the execution.
+"""
+
+import os
+import threading
+import time
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+logger = log.get_logger(__name__)
+
+CATEGORIES = ('run', 'script', 'overhead', 'wait', 'join')
+REPORT_PERCENTILES = (50, 90, 99)
+
+
+class Histogram(object):
+    """A histogram of durations with logarithmic buckets
+
+    Like a HDR histogram, each power of two is divided into linear sub buckets. The durations are recorded in
+    microseconds and stored with a relative error of less than ``2 ** -(significant_bits - 1)``.
+
+    :ivar int count: the number of recorded values
+    :ivar float total: the sum of all recorded values in seconds
+    :ivar float min: the smallest recorded value in seconds
+    :ivar float max: the largest recorded value in seconds
+    """
+
+    def __init__(self, significant_bits=7):
+        self.significant_bits = significant_bits
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.
+        self.min = None
+        self.max = None
+
+    def _get_bucket(self, value):
+        microseconds = int(value * 1e6)
+        shift = max(0, microseconds.bit_length() - self.significant_bits)
+        return (microseconds >> shift) << shift
+
+    def record(self, value):
+        """Records a duration
+
+        :param float value: the duration in seconds
+        """
+        bucket = self._get_bucket(value)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.
+
+    def get_value_at_percentile(self, percentile):
+        """Returns the duration, which is not exceeded by the given percentage of the recorded values
+
+        :param float percentile: the percentile between 0 and 100
+        :return: the lower bound of the bucket of the percentile in seconds
+        :rtype: float
+        """
+        if not self.count:
+            return 0.
+        threshold = percentile / 100. * self.count
+        number_of_values = 0
+        for bucket in sorted(self.buckets):
+            number_of_values += self.buckets[bucket]
+            if number_of_values >= threshold:
+                return max(bucket * 1e-6, self.min)
+        return self.max
+
+    def to_dict(self):
+        return {'count': self.count, 'total': self.total, 'mean': self.mean, 'min': self.min, 'max': self.max,
+                'percentiles': {p: self.get_value_at_percentile(p) for p in REPORT_PERCENTILES}}
+
+
+class ExecutionProfiler(object):
+    """Records the timing of the execution of one state machine
+
+    :ivar rafcon.core.state_machine.StateMachine state_machine: the profiled state machine
+    :ivar histograms: the histograms of the state paths for each category
+    """
+
+    def __init__(self, state_machine):
+        self.state_machine = state_machine
+        self.histograms = {category: {} for category in CATEGORIES}
+        self.start_time = time.time()
+        self.end_time = None
+        self._lock = threading.Lock()
+        # script times and end times of state runs, until the overhead and the join latency can be computed
+        self._script_times = {}
+        self._run_end_times = {}
+
+    def _record(self, category, path, duration):
+        with self._lock:
+            histograms = self.histograms[category]
+            if path not in histograms:
+                histograms[path] = Histogram()
+            histograms[path].record(duration)
+
+    def record_run(self, state, duration):
+        """Records the wall time of a state run
+
+        :param rafcon.core.states.state.State state: the executed state
+        :param float duration: the duration of the run in seconds
+        """
+        path = state.get_path()
+        self._record('run', path, duration)
+        script_time = self._script_times.pop(state.run_id, None)
+        if script_time is not None:
+            self._record('overhead', path, max(0., duration - script_time))
+        # only the children of concurrency states (and the root state) have a concurrency queue and are joined
+        if state.concurrency_queue is not None:
+            self._run_end_times[state.run_id] = time.time()
+
+    def record_script(self, state, duration):
+        """Records the time spent in the script of an execution state
+
+        :param rafcon.core.states.execution_state.ExecutionState state: the executed state
+        :param float duration: the duration of the script execution in seconds
+        """
+        self._record('script', state.get_path(), duration)
+        self._script_times[state.run_id] = self._script_times.get(state.run_id, 0.) + duration
+
+    def record_wait(self, container_state, duration):
+        """Records the time a container state waited for the execution to continue
+
+        :param rafcon.core.states.container_state.ContainerState container_state: the waiting state
+        :param float duration: the waiting time in seconds
+        """
+        self._record('wait', container_state.get_path(), duration)
+
+    def record_join(self, concurrency_state, child_state):
+        """Records the latency between the end of a child state and its join by the concurrency state
+
+        :param rafcon.core.states.concurrency_state.ConcurrencyState concurrency_state: the joining state
+        :param rafcon.core.states.state.State child_state: the joined child state
+        """
+        end_time = self._run_end_times.pop(child_state.run_id, None)
+        if end_time is not None:
+            self._record('join', concurrency_state.get_path(), max(0., time.time() - end_time))
+
+    def finish(self):
+        self.end_time = time.time()
+        self._script_times.clear()
+        self._run_end_times.clear()
+
+    def to_dict(self):
+        """Returns the statistics of all histograms
+
+        :return: a dict with the categories as keys and dicts of the state paths and their statistics as values
+        """
+        with self._lock:
+            return {category: {path: histogram.to_dict() for path, histogram in histograms.items()}
+                    for category, histograms in self.histograms.items()}
+
+    def get_report(self):
+        """Returns the statistics as human readable table
+
+        The state paths are sorted by their total time, i.e. the states that contributed most to the execution time
+        come first.
+
+        :rtype: str
+        """
+        state_names = {}
+        lines = ["Execution profile of state machine {0} ({1})".format(
+            self.state_machine.state_machine_id, self.state_machine.root_state.name)]
+        if self.end_time is not None:
+            lines.append("Duration: {0:.3f} s".format(self.end_time - self.start_time))
+        header = "{0:<10}{1:>8}{2:>12}{3:>12}" + "".join("{:>12}".format("p{0}[ms]".format(p))
+                                                         for p in REPORT_PERCENTILES) + "{4:>12}  {5}"
+        with self._lock:
+            for category in CATEGORIES:
+                histograms = self.histograms[category]
+                if not histograms:
+                    continue
+                lines.append("")
+                lines.append(header.format(category, "count", "total[s]", "mean[ms]", "max[ms]", "path"))
+                for path, histogram in sorted(histograms.items(), key=lambda item: -item[1].total):
+                    if path not in state_names:
+                        state = self.state_machine.get_state_by_path(path, as_check=True)
+                        state_names[path] = path if state is None else state.get_path(by_name=True)
+                    lines.append("{0:<10}{1:>8}{2:>12.3f}{3:>12.3f}".format(
+                        "", histogram.count, histogram.total, 1e3 * histogram.mean) +
+                        "".join("{:>12.3f}".format(1e3 * histogram.get_value_at_percentile(p))
+                                for p in REPORT_PERCENTILES) +
+                        "{0:>12.3f}  {1}".format(1e3 * histogram.max, state_names[path]))
+        return "\n".join(lines)
+
+    def write_report(self, report_path=None):
+        """Writes the report to a file in the given directory or to the log
+
+        :param str report_path: the directory of the report, defaults to ``EXECUTION_PROFILING_REPORT_PATH``
+        :return: the path of the report file or None, if the report was logged
+        """
+        if report_path is None:
+            report_path = global_config.get_config_value("EXECUTION_PROFILING_REPORT_PATH", None)
+        report = self.get_report()
+        if report_path is None or report_path == "None":
+            logger.info(report)
+            return None
+        if not os.path.isdir(report_path):
+            os.makedirs(report_path)
+        file_path = os.path.join(report_path, "execution_profile_{0}_{1}.txt".format(
+            time.strftime('%Y-%m-%d-%H-%M-%S', time.localtime(self.start_time)), self.state_machine.state_machine_id))
+        with open(file_path, 'w') as report_file:
+            report_file.write(report + "\n")
+        logger.info("Execution profile written to {0}".format(file_path))
+        return file_path
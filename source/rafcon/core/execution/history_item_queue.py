@@ -0,0 +1,137 @@
+# Copyright (C) 2014-2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: history_item_queue
+   :synopsis: A bounded queue passing execution history items to the execution history consumers
+
+"""
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+from rafcon.core.config import global_config
+
+QueueOverflowPolicy = Enum('QUEUE_OVERFLOW_POLICY', 'BLOCK DROP_OLDEST SAMPLE')
+
+
+def convert_queue_overflow_policy(policy):
+    """Converts the passed policy into a member of :class:`QueueOverflowPolicy`
+
+    :param policy: a policy or the name of a policy
+    :return: the policy
+    :rtype: QueueOverflowPolicy
+    :raises exceptions.ValueError: if the policy is not known
+    """
+    if isinstance(policy, QueueOverflowPolicy):
+        return policy
+    if isinstance(policy, str) and policy.upper() in QueueOverflowPolicy.__members__:
+        return QueueOverflowPolicy[policy.upper()]
+    raise ValueError("Unknown queue overflow policy '{0}', valid policies are: {1}".format(
+        policy, ", ".join(QueueOverflowPolicy.__members__)))
+
+
+class HistoryItemQueue(object):
+    """A thread-safe FIFO queue with a bounded size, from which items are taken in batches
+
+    If the queue is full, the overflow policy defines what happens with a new item:
+
+    * ``BLOCK``: the producer is blocked until the consumer took items from the queue (no item is lost)
+    * ``DROP_OLDEST``: the oldest item in the queue is dropped
+    * ``SAMPLE``: only every n-th new item is put into the queue, replacing the oldest item, all others are dropped
+
+    Each item is stored together with the time it was put into the queue, to be able to determine the lag of the
+    consumer.
+
+    :ivar int max_size: the maximum number of queued items, if None the value of the
+                        ``EXECUTION_HISTORY_QUEUE_SIZE`` config value is used; 0 means unbounded
+    :ivar overflow_policy: the overflow policy, if None the value of the
+                           ``EXECUTION_HISTORY_QUEUE_OVERFLOW_POLICY`` config value is used
+    :ivar int sampling_interval: every n-th item is kept with the ``SAMPLE`` policy, if the queue is full
+    """
+
+    def __init__(self, max_size=None, overflow_policy=None, sampling_interval=10):
+        if max_size is None:
+            max_size = global_config.get_config_value("EXECUTION_HISTORY_QUEUE_SIZE", 0)
+        if overflow_policy is None:
+            overflow_policy = global_config.get_config_value("EXECUTION_HISTORY_QUEUE_OVERFLOW_POLICY", "BLOCK")
+        self.max_size = max_size if max_size and max_size > 0 else 0
+        self.overflow_policy = convert_queue_overflow_policy(overflow_policy)
+        self.sampling_interval = max(1, sampling_interval)
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._overflow_counter = 0
+        self.put_count = 0
+        self.dropped_count = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def _is_full(self):
+        return self.max_size and len(self._items) >= self.max_size
+
+    def put(self, item):
+        """Puts an item into the queue, applying the overflow policy if the queue is full
+
+        :param item: the item to put into the queue
+        :return: False if the item was dropped, True otherwise
+        :rtype: bool
+        """
+        with self._condition:
+            self.put_count += 1
+            if self._is_full() and not self._closed:
+                if self.overflow_policy is QueueOverflowPolicy.BLOCK:
+                    self._condition.wait_for(lambda: not self._is_full() or self._closed)
+                else:
+                    self._overflow_counter += 1
+                    if self.overflow_policy is QueueOverflowPolicy.SAMPLE and \
+                            self._overflow_counter % self.sampling_interval != 0:
+                        self.dropped_count += 1
+                        return False
+                    self._items.popleft()
+                    self.dropped_count += 1
+            self._items.append((item, time.time()))
+            self._condition.notify_all()
+            return True
+
+    def get_batch(self, batch_size=0, timeout=None):
+        """Takes a batch of items from the queue
+
+        The call blocks until at least ``batch_size`` items are available, the timeout elapsed or the queue was closed.
+
+        :param int batch_size: the maximum number of items to take, 0 for all
+        :param float timeout: the maximum time to wait in seconds, None to wait until the batch is full
+        :return: list of tuples of the item and the time it was put into the queue, an empty list if the timeout
+            elapsed without any item being put into the queue
+        :rtype: list
+        """
+        with self._condition:
+            if batch_size > 0:
+                self._condition.wait_for(lambda: len(self._items) >= batch_size or self._closed, timeout)
+            else:
+                self._condition.wait_for(lambda: self._items or self._closed, timeout)
+            number_of_items = len(self._items) if batch_size <= 0 else min(batch_size, len(self._items))
+            batch = [self._items.popleft() for _ in range(number_of_items)]
+            if batch:
+                self._condition.notify_all()
+            return batch
+
+    def close(self):
+        """Closes the queue
+
+        Blocked producers and consumers are woken up. Remaining items can still be taken from a closed queue and new
+        items are accepted without blocking, so that no producer can be blocked forever.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
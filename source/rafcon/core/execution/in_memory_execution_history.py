@@ -16,16 +16,75 @@
 .. module:: execution_history
    :synopsis: A module for the history of one thread during state machine execution
 
+The history can be bounded by a maximum number of items (``IN_MEMORY_EXECUTION_HISTORY_MAX_ITEMS``) or an estimated
+size of their data (``IN_MEMORY_EXECUTION_HISTORY_MAX_BYTES``). If the limit is exceeded, the oldest items are evicted
+or, with ``IN_MEMORY_EXECUTION_HISTORY_SPILL_PATH``, their records are appended to a file in that directory. Backward
+stepping is possible within the retained items.
 """
-from collections.abc import Iterable, Sized
+import os
+import pickle
+import sys
+import tempfile
+from collections import deque
+from collections.abc import Iterable, Sized, Mapping
 
 from rafcon.design_patterns.observer.observable import Observable
 
+from rafcon.core.config import global_config
 from rafcon.core.execution.base_execution_history import BaseExecutionHistory
+from rafcon.core.execution.execution_history_items import ScopedDataItem, CallItem, ReturnItem, ConcurrencyItem
+from rafcon.utils.constants import RAFCON_TEMP_PATH_BASE
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
 
+def estimate_size(obj, _seen=None):
+    """Estimates the memory used by an object and the containers and values referenced by it
+
+    :param obj: the object
+    :return: the estimated size in bytes
+    :rtype: int
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    try:
+        size = sys.getsizeof(obj)
+    except TypeError:
+        return 0
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, Mapping):
+        size += sum(estimate_size(key, _seen) + estimate_size(value, _seen) for key, value in list(obj.items()))
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(estimate_size(value, _seen) for value in list(obj))
+    elif hasattr(obj, '__dict__'):
+        size += estimate_size(vars(obj), _seen)
+    return size
+
+
+def estimate_history_item_size(history_item):
+    """Estimates the memory used by a history item including its copies of scoped and input/output data
+
+    The referenced state and the neighbouring items are not taken into account.
+
+    :param rafcon.core.execution.execution_history_items.HistoryItem history_item: the history item
+    :return: the estimated size in bytes
+    :rtype: int
+    """
+    seen = set()
+    # the attributes of history items are stored in slots and are thus part of the size of the item itself
+    size = sys.getsizeof(history_item) + estimate_size(history_item.path, seen)
+    if isinstance(history_item, ScopedDataItem):
+        size += estimate_size(history_item.child_state_input_output_data, seen)
+        size += sys.getsizeof(history_item.scoped_data)
+        for scoped_data in history_item.scoped_data.values():
+            size += sys.getsizeof(scoped_data) + estimate_size(scoped_data.value, seen)
+    return size
+
+
 class InMemoryExecutionHistory(BaseExecutionHistory, Observable, Iterable, Sized):
     """A class for the history of a state machine execution
 
@@ -42,7 +101,19 @@ class InMemoryExecutionHistory(BaseExecutionHistory, Observable, Iterable, Sized
         Observable.__init__(self)
         Iterable.__init__(self)
         Sized.__init__(self)
-        self._history_items = []
+        self._history_items = deque()
+        self.max_items = global_config.get_config_value("IN_MEMORY_EXECUTION_HISTORY_MAX_ITEMS", 0) or 0
+        self.max_bytes = global_config.get_config_value("IN_MEMORY_EXECUTION_HISTORY_MAX_BYTES", 0) or 0
+        spill_path = global_config.get_config_value("IN_MEMORY_EXECUTION_HISTORY_SPILL_PATH", None)
+        if spill_path is not None and spill_path != "None" and spill_path.startswith('%RAFCON_TEMP_PATH_BASE'):
+            spill_path = spill_path.replace('%RAFCON_TEMP_PATH_BASE', RAFCON_TEMP_PATH_BASE)
+        self.spill_path = spill_path if spill_path != "None" else None
+        self.spill_file_path = None
+        # the estimated sizes of the history items, only tracked if the size of the history is bounded
+        self._history_item_sizes = deque()
+        self.estimated_bytes = 0
+        self.number_of_evicted_items = 0
+        self.number_of_spilled_items = 0
         logger.debug("InMemoryExecutionHistory has been created")
 
     def destroy(self):
@@ -57,22 +128,126 @@ class InMemoryExecutionHistory(BaseExecutionHistory, Observable, Iterable, Sized
                     history_item.destroy()
         self.destroyed = True
         self._history_items = None
+        self._history_item_sizes = None
         self.initial_prev = None
+        if self.spill_file_path is not None and os.path.exists(self.spill_file_path):
+            os.remove(self.spill_file_path)
 
     def shutdown(self):
         """Stop all consumers including consumer plugins
         """
+        # the run has ended, thus no further scoped data is copied
+        self._scoped_data_cache.clear()
         self.consumer_manager.stop_consumers()
 
     def __iter__(self):
-        return iter(self._history_items)
+        # iterate over a copy, as a deque must not be modified during the iteration, e.g. by the executing states
+        return iter(list(self._history_items))
 
     def __len__(self):
         return len(self._history_items)
 
     def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._history_items)[index]
         return self._history_items[index]
 
+    @property
+    def truncated(self):
+        """True, if the oldest items of the history were evicted"""
+        return self.number_of_evicted_items > 0
+
+    def get_memory_usage(self):
+        """Returns the number and estimated size of the retained items and the number of evicted items
+
+        The size of the items is only estimated, if ``IN_MEMORY_EXECUTION_HISTORY_MAX_BYTES`` is set, otherwise it
+        is computed on demand.
+
+        :return: a dict with the keys 'items', 'bytes', 'evicted_items', 'spilled_items' and 'spill_file'
+        :rtype: dict
+        """
+        if self.max_bytes:
+            estimated_bytes = self.estimated_bytes
+        else:
+            estimated_bytes = sum(estimate_history_item_size(history_item) for history_item in list(self))
+        return {'items': len(self), 'bytes': estimated_bytes, 'evicted_items': self.number_of_evicted_items,
+                'spilled_items': self.number_of_spilled_items, 'spill_file': self.spill_file_path}
+
+    def can_step_backward(self):
+        """Checks whether the data required to step back over the last executed state is still retained
+
+        A backward step over a state requires all items from the call to the return of the state. For concurrency
+        states, the items of the concurrent branches are required as well.
+
+        :return: False, if the required items were evicted
+        :rtype: bool
+        """
+        if not self.truncated:
+            return True
+        history_items = list(self._history_items)
+        if not history_items:
+            return False
+        last_history_item = history_items[-1]
+        if not isinstance(last_history_item, ReturnItem):
+            return True
+        for history_item in reversed(history_items[:-1]):
+            if isinstance(history_item, ConcurrencyItem):
+                if any(getattr(execution_history, 'truncated', False)
+                       for execution_history in history_item.execution_histories):
+                    return False
+            elif isinstance(history_item, CallItem) and history_item.run_id == last_history_item.run_id and \
+                    history_item.call_type is last_history_item.call_type:
+                return True
+        return False
+
+    def _spill_history_item(self, history_item):
+        """Appends the record of the history item to the spill file"""
+        try:
+            if self.spill_file_path is None:
+                if not os.path.isdir(self.spill_path):
+                    os.makedirs(self.spill_path)
+                fd, self.spill_file_path = tempfile.mkstemp(dir=self.spill_path, prefix='execution_history_',
+                                                            suffix='.spill')
+                os.close(fd)
+            with open(self.spill_file_path, 'ab') as spill_file:
+                pickle.dump(history_item.to_dict(), spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+            self.number_of_spilled_items += 1
+        except Exception as e:
+            logger.error("Could not spill history item {0}: {1}".format(history_item, e))
+
+    def get_spilled_records(self):
+        """Iterates over the records of the items spilled to the file system
+
+        :return: the records as created by :meth:`HistoryItem.to_dict`, starting with the oldest one
+        """
+        if self.spill_file_path is None:
+            return
+        with open(self.spill_file_path, 'rb') as spill_file:
+            while True:
+                try:
+                    yield pickle.load(spill_file)
+                except EOFError:
+                    return
+
+    def _evict_history_items(self):
+        """Evicts the oldest items, as long as the history exceeds its limits"""
+        history_items = self._history_items
+        while len(history_items) > 1 and ((self.max_items and len(history_items) > self.max_items) or
+                                          (self.max_bytes and self.estimated_bytes > self.max_bytes)):
+            history_item = history_items.popleft()
+            if self.max_bytes:
+                self.estimated_bytes -= self._history_item_sizes.popleft()
+            if self.spill_path:
+                self._spill_history_item(history_item)
+            if self.number_of_evicted_items == 0:
+                logger.info("The execution history of {0} exceeds its limit, the oldest items are {1}".format(
+                    history_item.state_reference.get_path(by_name=True) if history_item.state_reference else "",
+                    "spilled to {0}".format(self.spill_path) if self.spill_path else "evicted"))
+            self.number_of_evicted_items += 1
+            # unlink the item, so that it can be garbage collected
+            history_items[0].prev = None
+            history_item.next = None
+
     def get_last_history_item(self):
         """Returns the history item that was added last
 
@@ -94,6 +269,12 @@ class InMemoryExecutionHistory(BaseExecutionHistory, Observable, Iterable, Sized
         """
         try:
             self._history_items.append(current_item)
+            if self.max_bytes:
+                item_size = estimate_history_item_size(current_item)
+                self._history_item_sizes.append(item_size)
+                self.estimated_bytes += item_size
+            if self.max_items or self.max_bytes:
+                self._evict_history_items()
         except AttributeError:
             if self.destroyed:
                 pass  # this is fine
@@ -180,7 +361,7 @@ class InMemoryExecutionHistory(BaseExecutionHistory, Observable, Iterable, Sized
         """
         return_item = super(InMemoryExecutionHistory, self).push_state_machine_start_history_item(
             state_machine, run_id, feed_item_to_consumers=False)
-        self._history_items.append(return_item)
+        self._push_item(return_item)
         super(InMemoryExecutionHistory, self).feed_consumers(return_item)
         return return_item
 
@@ -192,7 +373,13 @@ class InMemoryExecutionHistory(BaseExecutionHistory, Observable, Iterable, Sized
         :rtype: rafcon.core.execution.execution_history_items.HistoryItem
         """
         try:
-            return self._history_items.pop()
+            history_item = self._history_items.pop()
+            if self.max_bytes:
+                self.estimated_bytes -= self._history_item_sizes.pop()
+            # unlink the item, so that the previous item is the last one again
+            if history_item.prev is not None and history_item.prev.next is history_item:
+                history_item.prev.next = None
+            return history_item
         except IndexError:
             logger.error("No item left in the history item list in the execution history.")
             return None
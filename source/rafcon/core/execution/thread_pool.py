@@ -0,0 +1,178 @@
+# Copyright (C) 2014-2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: thread_pool
+   :synopsis: A module holding a pool of reusable threads for the execution of states
+
+"""
+import threading
+from queue import Queue
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+
+class PoolTask(object):
+    """A task executed by a worker of the :class:`StateThreadPool`
+
+    The task offers the same join interface as :class:`threading.Thread`, so that it can replace a state thread.
+
+    :ivar target: the function that is executed by the task
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self._finished = threading.Event()
+
+    def run(self):
+        try:
+            self.target()
+        except Exception:
+            logger.exception("Unhandled exception in state thread")
+        finally:
+            self.target = None
+
+    def set_finished(self):
+        self._finished.set()
+
+    def join(self, timeout=None):
+        """Waits until the task finished
+
+        :param float timeout: the maximum time to wait in seconds, None to wait infinitely
+        """
+        self._finished.wait(timeout)
+
+    def is_alive(self):
+        return not self._finished.is_set()
+
+
+class StateThreadPool(object):
+    """A pool of reusable worker threads for the execution of states
+
+    Starting a thread for each state execution is expensive for state machines that loop over (concurrency) states at
+    high rates. The pool keeps finished worker threads alive, so that they can execute the next state.
+
+    A task is never queued waiting for a busy worker: a state blocks its thread while waiting for its child states,
+    thus a queued task could cause a deadlock for deep hierarchies. Instead, a new worker thread is created if no
+    worker is idle. The pool size is bounded by the number of idle workers, which are kept for reuse.
+
+    :ivar int max_idle_workers: the number of idle workers kept, if None the value of the
+                                ``EXECUTION_THREAD_POOL_SIZE`` config value is used; 0 disables the pool
+    """
+
+    def __init__(self, max_idle_workers=None):
+        self.max_idle_workers = max_idle_workers
+        self._lock = threading.Lock()
+        # only holds tasks that are assigned to idle workers
+        self._task_queue = Queue()
+        self._workers = 0
+        self._idle_workers = 0
+        self._tasks_started = 0
+        self._threads_created = 0
+        self._shutdown = False
+        register_at_exit = getattr(threading, '_register_atexit', None)
+        # workers are only non-daemonic, if they can be shut down before the interpreter waits for all threads
+        self._daemon_workers = register_at_exit is None
+        if register_at_exit is not None:
+            register_at_exit(self.shutdown)
+
+    def get_max_idle_workers(self):
+        if self.max_idle_workers is not None:
+            return self.max_idle_workers
+        return global_config.get_config_value("EXECUTION_THREAD_POOL_SIZE", 0)
+
+    def start_task(self, target):
+        """Executes the target function on a worker thread
+
+        :param target: the function to execute
+        :return: an object that can be joined, either a :class:`PoolTask` or a :class:`threading.Thread`
+        """
+        if self.get_max_idle_workers() <= 0 or self._shutdown:
+            thread = threading.Thread(target=target)
+            thread.start()
+            return thread
+
+        task = PoolTask(target)
+        with self._lock:
+            self._tasks_started += 1
+            if self._idle_workers > 0:
+                self._idle_workers -= 1
+                self._task_queue.put(task)
+                return task
+            self._workers += 1
+            self._threads_created += 1
+        worker = threading.Thread(target=self._work, args=(task,),
+                                  name="StateWorker-{0}".format(self._threads_created))
+        worker.daemon = self._daemon_workers
+        worker.start()
+        return task
+
+    def _work(self, task):
+        while task is not None:
+            task.run()
+            # the worker is made available again before the task is signaled to be finished, so that a state started
+            # directly after joining the previous one can reuse the worker
+            with self._lock:
+                if self._shutdown or self._idle_workers >= self.get_max_idle_workers():
+                    self._workers -= 1
+                    task.set_finished()
+                    return
+                self._idle_workers += 1
+            task.set_finished()
+            task = self._task_queue.get()
+        with self._lock:
+            self._workers -= 1
+
+    def shutdown(self):
+        """Terminates all idle workers, busy workers terminate after finishing their current task"""
+        with self._lock:
+            self._shutdown = True
+            idle_workers = self._idle_workers
+            self._idle_workers = 0
+        for _ in range(idle_workers):
+            self._task_queue.put(None)
+
+    @property
+    def pool_size(self):
+        """The number of existing worker threads"""
+        return self._workers
+
+    @property
+    def idle_workers(self):
+        """The number of worker threads waiting for a task"""
+        return self._idle_workers
+
+    @property
+    def busy_workers(self):
+        """The number of worker threads executing a task"""
+        return self._workers - self._idle_workers
+
+    @property
+    def queue_depth(self):
+        """The number of tasks assigned to idle workers, which were not yet picked up"""
+        return self._task_queue.qsize()
+
+    def get_metrics(self):
+        """Returns the metrics of the pool
+
+        :return: dictionary of the pool size, the number of idle and busy workers, the queue depth, the number of
+            started tasks and the number of created threads
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'pool_size': self._workers,
+                'max_idle_workers': self.get_max_idle_workers(),
+                'idle_workers': self._idle_workers,
+                'busy_workers': self._workers - self._idle_workers,
+                'queue_depth': self._task_queue.qsize(),
+                'tasks_started': self._tasks_started,
+                'threads_created': self._threads_created
+            }
@@ -20,28 +20,40 @@
 
 """
 
-import time
 import copy
+from types import MappingProxyType
 from rafcon.design_patterns.singleton import Singleton
 from rafcon.design_patterns.observer.observable import Observable
-from threading import Lock, currentThread, RLock
+from threading import currentThread, RLock
+from rafcon.core.config import global_config
 from rafcon.core.id_generator import *
 
+from rafcon.utils.threads import SharedLock
 from rafcon.utils.type_helpers import type_inherits_of_type
 from rafcon.utils import log
 
 logger = log.get_logger(__name__)
 
+# the number of locks protecting the creation and deletion of variables, variables with different keys mostly use
+# different locks
+NUMBER_OF_LOCK_STRIPES = 16
+# the interval in seconds, in which threads waiting for a locked variable inform about the waiting time
+LOCK_WAIT_LOG_INTERVAL = 2.
+
 
 @Singleton
 class GlobalVariableManager(Observable):
     """A class for organizing all global variables of the state machine
 
     :ivar __global_variable_dictionary: the dictionary, where all global variables are stored
-    :ivar __variable_locks: a dictionary that holds one mutex for each global variable
-    :ivar __global_lock: a mutex to prevent that the dictionary is written by two threads simultaneously
+    :ivar __variable_locks: a dictionary that holds one :class:`rafcon.utils.threads.SharedLock` for each global
+                            variable
+    :ivar __stripe_locks: mutexes to prevent that a variable is created or deleted by two threads simultaneously, the
+                          mutex of a variable is selected by the hash of its key
     :ivar __access_keys: a dictionary that holds an access key to each locked global variable
     :ivar __variable_references: a dictionary that stores whether a variable can be returned by reference or not
+    :ivar __immutable_variables: a set of the keys of the variables, whose values are never modified and are thus
+                                 stored and returned without copy
     """
 
     def __init__(self):
@@ -49,9 +61,10 @@ class GlobalVariableManager(Observable):
         self.__global_variable_dictionary = {}
         self.__global_variable_type_dictionary = {}
         self.__variable_locks = {}
-        self.__global_lock = RLock()
+        self.__stripe_locks = [RLock() for _ in range(NUMBER_OF_LOCK_STRIPES)]
         self.__access_keys = {}
         self.__variable_references = {}
+        self.__immutable_variables = set()
 
     def reset(self):
         self.__global_variable_dictionary.clear()
@@ -59,55 +72,42 @@ class GlobalVariableManager(Observable):
         self.__variable_locks.clear()
         self.__access_keys.clear()
         self.__variable_references.clear()
+        self.__immutable_variables.clear()
 
     @Observable.observed
-    def set_variable(self, key, value, per_reference=False, access_key=None, data_type=None):
+    def set_variable(self, key, value, per_reference=False, access_key=None, data_type=None, immutable=False):
         """Sets a global variable
 
         :param key: the key of the global variable to be set
         :param value: the new value of the global variable
         :param per_reference: a flag to decide if the variable should be stored per reference or per value
         :param access_key: if the variable was explicitly locked with the  rafcon.state lock_variable
+        :param bool immutable: a flag to declare that the value is never modified, neither by the caller nor by any
+                               reader, thus the value is stored and returned without copy
         :raises exceptions.RuntimeError: if a wrong access key is passed
         """
         key = str(key)  # Ensure that we have the same string type for all keys (under Python2 and 3!)
-        if self.variable_exist(key):
-            if data_type is None:
-                data_type = self.__global_variable_type_dictionary[key]
-        else:
-            if data_type is None:
-                data_type = type(None)
-        assert isinstance(data_type, type)
-        self.check_value_and_type(value, data_type)
+        data_type = self.__get_checked_data_type(key, value, data_type)
 
-        with self.__global_lock:
-            unlock = True
-            if self.variable_exist(key):
-                if self.is_locked(key) and not access_key:  # case: locked, no access key; thus, wait until I get lock
-                    access_key = self.lock_variable(key, block=True)
-                elif self.is_locked(key) and self.__access_keys[key] != access_key:  # case: locked, but wrong access key
-                    raise RuntimeError("Wrong access key for accessing global variable")
-                elif self.is_locked(key):  # case: locked and correct access key
-                    unlock = False
-                else:  # case not locked
-                    access_key = self.lock_variable(key, block=True)
-            else:
-                self.__variable_locks[key] = Lock()
+        unlock = True
+        if self.is_locked(key) and access_key:
+            if self.__access_keys[key] != access_key:  # case: locked, but wrong access key
+                raise RuntimeError("Wrong access key for accessing global variable")
+            unlock = False  # case: locked and correct access key
+        else:
+            # case: not locked or locked by someone else; thus, wait until I get lock
+            access_key = False
+            while access_key is False:
+                self.__create_variable_lock(key)
+                # fails only if the variable is deleted by another thread meanwhile
                 access_key = self.lock_variable(key, block=True)
 
-            # --- variable locked
-            if per_reference:
-                self.__global_variable_dictionary[key] = value
-                self.__global_variable_type_dictionary[key] = data_type
-                self.__variable_references[key] = True
-            else:
-                self.__global_variable_dictionary[key] = copy.deepcopy(value)
-                self.__global_variable_type_dictionary[key] = data_type
-                self.__variable_references[key] = False
-            # --- release variable
+        # --- variable locked
+        self.__write_variable(key, value, data_type, per_reference, immutable)
+        # --- release variable
 
-            if unlock:
-                self.unlock_variable(key, access_key)
+        if unlock:
+            self.unlock_variable(key, access_key)
 
         logger.debug("Global variable '{}' was set to value '{}' with type '{}'".format(key, value, data_type.__name__))
 
@@ -124,36 +124,193 @@ class GlobalVariableManager(Observable):
         key = str(key)
         if self.variable_exist(key):
             unlock = True
-            if self.is_locked(key):
-                if self.__access_keys[key] == access_key:
-                    unlock = False
-                else:
-                    if not access_key:
-                        access_key = self.lock_variable(key, block=True)
-                    else:
-                        raise RuntimeError("Wrong access key for accessing global variable")
+            if self.is_locked(key) and access_key:
+                if self.__access_keys[key] != access_key:
+                    raise RuntimeError("Wrong access key for accessing global variable")
+                unlock = False
+            elif global_config.get_config_value("GLOBAL_VARIABLE_SHARED_READ_LOCKS", True):
+                variable_lock = self.__variable_locks.get(key)
+                if variable_lock is None:
+                    return default
+                variable_lock.acquire_shared()
+                try:
+                    return self.__read_variable(key, per_reference, default)
+                finally:
+                    variable_lock.release_shared()
             else:
                 access_key = self.lock_variable(key, block=True)
+                if access_key is False:
+                    return default
 
             # --- variable locked
-            if self.variable_can_be_referenced(key):
-                if per_reference or per_reference is None:
-                    return_value = self.__global_variable_dictionary[key]
-                else:
-                    return_value = copy.deepcopy(self.__global_variable_dictionary[key])
-            else:
-                if per_reference:
+            try:
+                return self.__read_variable(key, per_reference, default)
+            finally:
+                # --- release variable
+                if unlock:
                     self.unlock_variable(key, access_key)
-                    raise RuntimeError("Variable cannot be accessed by reference")
-                else:
-                    return_value = copy.deepcopy(self.__global_variable_dictionary[key])
-            # --- release variable
+        else:
+            return default
+
+    def __get_checked_data_type(self, key, value, data_type):
+        """Returns the data type of a variable to be set and checks the new value against it
 
-            if unlock:
-                self.unlock_variable(key, access_key)
-            return return_value
+        :raises exceptions.TypeError: if the value does not match the data type
+        """
+        if data_type is None:
+            data_type = self.__global_variable_type_dictionary.get(key, type(None)) if self.variable_exist(key) \
+                else type(None)
+        assert isinstance(data_type, type)
+        self.check_value_and_type(value, data_type)
+        return data_type
+
+    def __write_variable(self, key, value, data_type, per_reference, immutable):
+        """Stores the value of a global variable, which has to be locked by the caller"""
+        self.__global_variable_dictionary[key] = value if per_reference or immutable else copy.deepcopy(value)
+        self.__global_variable_type_dictionary[key] = data_type
+        self.__variable_references[key] = bool(per_reference)
+        if immutable:
+            self.__immutable_variables.add(key)
         else:
+            self.__immutable_variables.discard(key)
+
+    def __read_variable(self, key, per_reference, default):
+        """Returns the value of a global variable, which has to be locked by the caller
+
+        :raises exceptions.RuntimeError: if the variable cannot be accessed by reference
+        """
+        if key not in self.__global_variable_dictionary:  # case: deleted while waiting for the lock
             return default
+        if key in self.__immutable_variables:
+            return self.__global_variable_dictionary[key]
+        if self.variable_can_be_referenced(key):
+            if per_reference or per_reference is None:
+                return self.__global_variable_dictionary[key]
+            return copy.deepcopy(self.__global_variable_dictionary[key])
+        if per_reference:
+            raise RuntimeError("Variable cannot be accessed by reference")
+        return copy.deepcopy(self.__global_variable_dictionary[key])
+
+    def __get_stripe_lock(self, key):
+        return self.__stripe_locks[hash(key) % NUMBER_OF_LOCK_STRIPES]
+
+    def __create_variable_lock(self, key):
+        """Creates the lock of a variable if it does not exist yet"""
+        with self.__get_stripe_lock(key):
+            if key not in self.__variable_locks:
+                self.__variable_locks[key] = SharedLock()
+
+    def __lock_variables(self, keys, shared, create=False):
+        """Locks several variables in the order of their keys, which avoids deadlocks between batch accesses
+
+        :param keys: the keys of the variables to lock
+        :param bool shared: whether to lock the variables shared or exclusively
+        :param bool create: whether to create the locks of new variables, otherwise they are skipped
+        :return: the locks with the access keys of the exclusively locked variables
+        :rtype: list
+        """
+        locks = []
+        try:
+            for key in sorted(set(keys)):
+                if shared:
+                    variable_lock = self.__variable_locks.get(key)
+                    if variable_lock is not None:
+                        variable_lock.acquire_shared()
+                        locks.append((key, variable_lock))
+                elif create:
+                    access_key = False
+                    while access_key is False:
+                        self.__create_variable_lock(key)
+                        # fails only if the variable is deleted by another thread meanwhile
+                        access_key = self.lock_variable(key, block=True)
+                    locks.append((key, access_key))
+                elif key in self.__variable_locks:
+                    access_key = self.lock_variable(key, block=True)
+                    if access_key is not False:
+                        locks.append((key, access_key))
+        except BaseException:
+            self.__unlock_variables(locks, shared)
+            raise
+        return locks
+
+    def __unlock_variables(self, locks, shared):
+        for key, lock in reversed(locks):
+            if shared:
+                lock.release_shared()
+            else:
+                self.unlock_variable(key, lock)
+
+    def get_variables(self, keys, per_reference=None, default=None):
+        """Fetches the values of several global variables at once
+
+        All variables are locked at the same time, thus the values are consistent. The variables must not be locked by
+        the calling thread.
+
+        :param keys: the keys of the global variables to be fetched
+        :param bool per_reference: a flag to decide if the variables should be returned per reference or per value
+        :param default: the value to be returned for keys that do not exist
+        :return: the values of the global variables by their keys
+        :rtype: dict
+        :raises exceptions.RuntimeError: if a variable cannot be accessed by reference
+        """
+        keys = [str(key) for key in keys]
+        shared = global_config.get_config_value("GLOBAL_VARIABLE_SHARED_READ_LOCKS", True)
+        locks = self.__lock_variables([key for key in keys if self.variable_exist(key)], shared)
+        try:
+            return {key: self.__read_variable(key, per_reference, default) for key in keys}
+        finally:
+            self.__unlock_variables(locks, shared)
+
+    @Observable.observed
+    def set_variables(self, variables, per_reference=False, data_types=None, immutable=False):
+        """Sets several global variables at once
+
+        All variables are locked at the same time, thus other threads see either all old or all new values. The
+        variables must not be locked by the calling thread.
+
+        :param dict variables: the new values of the global variables by their keys
+        :param per_reference: a flag to decide if the variables should be stored per reference or per value
+        :param dict data_types: optional data types of the variables by their keys
+        :param bool immutable: a flag to declare that the values are never modified, see :meth:`set_variable`
+        :raises exceptions.TypeError: if a value does not match the data type of its variable, then no variable is set
+        """
+        variables = {str(key): value for key, value in variables.items()}
+        data_types = {str(key): data_type for key, data_type in (data_types or {}).items()}
+        locks = self.__lock_variables(variables.keys(), shared=False, create=True)
+        try:
+            checked_data_types = {key: self.__get_checked_data_type(key, value, data_types.get(key))
+                                  for key, value in variables.items()}
+            for key, value in variables.items():
+                self.__write_variable(key, value, checked_data_types[key], per_reference, immutable)
+        finally:
+            self.__unlock_variables(locks, shared=False)
+        logger.debug("Global variables {} were set".format(", ".join(sorted(variables))))
+
+    def snapshot(self):
+        """Returns a consistent copy of all global variables
+
+        All variables are locked at the same time. The values are copied, except for immutable variables and variables
+        stored per reference.
+
+        :return: a read-only mapping of the values of all global variables by their keys
+        :rtype: types.MappingProxyType
+        """
+        keys = self.get_all_keys()
+        shared = global_config.get_config_value("GLOBAL_VARIABLE_SHARED_READ_LOCKS", True)
+        locks = self.__lock_variables(keys, shared)
+        try:
+            return MappingProxyType({key: self.__read_variable(key, None, None) for key in keys
+                                     if self.variable_exist(key)})
+        finally:
+            self.__unlock_variables(locks, shared)
+
+    def variable_is_immutable(self, key):
+        """Checks whether the variable was declared to be immutable
+
+        :param str key: Name of the variable
+        :return: True if the value of the variable is stored and returned without copy, False else
+        """
+        return str(key) in self.__immutable_variables
 
     def variable_can_be_referenced(self, key):
         """Checks whether the value of the variable can be returned by reference
@@ -175,13 +332,14 @@ class GlobalVariableManager(Observable):
         if self.is_locked(key):
             raise RuntimeError("Global variable is locked")
 
-        with self.__global_lock:
+        with self.__get_stripe_lock(key):
             if key in self.__global_variable_dictionary:
-                access_key = self.lock_variable(key, block=True)
+                self.lock_variable(key, block=True)
                 del self.__global_variable_dictionary[key]
-                self.unlock_variable(key, access_key)
-                del self.__variable_locks[key]
                 del self.__variable_references[key]
+                self.__immutable_variables.discard(key)
+                # threads waiting for the lock notice that the variable was deleted
+                self.__variable_locks.pop(key).release()
             else:
                 raise AttributeError("Global variable %s does not exist!" % str(key))
 
@@ -195,22 +353,22 @@ class GlobalVariableManager(Observable):
         :param block: a flag to specify if to wait for locking the variable in blocking mode
         """
         key = str(key)
-        # watch out for releasing the __dictionary_lock properly
         try:
-            if key in self.__variable_locks:
-                # acquire without arguments is blocking
-                lock_successful = self.__variable_locks[key].acquire(False)
+            variable_lock = self.__variable_locks.get(key)
+            if variable_lock is not None:
+                lock_successful = variable_lock.acquire(False)
                 if lock_successful or block:
-                    if (not lock_successful) and block:  # case: lock could not be acquired => wait for it as block=True
+                    if not lock_successful:  # case: lock could not be acquired => wait for it as block=True
                         duration = 0.
-                        loop_time = 0.1
-                        while not self.__variable_locks[key].acquire(False):
-                            time.sleep(loop_time)
-                            duration += loop_time
-                            if int(duration*10) % 20 == 0:
-                                # while loops informs the user about long locked variables
-                                logger.verbose("Variable '{2}' is locked and thread {0} waits already {1} seconds to "
-                                               "access it.".format(currentThread(), duration, key))
+                        while not variable_lock.acquire(timeout=LOCK_WAIT_LOG_INTERVAL):
+                            duration += LOCK_WAIT_LOG_INTERVAL
+                            # informs the user about long locked variables
+                            logger.verbose("Variable '{2}' is locked and thread {0} waits already {1} seconds to "
+                                           "access it.".format(currentThread(), duration, key))
+                        if self.__variable_locks.get(key) is not variable_lock:  # case: deleted while waiting
+                            variable_lock.release()
+                            logger.error("Global variable key {} does not exist".format(str(key)))
+                            return False
                     access_key = global_variable_id_generator()
                     self.__access_keys[key] = access_key
                     return access_key
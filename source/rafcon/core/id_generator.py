@@ -125,10 +125,18 @@ def run_id_generator():
 
 
 def history_item_id_generator():
+    return history_item_id_from_number(history_item_number_generator())
+
+
+def history_item_number_generator():
+    """Returns the number of a new history item, the history item id can be derived from it"""
     global history_item_id_counter
     history_item_id_counter += 1
-    final_id = experiment_id + ".history_item_id." + '%020d' % history_item_id_counter
-    return final_id
+    return history_item_id_counter
+
+
+def history_item_id_from_number(number):
+    return experiment_id + ".history_item_id." + '%020d' % number
 
 
 def state_id_generator(size=STATE_ID_LENGTH, chars=string.ascii_uppercase, used_state_ids=None):
@@ -402,28 +402,35 @@ class LibraryManager(Observable):
         else:
             logger.warning("Library manager will not create a library instance which is not in the mounted libraries.")
 
+    def get_library_state_template(self, lib_os_path):
+        """ A method to get the shared root state of the library specified via the lib_os_path.
+
+        The returned state is shared by all library states using this library and thus must never be modified. Library
+        states create a copy of it as soon as their content is accessed, see :attr:`LibraryState.state_copy`.
+
+        :param lib_os_path: the location of the library to get the template for
+        :return: the version and the root state of the library
+        """
+        # TODO observe changes on file system and update data
+        if lib_os_path not in self._loaded_libraries:
+            self._loaded_libraries[lib_os_path] = storage.load_state_machine_from_path(lib_os_path)
+        state_machine = self._loaded_libraries[lib_os_path]
+        return state_machine.version, state_machine.root_state
+
     def get_library_state_copy_instance(self, lib_os_path):
         """ A method to get a state copy of the library specified via the lib_os_path.
 
         :param lib_os_path: the location of the library to get a copy for
         :return:
         """
-
-        # TODO observe changes on file system and update data
-        if lib_os_path in self._loaded_libraries:
-            # this list can also be taken to open library state machines TODO -> implement it -> because faster
-            state_machine = self._loaded_libraries[lib_os_path]
-            # as long as the library state root state is never edited so the state first has to be copied here
-            state_copy = copy.deepcopy(state_machine.root_state)
-            return state_machine.version, state_copy
-        else:
-            state_machine = storage.load_state_machine_from_path(lib_os_path)
-            self._loaded_libraries[lib_os_path] = state_machine
-            if config.global_config.get_config_value("NO_PROGRAMMATIC_CHANGE_OF_LIBRARY_STATES_PERFORMED", False):
-                return state_machine.version, state_machine.root_state
-            else:
-                state_copy = copy.deepcopy(state_machine.root_state)
-                return state_machine.version, state_copy
+        already_loaded = lib_os_path in self._loaded_libraries
+        version, template = self.get_library_state_template(lib_os_path)
+        if not already_loaded and \
+                config.global_config.get_config_value("NO_PROGRAMMATIC_CHANGE_OF_LIBRARY_STATES_PERFORMED", False) and \
+                not config.global_config.get_config_value("LIBRARY_STATES_COPY_ON_WRITE", False):
+            return version, template
+        # as long as the library state root state is never edited so the state first has to be copied here
+        return version, copy.deepcopy(template)
 
     def remove_library_from_file_system(self, library_path, library_name):
         """Remove library from hard disk."""
@@ -17,8 +17,14 @@
 """
 
 import os
+import sys
+import hashlib
+import marshal
+import tempfile
 import importlib
 import _imp
+from collections import OrderedDict
+from threading import Lock
 import yaml
 from rafcon.design_patterns.observer.observable import Observable
 
@@ -37,6 +43,89 @@ DEFAULT_SCRIPT_FILE = "default_script.py"
 DEFAULT_SCRIPT = filesystem.read_file(os.path.dirname(__file__), DEFAULT_SCRIPT_FILE)
 
 
+class CodeCache(object):
+    """A process wide cache of the code objects of scripts
+
+    Code objects are looked up by the script text, which is cheap for unchanged scripts, as Python caches the hash of
+    strings. Optionally, the code objects are additionally persisted as marshalled bytecode in the directory
+    ``SCRIPT_COMPILATION_CACHE_PATH``, keyed by the hash of the script text and the Python version.
+
+    :ivar int max_size: the maximum number of code objects held in memory
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self._code_objects = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_code(self, script_text, filename):
+        """Returns the code object of a script, compiling the script only if it is not cached
+
+        :param str script_text: the source of the script
+        :param str filename: the file name of the script
+        :return: the code object
+        """
+        key = (filename, script_text)
+        with self._lock:
+            code = self._code_objects.get(key)
+            if code is not None:
+                self._code_objects.move_to_end(key)
+                self.hits += 1
+                return code
+            self.misses += 1
+
+        source_hash = hashlib.sha1(script_text.encode('utf-8')).hexdigest()
+        cache_path = global_config.get_config_value("SCRIPT_COMPILATION_CACHE_PATH", None)
+        code_file_path = None
+        if cache_path and cache_path != "None":
+            code_file_name = "{0}.{1}.marshal".format(hashlib.sha1((filename + source_hash).encode('utf-8')).hexdigest(),
+                                                      sys.implementation.cache_tag)
+            code_file_path = os.path.join(cache_path, code_file_name)
+            code = self._load_code(code_file_path)
+        if code is None:
+            code = compile(script_text, '%s (%s)' % (filename, source_hash[:10]), 'exec')
+            if code_file_path is not None:
+                self._store_code(code_file_path, code)
+
+        with self._lock:
+            self._code_objects[key] = code
+            while len(self._code_objects) > self.max_size:
+                self._code_objects.popitem(last=False)
+        return code
+
+    @staticmethod
+    def _load_code(code_file_path):
+        try:
+            with open(code_file_path, 'rb') as code_file:
+                return marshal.load(code_file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _store_code(code_file_path, code):
+        try:
+            cache_path = os.path.dirname(code_file_path)
+            if not os.path.isdir(cache_path):
+                os.makedirs(cache_path)
+            # write to a temporary file first, so that concurrent processes never read incomplete files
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as code_file:
+                marshal.dump(code, code_file)
+            os.replace(tmp_path, code_file_path)
+        except OSError:
+            logger.debug("Could not store the compiled script {0}".format(code_file_path))
+
+    def clear(self):
+        """Removes all code objects from the memory"""
+        with self._lock:
+            self._code_objects.clear()
+
+
+code_cache = CodeCache()
+
+
 class Script(Observable, yaml.YAMLObject):
     """A class for representing the script file for all execution states in a state machine.
 
@@ -97,17 +186,18 @@ class Script(Observable, yaml.YAMLObject):
             outputs = {}
         if not inputs:
             inputs = {}
+        if state is None:
+            global_variable_manager = rafcon.core.singleton.global_variable_manager
+        else:
+            global_variable_manager = state.get_global_variable_manager()
         if backward_execution:
             if hasattr(self._compiled_module, "backward_execute"):
-                return self._compiled_module.backward_execute(
-                    state, inputs, outputs, rafcon.core.singleton.global_variable_manager
-                )
+                return self._compiled_module.backward_execute(state, inputs, outputs, global_variable_manager)
             else:
                 logger.debug("No backward execution method found for state %s" % state.name)
                 return None
         else:
-            return self._compiled_module.execute(state, inputs, outputs,
-                                                 rafcon.core.singleton.global_variable_manager)
+            return self._compiled_module.execute(state, inputs, outputs, global_variable_manager)
 
     def _load_script(self):
         """Loads the script from the filesystem
@@ -124,20 +214,26 @@ class Script(Observable, yaml.YAMLObject):
     def compile_module(self):
         """Builds a temporary module from the script file
 
+        The code object is taken from the :data:`code_cache`, thus the script is only compiled, if its text changed.
+        The import lock is only held while the module is executed.
+
         :raises exceptions.IOError: if the compilation of the script module failed
         """
         try:
-            _imp.acquire_lock()
-
-            code = compile(self.script, '%s (%s)' % (self.filename, self._script_id), 'exec')
+            code = code_cache.get_code(self.script, self.filename)
             # load module
             module_name = os.path.splitext(self.filename)[0] + str(self._script_id)
             module_spec = importlib.machinery.ModuleSpec(module_name, None)
             tmp_module = importlib.util.module_from_spec(module_spec)
+        except Exception:
+            self.compiled_module = None
+            raise
+        try:
+            _imp.acquire_lock()
             exec(code, tmp_module.__dict__)
             # return the module
             self.compiled_module = tmp_module
-        except Exception as e:
+        except Exception:
             self.compiled_module = None
             raise
         finally:
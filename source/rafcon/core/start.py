@@ -21,10 +21,11 @@
 """
 import os
 import argparse
+import json
 from os.path import realpath, dirname, join, exists
 import signal
 import time
-from queue import Empty
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import threading
 import sys
 import logging
@@ -39,13 +40,14 @@ import rafcon.utils.filesystem as filesystem
 from rafcon.core.config import global_config
 import rafcon.core.singleton as core_singletons
 from rafcon.core.storage import storage
-from rafcon.core.states.state import StateExecutionStatus
 
 from rafcon.utils import plugins, resources, log, profiling
 
 logger = log.get_logger("rafcon.start.core")
 
 _user_abort = False
+# set together with _user_abort, so that the remote mode can wait for it
+_user_abort_event = threading.Event()
 
 
 def pre_setup_plugins():
@@ -156,19 +158,36 @@ def setup_argument_parser():
                         help=_("The interval between snapshots creaton for memory profiling in seconds"))
     parser.add_argument('-mppr', '--memory-profiling-print', dest='memory_profiling_print', action='store_true',
                         help=_("a flag to specify if the memory profiling results should be printed"))
+    parser.add_argument('-ep', '--execution-profiling', dest='execution_profiling', action='store_true',
+                        help=_("a flag to enable the profiling of the state execution times, a report is written "
+                               "when the execution finishes"))
+    parser.add_argument('-epp', '--execution-profiling-path', action='store', metavar='path',
+                        dest='execution_profiling_path', default=None,
+                        help=_("directory of the execution profiling report, by default the report is logged"))
+    parser.add_argument('-ps', '--parameter-sweep', action='store', metavar='path', dest='parameter_sweep_path',
+                        default=None,
+                        help=_("JSON file with a list of input sets for the root state; the state machine is executed "
+                               "once per input set instead of once with its default input values"))
+    parser.add_argument('-psm', '--parameter-sweep-mode', dest='parameter_sweep_mode', choices=['thread', 'process'],
+                        default='thread', help=_("execute the runs of the parameter sweep in threads or processes"))
+    parser.add_argument('-psw', '--parameter-sweep-workers', dest='parameter_sweep_workers', type=int, default=None,
+                        help=_("the maximum number of concurrent runs of the parameter sweep"))
     return parser
 
 
-def setup_configuration(config_path):
+def setup_configuration(config_path, config_values=None):
     """Loads the core configuration from the specified path and uses its content for further setup
 
     :param config_path: Path to the core config file
+    :param dict config_values: config values overriding the loaded ones, e.g. the effective config of another process
     """
     if config_path is not None:
         config_path, config_file = filesystem.separate_folder_path_and_file_name(config_path)
         global_config.load(config_file=config_file, path=config_path)
     else:
         global_config.load(path=config_path)
+    for key, value in (config_values or {}).items():
+        global_config.set_config_value(key, value)
 
     # Initialize libraries
     core_singletons.library_manager.initialize()
@@ -198,33 +217,72 @@ def start_state_machine(sm, start_state_path=None):
         sm_thread.start()
 
 
+def run_parameter_sweep(state_machine, input_sets_path, mode='thread', number_of_workers=None):
+    """Executes the state machine once per input set and logs the results as the runs complete
+
+    :param state_machine: the state machine to be executed
+    :param str input_sets_path: path to a JSON file with a list of dicts with the input values of the root state
+    :param str mode: execute the runs in 'thread's or 'process'es
+    :param int number_of_workers: the maximum number of concurrent runs
+    :return: the summary of the runs, see :func:`rafcon.core.batch_execution.create_summary`
+    """
+    from rafcon.core.batch_execution import create_summary
+    with open(input_sets_path) as input_sets_file:
+        input_sets = json.load(input_sets_file)
+    results = [None] * len(input_sets)
+    start_time = time.time()
+    for index, result in core_singletons.state_machine_execution_engine.execute_parameter_sweep(
+            state_machine, input_sets, mode, number_of_workers):
+        results[index] = result
+        logger.info("Run {0}/{1} with inputs {2}: {3}, output data {4}".format(
+            index + 1, len(input_sets), result['inputs'],
+            result['outcome'] if result['error'] is None else result['error'], result['output_data']))
+    summary = create_summary(results, time.time() - start_time)
+    logger.info("{0} of {1} runs succeeded in {2:.3f} s, outcomes: {3}".format(
+        summary['succeeded'], summary['jobs'], summary['wall_time'], summary['outcomes']))
+    return summary
+
+
 def wait_for_state_machine_finished(state_machine):
     """ wait for a state machine to finish its execution
 
+    The function returns as soon as the execution engine signals the end of the execution or the user aborted.
+
     :param state_machine: the statemachine to synchronize with
     :return:
     """
-    global _user_abort
-
-    from rafcon.core.states.execution_state import ExecutionState
-    if not isinstance(state_machine.root_state, ExecutionState):
-        while not state_machine.root_state.final_outcome:
-            time.sleep(0.1)
-    else:
-        time.sleep(0.5)
+    execution_finished = core_singletons.state_machine_execution_engine.execution_finished
+    if execution_finished is None:
+        logger.warning("The state machine {0} was not started".format(state_machine.state_machine_id))
+        return
 
-    while state_machine.root_state.state_execution_status is not StateExecutionStatus.INACTIVE:
+    while True:
         try:
-            state_machine.root_state.concurrency_queue.get(timeout=1)
+            execution_finished.result(timeout=1)
+            return
+        except FutureTimeoutError:
             # this check triggers if the state machine could not be stopped in the signal handler
             if _user_abort:
                 return
-        except Empty:
-            pass
         # no logger output here to make it easier for the parser
         logger.verbose("RAFCON live signal")
 
 
+async def wait_for_state_machine_finished_async(state_machine):
+    """ awaitable variant of :func:`wait_for_state_machine_finished` for asyncio event loops
+
+    :param state_machine: the statemachine to synchronize with
+    :return:
+    """
+    execution_engine = core_singletons.state_machine_execution_engine
+    if execution_engine.execution_finished is None:
+        logger.warning("The state machine {0} was not started".format(state_machine.state_machine_id))
+        return
+    while not await execution_engine.join_async(timeout=1):
+        if _user_abort:
+            return
+
+
 def stop_reactor_on_state_machine_finish(state_machine):
     """ Wait for a state machine to be finished and stops the reactor
 
@@ -259,6 +317,7 @@ def signal_handler(signal, frame=None):
         logger.exception("Could not stop state machine")
 
     _user_abort = True
+    _user_abort_event.set()
 
     # shutdown twisted correctly
     if reactor_required():
@@ -276,6 +335,9 @@ def register_signal_handlers(callback):
 
 
 def main(optional_args=None):
+    global _user_abort
+    _user_abort = False
+    _user_abort_event.clear()
 
     register_signal_handlers(signal_handler)
 
@@ -308,6 +370,10 @@ def main(optional_args=None):
         memory_profiling_thread.start()
 
     setup_configuration(user_input.config_path)
+    if user_input.execution_profiling:
+        global_config.set_config_value("EXECUTION_PROFILING_ENABLE", True)
+    if user_input.execution_profiling_path:
+        global_config.set_config_value("EXECUTION_PROFILING_REPORT_PATH", user_input.execution_profiling_path)
 
     post_setup_plugins(user_input)
 
@@ -317,20 +383,25 @@ def main(optional_args=None):
         if first_sm is None:
             first_sm = sm
 
-    if not user_input.remote:
-        start_state_machine(first_sm, user_input.start_state_path)
+    if user_input.parameter_sweep_path:
+        run_parameter_sweep(first_sm, user_input.parameter_sweep_path, user_input.parameter_sweep_mode,
+                            user_input.parameter_sweep_workers)
+    else:
+        if not user_input.remote:
+            start_state_machine(first_sm, user_input.start_state_path)
 
-    if reactor_required():
-        from twisted.internet import reactor
+        if reactor_required():
+            from twisted.internet import reactor
 
-        # Blocking call, return when state machine execution finishes
-        reactor.run()
+            # Blocking call, return when state machine execution finishes
+            reactor.run()
 
-    if not user_input.remote:
-        wait_for_state_machine_finished(first_sm)
-    else:
-        while not _user_abort:
-            time.sleep(1)
+        if not user_input.remote:
+            wait_for_state_machine_finished(first_sm)
+        else:
+            # a timeout is used, as otherwise the signal handlers won't work
+            while not _user_abort_event.wait(1):
+                pass
 
     logger.info("State machine execution finished!")
 
@@ -24,6 +24,7 @@ from rafcon.core.id_generator import generate_data_port_id
 from rafcon.core.state_elements.state_element import StateElement
 from rafcon.core.decorators import lock_state_machine
 from rafcon.core.config import global_config
+from rafcon.core.data_passing import convert_data_passing_policy
 from rafcon.utils import log
 from rafcon.utils import type_helpers
 logger = log.get_logger(__name__)
@@ -36,6 +37,9 @@ class DataPort(StateElement):
     :ivar type DataPort.data_type: the value type of the data port can be handed as convertible :class:`str` too
     :ivar DataPort.default_value: the default value of the data port
     :ivar int data_port_id: the id of the data port, must be unique for the parent state
+    :ivar rafcon.core.data_passing.DataPassingPolicy DataPort.data_passing_policy: defines how the data written by
+                                                                                   the port is passed on, None to use
+                                                                                   the policy of the state machine
     :ivar rafcon.core.states.state.State StateElement.parent: reference to the parent state
     :ivar bool DataPort.force_type: if true the DataPort type exception is not raised while initiation
                                     (backward compatibility)
@@ -49,6 +53,7 @@ class DataPort(StateElement):
     _data_port_id = None
     _data_type = type(None)
     _default_value = None
+    _data_passing_policy = None
 
     def __init__(self, name=None, data_type=None, default_value=None, data_port_id=None, parent=None, force_type=False,
                  init_without_default_value_type_exceptions=False, safe_init=True):
@@ -94,8 +99,10 @@ class DataPort(StateElement):
         return "DataPort '{0}' [{1}] ({3} {2})".format(self.name, self.data_port_id, self.data_type, self.default_value)
 
     def __copy__(self):
-        return self.__class__(self._name, self._data_type, self._default_value, self._data_port_id, None,
-                              self._was_forced_type, safe_init=False)
+        data_port = self.__class__(self._name, self._data_type, self._default_value, self._data_port_id, None,
+                                   self._was_forced_type, safe_init=False)
+        data_port._data_passing_policy = self._data_passing_policy
+        return data_port
 
     def __deepcopy__(self, memo=None, _nil=[]):
         return self.__copy__()
@@ -113,21 +120,27 @@ class DataPort(StateElement):
         # Allow creation of DataPort class when loading from YAML file
         safe_init = global_config.get_config_value("LOAD_SM_WITH_CHECKS", True)
         if cls == DataPort:
-            return DataPort(name, data_type, default_value, data_port_id, force_type=True,
-                            init_without_default_value_type_exceptions=True, safe_init=safe_init)
+            data_port = DataPort(name, data_type, default_value, data_port_id, force_type=True,
+                                 init_without_default_value_type_exceptions=True, safe_init=safe_init)
         # Call appropriate constructor, e.g. InputDataPort(...) for input data ports
         else:
-            return cls(name, data_type, default_value, data_port_id, force_type=True,
-                       init_without_default_value_type_exceptions=True, safe_init=safe_init)
+            data_port = cls(name, data_type, default_value, data_port_id, force_type=True,
+                            init_without_default_value_type_exceptions=True, safe_init=safe_init)
+        data_port._data_passing_policy = convert_data_passing_policy(dictionary.get('data_passing_policy'))
+        return data_port
 
     @staticmethod
     def state_element_to_dict(state_element):
-        return {
+        dict_representation = {
             'data_port_id': state_element.data_port_id,
             'name': state_element.name,
             'data_type': state_element.data_type,
             'default_value': state_element.default_value
         }
+        # only stored if set, to keep the files of state machines using the default policy unchanged
+        if state_element.data_passing_policy is not None:
+            dict_representation['data_passing_policy'] = state_element.data_passing_policy.name
+        return dict_representation
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
@@ -198,6 +211,19 @@ class DataPort(StateElement):
         except (TypeError, AttributeError) as e:
             raise e
 
+    @property
+    def data_passing_policy(self):
+        """Property for the _data_passing_policy field
+
+        """
+        return self._data_passing_policy
+
+    @data_passing_policy.setter
+    @lock_state_machine
+    @Observable.observed
+    def data_passing_policy(self, data_passing_policy):
+        self._data_passing_policy = convert_data_passing_policy(data_passing_policy)
+
     @lock_state_machine
     @Observable.observed
     def change_data_type(self, data_type, default_value=None):
@@ -26,6 +26,7 @@ from rafcon.core.state_elements.state_element import StateElement
 from rafcon.core.state_elements.data_port import DataPort
 from rafcon.core.decorators import lock_state_machine
 from rafcon.core.config import global_config
+from rafcon.core.data_passing import convert_data_passing_policy
 from rafcon.utils import type_helpers
 
 
@@ -64,8 +65,10 @@ class ScopedVariable(DataPort):
                                                              self.default_value)
 
     def __copy__(self):
-        return self.__class__(self._name, self._data_type, self._default_value, self._data_port_id, None,
-                              safe_init=False)
+        scoped_variable = self.__class__(self._name, self._data_type, self._default_value, self._data_port_id, None,
+                                         safe_init=False)
+        scoped_variable._data_passing_policy = self._data_passing_policy
+        return scoped_variable
 
     def __deepcopy__(self, memo=None, _nil=[]):
         return self.__copy__()
@@ -80,16 +83,13 @@ class ScopedVariable(DataPort):
         data_type = dictionary['data_type']
         default_value = dictionary['default_value']
         safe_init = global_config.get_config_value("LOAD_SM_WITH_CHECKS", True)
-        return cls(name, data_type, default_value, data_port_id, safe_init=safe_init)
+        scoped_variable = cls(name, data_type, default_value, data_port_id, safe_init=safe_init)
+        scoped_variable._data_passing_policy = convert_data_passing_policy(dictionary.get('data_passing_policy'))
+        return scoped_variable
 
     @staticmethod
     def state_element_to_dict(state_element):
-        return {
-            'data_port_id': state_element.data_port_id,
-            'name': state_element.name,
-            'data_type': state_element.data_type,
-            'default_value': state_element.default_value
-        }
+        return DataPort.state_element_to_dict(state_element)
 
 
 class ScopedData(StateElement):
@@ -104,6 +104,8 @@ class ScopedData(StateElement):
     :ivar value: the current value of the scoped data
     :ivar data_port_type: the type of the data port that wrote to the scoped data last
     :ivar str timestamp: the timestamp when the scoped data was written to last
+    :ivar rafcon.core.data_passing.DataPassingPolicy data_passing_policy: the policy of the data port that wrote to
+                                                                          the scoped data last
 
     """
     _from_state = None
@@ -113,11 +115,13 @@ class ScopedData(StateElement):
     _data_port_type = None
     _primary_key = None
 
-    def __init__(self, name, value, value_type, from_state, data_port_type, parent=None, safe_init=True):
+    def __init__(self, name, value, value_type, from_state, data_port_type, parent=None, safe_init=True,
+                 data_passing_policy=None):
 
         super(ScopedData, self).__init__(safe_init=safe_init)
 
         self._timestamp = generate_time_stamp()
+        self._data_passing_policy = data_passing_policy
         # for storage purpose inside the container states (generated from key_name and from_state)
 
         if safe_init:
@@ -148,7 +152,7 @@ class ScopedData(StateElement):
 
     def __copy__(self):
         return self.__class__(self._name, self._value, self._value_type, self._from_state, self._data_port_type,
-                              parent=self.parent, safe_init=False)
+                              parent=self.parent, safe_init=False, data_passing_policy=self._data_passing_policy)
 
     def __deepcopy__(self, memo=None, _nil=[]):
         return self.__copy__()
@@ -265,6 +269,13 @@ class ScopedData(StateElement):
             raise TypeError("data_port_type must be a subclass of DataPort")
         self._data_port_type = data_port_type
 
+    @property
+    def data_passing_policy(self):
+        """Property for the _data_passing_policy field
+
+        """
+        return self._data_passing_policy
+
     @property
     def timestamp(self):
         """Property for the _timestamp field
@@ -37,6 +37,7 @@ from rafcon.utils.hashable import Hashable
 from rafcon.utils.storage_utils import get_current_time_string
 
 from rafcon.core.config import global_config
+from rafcon.core.data_passing import convert_data_passing_policy
 
 logger = log.get_logger(__name__)
 
@@ -49,14 +50,22 @@ class StateMachine(Observable, JSONObject, Hashable):
     :ivar int StateMachine.state_machine_id: the id of the state machine
     :ivar rafcon.core.states.state StateMachine.root_state: the root state of the state machine
     :ivar str StateMachine.base_path: the path, where to save the state machine
+    :ivar rafcon.core.data_passing.DataPassingPolicy StateMachine.data_passing_policy: the policy for passing data
+        between the states of the state machine, None to use the globally configured policy
+    :ivar rafcon.core.global_variable_manager.GlobalVariableManager StateMachine.global_variable_manager: the global
+        variable manager of the executions of the state machine, None to use the singleton
     """
 
     state_machine_id = None
     version = None
+    global_variable_manager = None
 
     _root_state = None
     _marked_dirty = True
     _file_system_path = None
+    _data_passing_policy = None
+    # maps the paths of states to the states, an entry is only valid as long as the path of its state does not change
+    _state_path_index = None
 
     def __init__(self, root_state=None, version=None, creation_time=None, state_machine_id=None):
         Observable.__init__(self)
@@ -87,6 +96,7 @@ class StateMachine(Observable, JSONObject, Hashable):
     def __copy__(self):
         sm = self.__class__(copy(self._root_state), self.version, self.creation_time)
         sm._marked_dirty = self._marked_dirty
+        sm._data_passing_policy = self._data_passing_policy
         return sm
 
     def __deepcopy__(self, memo=None, _nil=[]):
@@ -96,7 +106,9 @@ class StateMachine(Observable, JSONObject, Hashable):
     def from_dict(cls, dictionary, state_machine_id=None):
         state_machine_version = dictionary['version'] if 'version' in dictionary else dictionary['state_machine_version']
         creation_time = dictionary['creation_time']
-        return cls(None, state_machine_version, creation_time, state_machine_id)
+        state_machine = cls(None, state_machine_version, creation_time, state_machine_id)
+        state_machine._data_passing_policy = convert_data_passing_policy(dictionary.get('data_passing_policy'))
+        return state_machine
 
     def to_dict(self):
         return self.state_machine_to_dict(self)
@@ -113,6 +125,8 @@ class StateMachine(Observable, JSONObject, Hashable):
             'used_rafcon_version': rafcon.__version__,
             'creation_time': state_machine.creation_time,
         }
+        if state_machine.data_passing_policy is not None:
+            dict_representation['data_passing_policy'] = state_machine.data_passing_policy.name
         return dict_representation
 
     def start(self):
@@ -240,9 +254,30 @@ class StateMachine(Observable, JSONObject, Hashable):
         self._marked_dirty = marked_dirty
 
     def get_state_by_path(self, path, as_check=False):
+        """Returns the state with the given path
+
+        Found states are indexed by their path. An indexed state is only returned, if its (cached) path still equals
+        the requested path.
+
+        :param str path: the path of the state, consisting of state ids
+        :param bool as_check: if True, no warning is logged for invalid paths
+        :return: the state or None, if the path is invalid
+        """
         if not path:
             logger.debug("No start state specified!")
             return None
+        if self._state_path_index is None:
+            self._state_path_index = {}
+        state = self._state_path_index.get(path)
+        if state is None or state.get_path() != path:
+            state = self._find_state_by_path(path, as_check)
+            if state is not None:
+                self._state_path_index[path] = state
+            else:
+                self._state_path_index.pop(path, None)
+        return state
+
+    def _find_state_by_path(self, path, as_check):
         from rafcon.core.states.library_state import LibraryState
         from rafcon.core.states.execution_state import ExecutionState
         path_item_list = path.split('/')
@@ -293,6 +328,17 @@ class StateMachine(Observable, JSONObject, Hashable):
             raise AttributeError("file_system_path has to be a string")
         self._file_system_path = file_system_path
 
+    @property
+    def data_passing_policy(self):
+        """Property for the _data_passing_policy field
+        """
+        return self._data_passing_policy
+
+    @data_passing_policy.setter
+    @Observable.observed
+    def data_passing_policy(self, data_passing_policy):
+        self._data_passing_policy = convert_data_passing_policy(data_passing_policy)
+
     @property
     def supports_saving_state_names(self):
         return self._supports_saving_state_names
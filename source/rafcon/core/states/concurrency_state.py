@@ -127,6 +127,9 @@ class ConcurrencyState(ContainerState):
         :return:
         """
         state.join()
+        execution_profiler = singleton.state_machine_execution_engine.execution_profiler
+        if execution_profiler is not None:
+            execution_profiler.record_join(self, state)
         if state.backward_execution:
             self.backward_execution = True
 
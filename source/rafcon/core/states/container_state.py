@@ -27,6 +27,7 @@ from collections import OrderedDict
 from rafcon.design_patterns.observer.observable import Observable
 
 from rafcon.core.custom_exceptions import RecoveryModeException
+from rafcon.core.data_passing import pass_value, take_snapshot
 from rafcon.core.decorators import lock_state_machine
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
 from rafcon.core.id_generator import *
@@ -70,8 +71,12 @@ class ContainerState(State):
         self._states = OrderedDict()
         self._transitions = {}
         self._data_flows = {}
+        # routing index of the data flows, see ContainerState._build_data_flow_index
+        self._data_flow_index = None
         self._scoped_variables = {}
         self._scoped_data = {}
+        # data passing policy of the state machine, determined at the beginning of each run
+        self._data_passing_policy = None
         # condition variable to wait for not connected states
         self._transitions_cv = Condition()
         self._start_state_modified = False
@@ -274,6 +279,8 @@ class ContainerState(State):
         # reset the scoped data
         self._scoped_data = {}
         self._start_state_modified = False
+        self._data_passing_policy = self.get_data_passing_policy()
+        self._build_data_flow_index()
         self.add_default_values_of_scoped_variables_to_scoped_data()
         self.add_input_data_to_scoped_data(self.input_data)
 
@@ -1283,6 +1290,7 @@ class ContainerState(State):
 
         self.data_flows[data_flow_id] = DataFlow(from_state_id, from_data_port_id, to_state_id, to_data_port_id,
                                                  data_flow_id, self)
+        self._invalidate_data_flow_index()
         return data_flow_id
 
     @lock_state_machine
@@ -1297,7 +1305,59 @@ class ContainerState(State):
             raise AttributeError("The data_flow_id %s does not exist" % str(data_flow_id))
 
         self._data_flows[data_flow_id].parent = None
-        return self._data_flows.pop(data_flow_id)
+        data_flow = self._data_flows.pop(data_flow_id)
+        self._invalidate_data_flow_index()
+        return data_flow
+
+    def _build_data_flow_index(self):
+        """Builds the routing index of the data flows of the container state
+
+        The index maps the target port (to_state, to_key) to the incoming data flows together with the key of their
+        source in the scoped data, and the source port (from_state, from_key) to the outgoing data flows. It is
+        built at the beginning of each run and invalidated whenever the data flows are changed.
+
+        :return: the index of incoming and the index of outgoing data flows
+        :rtype: tuple
+        """
+        incoming_data_flows = {}
+        outgoing_data_flows = {}
+        for data_flow in list(self._data_flows.values()):
+            scoped_data_key = str(data_flow.from_key) + data_flow.from_state
+            incoming_data_flows.setdefault((data_flow.to_state, data_flow.to_key), []).append(
+                (data_flow, scoped_data_key))
+            outgoing_data_flows.setdefault((data_flow.from_state, data_flow.from_key), []).append(data_flow)
+        self._data_flow_index = index = (incoming_data_flows, outgoing_data_flows)
+        return index
+
+    def _invalidate_data_flow_index(self):
+        """Invalidates the routing index of the data flows, it is rebuilt on its next usage"""
+        self._data_flow_index = None
+
+    def get_incoming_data_flows(self, to_state_id, to_key):
+        """Returns all data flows connected to a specific target port
+
+        :param str to_state_id: the id of the target state of the data flows
+        :param int to_key: the id of the target data port of the data flows
+        :return: list of tuples of the data flow and the key of its source in the scoped data
+        :rtype: list
+        """
+        index = self._data_flow_index
+        if index is None:
+            index = self._build_data_flow_index()
+        return index[0].get((to_state_id, to_key), [])
+
+    def get_outgoing_data_flows(self, from_state_id, from_key):
+        """Returns all data flows connected to a specific source port
+
+        :param str from_state_id: the id of the source state of the data flows
+        :param int from_key: the id of the source data port of the data flows
+        :return: list of data flows
+        :rtype: list
+        """
+        index = self._data_flow_index
+        if index is None:
+            index = self._build_data_flow_index()
+        return index[1].get((from_state_id, from_key), [])
 
     @lock_state_machine
     def remove_data_flows_with_data_port_id(self, data_port_id):
@@ -1463,16 +1523,13 @@ class ContainerState(State):
             # for all input keys fetch the correct data_flow connection and read data into the result_dict
             actual_value = None
             actual_value_time = 0
-            for data_flow in self.data_flows.values():
-
-                if data_flow.to_key == input_port_key:
-                    if data_flow.to_state == state.state_id:
-                        # fetch data from the scoped_data list: the key is the data_port_key + the state_id
-                        key = str(data_flow.from_key) + data_flow.from_state
-                        if key in self.scoped_data:
-                            if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
-                                actual_value = deepcopy(self.scoped_data[key].value)
-                                actual_value_time = self.scoped_data[key].timestamp
+            for data_flow, key in self.get_incoming_data_flows(state.state_id, input_port_key):
+                # fetch data from the scoped_data list: the key is the data_port_key + the state_id
+                if key in self.scoped_data:
+                    if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
+                        actual_value = pass_value(self.scoped_data[key].value,
+                                                  self.scoped_data[key].data_passing_policy)
+                        actual_value_time = self.scoped_data[key].timestamp
 
             if actual_value is not None:
                 result_dict[value.name] = actual_value
@@ -1483,6 +1540,19 @@ class ContainerState(State):
     # ---------------------------- functions to modify the scoped data ----------------------------
     # ---------------------------------------------------------------------------------------------
 
+    def _get_port_data_passing_policy(self, data_port):
+        """Determines the data passing policy for the data written by a port of self or of a child state
+
+        :param rafcon.core.state_elements.data_port.DataPort data_port: the data port writing to the scoped data
+        :return: the data passing policy
+        :rtype: rafcon.core.data_passing.DataPassingPolicy
+        """
+        if data_port.data_passing_policy is not None:
+            return data_port.data_passing_policy
+        if self._data_passing_policy is not None:
+            return self._data_passing_policy
+        return self.get_data_passing_policy()
+
     @lock_state_machine
     def add_input_data_to_scoped_data(self, dictionary):
         """Add a dictionary to the scoped data
@@ -1496,16 +1566,18 @@ class ContainerState(State):
         for dict_key, value in dictionary.items():
             for input_data_port_key, data_port in self.input_data_ports.items():
                 if dict_key == data_port.name:
+                    policy = self._get_port_data_passing_policy(data_port)
+                    value = take_snapshot(value, policy)
                     self.scoped_data[str(input_data_port_key) + self.state_id] = \
-                        ScopedData(data_port.name, value, type(value), self.state_id, ScopedVariable, parent=self)
+                        ScopedData(data_port.name, value, type(value), self.state_id, ScopedVariable, parent=self,
+                                   data_passing_policy=policy)
                     # forward the data to scoped variables
-                    for data_flow in self.data_flows.values():
-                        if data_flow.from_key == input_data_port_key and data_flow.from_state == self.state_id:
-                            if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
-                                current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                                self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                    ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
-                                               ScopedVariable, parent=self)
+                    for data_flow in self.get_outgoing_data_flows(self.state_id, input_data_port_key):
+                        if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
+                            current_scoped_variable = self.scoped_variables[data_flow.to_key]
+                            self.scoped_data[str(data_flow.to_key) + self.state_id] = \
+                                ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
+                                           ScopedVariable, parent=self, data_passing_policy=policy)
 
     @lock_state_machine
     def add_state_execution_output_to_scoped_data(self, dictionary, state):
@@ -1527,8 +1599,10 @@ class ContainerState(State):
                             logger.warning(
                                 "The value of output port is 'None'. It has replaced with the default value.".
                                 format(output_name, data_port.data_type, type(value)))
+                    policy = self._get_port_data_passing_policy(data_port)
                     self.scoped_data[str(output_data_port_key) + state.state_id] = \
-                        ScopedData(data_port.name, value, type(value), state.state_id, OutputDataPort, parent=self)
+                        ScopedData(data_port.name, take_snapshot(value, policy), type(value), state.state_id,
+                                   OutputDataPort, parent=self, data_passing_policy=policy)
 
     @lock_state_machine
     def add_default_values_of_scoped_variables_to_scoped_data(self):
@@ -1536,9 +1610,10 @@ class ContainerState(State):
 
         """
         for key, scoped_var in self.scoped_variables.items():
+            policy = self._get_port_data_passing_policy(scoped_var)
             self.scoped_data[str(scoped_var.data_port_id) + self.state_id] = \
-                ScopedData(scoped_var.name, scoped_var.default_value, scoped_var.data_type, self.state_id,
-                           ScopedVariable, parent=self)
+                ScopedData(scoped_var.name, take_snapshot(scoped_var.default_value, policy), scoped_var.data_type,
+                           self.state_id, ScopedVariable, parent=self, data_passing_policy=policy)
 
     @lock_state_machine
     def update_scoped_variables_with_output_dictionary(self, dictionary, state):
@@ -1549,23 +1624,29 @@ class ContainerState(State):
         """
         for key, value in dictionary.items():
             output_data_port_key = None
+            output_data_port = None
             # search for the correct output data port key of the source state
             for o_key, o_port in state.output_data_ports.items():
                 if o_port.name == key:
                     output_data_port_key = o_key
+                    output_data_port = o_port
                     break
             if output_data_port_key is None:
                 if not key == "error":
                     logger.warning("Output variable %s was written during state execution, "
                                    "that has no data port connected to it.", str(key))
-            for data_flow in self.data_flows.values():
-                if data_flow.from_key == output_data_port_key and data_flow.from_state == state.state_id:
-                    if data_flow.to_state == self.state_id:  # is target of data flow own state id?
-                        if data_flow.to_key in self.scoped_variables.keys():  # is target data port scoped?
-                            current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                            self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
-                                           ScopedVariable, parent=self)
+                continue
+            policy = None
+            for data_flow in self.get_outgoing_data_flows(state.state_id, output_data_port_key):
+                if data_flow.to_state == self.state_id:  # is target of data flow own state id?
+                    if data_flow.to_key in self.scoped_variables.keys():  # is target data port scoped?
+                        if policy is None:
+                            policy = self._get_port_data_passing_policy(output_data_port)
+                            value = take_snapshot(value, policy)
+                        current_scoped_variable = self.scoped_variables[data_flow.to_key]
+                        self.scoped_data[str(data_flow.to_key) + self.state_id] = \
+                            ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
+                                       ScopedVariable, parent=self, data_passing_policy=policy)
 
     # ---------------------------------------------------------------------------------------------
     # ------------------------ functions to modify the scoped data end ----------------------------
@@ -1595,6 +1676,7 @@ class ContainerState(State):
                 data_flow._from_state = self.state_id
             if data_flow.to_state == old_state_id:
                 data_flow._to_state = self.state_id
+        self._invalidate_data_flow_index()
 
     def get_state_for_transition(self, transition):
         """Calculate the target state of a transition
@@ -1627,24 +1709,22 @@ class ContainerState(State):
             actual_value = None
             actual_value_was_written = False
             actual_value_time = 0
-            for data_flow_id, data_flow in self.data_flows.items():
-                if data_flow.to_state == self.state_id:
-                    if data_flow.to_key == output_port_id:
-                        scoped_data_key = str(data_flow.from_key) + data_flow.from_state
-                        if scoped_data_key in self.scoped_data:
-                            # the data of a previous execution of the same state is overwritten
-                            if actual_value is None or self.scoped_data[scoped_data_key].timestamp > actual_value_time:
-                                actual_value = deepcopy(self.scoped_data[scoped_data_key].value)
-                                actual_value_time = self.scoped_data[scoped_data_key].timestamp
-                                actual_value_was_written = True
-                        else:
-                            if not self.backward_execution:
-                                logger.debug(
-                                    "Output data with name {0} of state {1} was not found in the scoped data "
-                                    "of state {2}. Thus the state did not write onto this output. "
-                                    "This can mean a state machine design error.".format(
-                                        str(output_name), str(self.states[data_flow.from_state].get_path()),
-                                        self.get_path()))
+            for data_flow, scoped_data_key in self.get_incoming_data_flows(self.state_id, output_port_id):
+                if scoped_data_key in self.scoped_data:
+                    # the data of a previous execution of the same state is overwritten
+                    if actual_value is None or self.scoped_data[scoped_data_key].timestamp > actual_value_time:
+                        actual_value = pass_value(self.scoped_data[scoped_data_key].value,
+                                                  self.scoped_data[scoped_data_key].data_passing_policy)
+                        actual_value_time = self.scoped_data[scoped_data_key].timestamp
+                        actual_value_was_written = True
+                else:
+                    if not self.backward_execution:
+                        logger.debug(
+                            "Output data with name {0} of state {1} was not found in the scoped data "
+                            "of state {2}. Thus the state did not write onto this output. "
+                            "This can mean a state machine design error.".format(
+                                str(output_name), str(self.states[data_flow.from_state].get_path()),
+                                self.get_path()))
             if actual_value_was_written:
                 output_dict[output_name] = actual_value
 
@@ -1669,6 +1749,8 @@ class ContainerState(State):
         # Continue with checks if previous ones did not fail
         # Check type of child and call appropriate validity test
         if isinstance(child, DataFlow):
+            # the data flow is about to be added or changed
+            self._invalidate_data_flow_index()
             return self._check_data_flow_validity(child)
         if isinstance(child, Transition):
             return self._check_transition_validity(child)
@@ -2004,6 +2086,10 @@ class ContainerState(State):
     # ----------------------------------------- misc ----------------------------------------------
     # ---------------------------------------------------------------------------------------------
 
+    def _get_child_states_with_paths(self):
+        states = getattr(self, '_states', None)
+        return list(states.values()) if states else ()
+
     def get_states_statistics(self, hierarchy_level):
         """
         Returns the numer of child states
@@ -2194,10 +2280,12 @@ class ContainerState(State):
                         data_flow_ids_to_delete.append(data_flow.data_flow_id)
                 else:
                     self._data_flows = old_data_flows
+                    self._invalidate_data_flow_index()
                     raise
 
         self._data_flows = dict((data_flow_id, d) for (data_flow_id, d) in self._data_flows.items()
                                 if data_flow_id not in data_flow_ids_to_delete)
+        self._invalidate_data_flow_index()
 
         # check that all old_data_flows are no more referencing self as there parent
         for old_data_flow in old_data_flows.values():
@@ -21,6 +21,7 @@
 import traceback
 import sys
 import os
+import time
 from copy import copy, deepcopy
 
 from rafcon.design_patterns.observer.observable import Observable
@@ -32,6 +33,7 @@ from rafcon.core.script import Script
 from rafcon.core.states.state import StateExecutionStatus
 from rafcon.core.execution.execution_history_items import CallType
 from rafcon.core.config import global_config
+from rafcon.core.singleton import state_machine_execution_engine
 
 from rafcon.utils import log, plugins
 
@@ -107,7 +109,15 @@ class ExecutionState(State):
         """Calls the custom execute function of the script.py of the state"""
 
         plugins.run_hook('pre_script')
-        outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
+        execution_profiler = state_machine_execution_engine.execution_profiler
+        if execution_profiler is None:
+            outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
+        else:
+            start_time = time.time()
+            try:
+                outcome_item = self._script.execute(self, execute_inputs, execute_outputs, backward_execution)
+            finally:
+                execution_profiler.record_script(self, time.time() - start_time)
         plugins.run_hook('post_script')
 
         # in the case of backward execution the outcome is not relevant
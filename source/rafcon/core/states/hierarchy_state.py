@@ -112,6 +112,12 @@ class HierarchyState(ContainerState):
                     else:
                         break
                 elif execution_mode == StateMachineExecutionStatus.BACKWARD:
+                    if not self._can_step_backward():
+                        # the items of the previous state were evicted from the bounded execution history
+                        logger.warning("Cannot step back from {0}: the execution history does not reach back so "
+                                       "far".format(self))
+                        singleton.state_machine_execution_engine.step_mode()
+                        continue
                     break_loop = self._handle_backward_execution_before_child_execution()
                     if break_loop:
                         break
@@ -154,6 +160,13 @@ class HierarchyState(ContainerState):
             logger.debug("Next child state changed! Executing new child state ... ")
             self.child_state = new_child_state
 
+    def _can_step_backward(self):
+        """Checks whether the execution history still holds the items required for the next backward step
+        :return: False, if the items were evicted from a bounded execution history
+        """
+        can_step_backward = getattr(self.execution_history, 'can_step_backward', None)
+        return can_step_backward is None or can_step_backward()
+
     def _handle_backward_execution_before_child_execution(self):
         """ Sets up all data after receiving a backward execution step from the execution engine
         :return: a flag to indicate if normal child state execution should abort
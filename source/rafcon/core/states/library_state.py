@@ -20,11 +20,12 @@
 
 from weakref import ref
 from copy import copy, deepcopy
+from threading import RLock
 
 from rafcon.design_patterns.observer.observable import Observable
 from rafcon.core.states.state import StateExecutionStatus
 from rafcon.core.singleton import library_manager
-from rafcon.core.states.state import State, PATH_SEPARATOR
+from rafcon.core.states.state import State, PathAttribute, PATH_SEPARATOR
 from rafcon.core.decorators import lock_state_machine
 from rafcon.core.config import global_config
 from rafcon.utils import log
@@ -32,6 +33,9 @@ from rafcon.utils import type_helpers
 
 logger = log.get_logger(__name__)
 
+# serializes the creation of library state copies from the shared library templates
+_state_copy_creation_lock = RLock()
+
 
 class LibraryState(State):
     """A class to represent a library state for the state machine
@@ -52,6 +56,10 @@ class LibraryState(State):
     :ivar dict use_runtime_value_output_data_ports: flags to indicate if the runtime or the default value should be used
                                                     for a specific output data port
     :ivar dict allow_user_interaction: flag to indicate if the user can support in localizing moved libraries
+    :ivar rafcon.core.states.state.State state_copy: the copy of the library root state, which is executed. If
+            ``LIBRARY_STATES_COPY_ON_WRITE`` is enabled, the library state initially shares the library root state
+            loaded by the library manager with all other library states of this library and only creates its own copy
+            on the first access of this property, e.g. for the execution or for modifications.
     :ivar skip_runtime_data_initialization: flag to indicate if the runtime-data data structures have to be initialized,
                                             this is not needed e.g. in the case of a copy
     """
@@ -59,7 +67,9 @@ class LibraryState(State):
     _library_path = None
     _library_name = None
     _version = None
-    _state_copy = None
+    # replacing the state copy changes the states found by the paths below the library state
+    _state_copy = PathAttribute()
+    _state_template = None
 
     _input_data_port_runtime_values = {}
     _use_runtime_value_input_data_ports = {}
@@ -98,10 +108,15 @@ class LibraryState(State):
             logger.info("Old library name '{0}' was located at {1}".format(library_name, library_path))
             logger.info("New library name '{0}' is located at {1}".format(new_library_name, new_library_path))
 
-        lib_version, state_copy = library_manager.get_library_state_copy_instance(self.lib_os_path)
+        if global_config.get_config_value("LIBRARY_STATES_COPY_ON_WRITE", False):
+            lib_version, self._state_template = library_manager.get_library_state_template(self.lib_os_path)
+            state_copy = None
+        else:
+            lib_version, state_copy = library_manager.get_library_state_copy_instance(self.lib_os_path)
         if not str(lib_version) == version and not str(lib_version) == "None":
             raise AttributeError("Library does not have the correct version!")
-        self.state_copy = state_copy
+        if state_copy is not None:
+            self.state_copy = state_copy
 
         if safe_init:
             LibraryState._safe_init(self, name)
@@ -120,31 +135,62 @@ class LibraryState(State):
 
         self.initialized = True
 
+    def _get_library_content(self):
+        """Returns the copy of the library root state or, if it has not been created yet, the shared library template
+
+        The returned state must only be read.
+        """
+        return self._state_copy if self._state_copy is not None else self._state_template
+
+    def _get_library_interface(self):
+        """Returns the outcomes and data ports of the library root state, which are shared with the library state
+
+        Without a state copy, the outcomes and data ports of the shared library template are copied.
+        """
+        if self._state_copy is not None:
+            return self._state_copy.outcomes, self._state_copy.input_data_ports, self._state_copy.output_data_ports
+        template = self._state_template
+        return ({outcome_id: copy(outcome) for outcome_id, outcome in template.outcomes.items()},
+                {port_id: copy(port) for port_id, port in template.input_data_ports.items()},
+                {port_id: copy(port) for port_id, port in template.output_data_ports.items()})
+
     def _safe_init(self, name):
-        self.state_copy.parent = self
+        if self._state_copy is not None:
+            self.state_copy.parent = self
         if name is None:
-            self.name = self.state_copy.name
+            self.name = self._get_library_content().name
         # copy all ports and outcomes of self.state_copy to let the library state appear like the container state
         # this will also set the parent of all outcomes and data ports to self
-        self.outcomes = self.state_copy.outcomes
-        self.input_data_ports = self.state_copy.input_data_ports
-        self.output_data_ports = self.state_copy.output_data_ports
+        self.outcomes, self.input_data_ports, self.output_data_ports = self._get_library_interface()
 
     def _unsafe_init(self, name):
-        self.state_copy._parent = ref(self)
+        if self._state_copy is not None:
+            self.state_copy._parent = ref(self)
         if name is None:
-            self._name = self.state_copy.name
-        self._outcomes = self.state_copy.outcomes
+            self._name = self._get_library_content().name
+        self._outcomes, self._input_data_ports, self._output_data_ports = self._get_library_interface()
         # add parents manually
         for outcome_id, outcome in self._outcomes.items():
             outcome._parent = ref(self)
-        self._input_data_ports = self.state_copy.input_data_ports
         for port_id, port in self._input_data_ports.items():
             port._parent = ref(self)
-        self._output_data_ports = self.state_copy.output_data_ports
         for port_id, port in self._output_data_ports.items():
             port._parent = ref(self)
 
+    def _create_state_copy(self):
+        """Creates the copy of the shared library template, which is owned by this library state"""
+        with _state_copy_creation_lock:
+            if self._state_copy is not None or self._state_template is None:
+                return
+            state_copy = deepcopy(self._state_template)
+            # the library state and its state copy share their outcomes and data ports
+            state_copy._outcomes = self._outcomes
+            state_copy._input_data_ports = self._input_data_ports
+            state_copy._output_data_ports = self._output_data_ports
+            state_copy._parent = ref(self)
+            self._state_copy = state_copy
+            self._state_template = None
+
     def _handle_runtime_values(self, input_data_port_runtime_values, use_runtime_value_input_data_ports,
                                output_data_port_runtime_values, use_runtime_value_output_data_ports):
         # handle input runtime values
@@ -210,7 +256,7 @@ class LibraryState(State):
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        return str(self) == str(other) and self._state_copy == other.state_copy
+        return str(self) == str(other) and self._get_library_content() == other._get_library_content()
 
     def __copy__(self):
         income = self._income
@@ -232,11 +278,12 @@ class LibraryState(State):
     def destroy(self, recursive=True):
         super(LibraryState, self).destroy(recursive)
         if recursive:
-            if self.state_copy:
-                self.state_copy.destroy(recursive)
-            else:
+            if self._state_copy:
+                self._state_copy.destroy(recursive)
+            elif self._state_template is None:
                 logger.verbose("Multiple calls of destroy {0}".format(self))
             self._state_copy = None
+            self._state_template = None
 
     def run(self):
         """ This defines the sequence of actions that are taken when the library state is executed
@@ -260,19 +307,22 @@ class LibraryState(State):
         """Preempt the state and all of it child states.
         """
         super(LibraryState, self).recursively_preempt_states()
-        self.state_copy.recursively_preempt_states()
+        if self._state_copy is not None:
+            self._state_copy.recursively_preempt_states()
 
     def recursively_pause_states(self):
         """Pause the state and all of it child states.
         """
         super(LibraryState, self).recursively_pause_states()
-        self.state_copy.recursively_pause_states()
+        if self._state_copy is not None:
+            self._state_copy.recursively_pause_states()
 
     def recursively_resume_states(self):
         """Resume the state and all of it child states.
         """
         super(LibraryState, self).recursively_resume_states()
-        self.state_copy.recursively_resume_states()
+        if self._state_copy is not None:
+            self._state_copy.recursively_resume_states()
 
     @lock_state_machine
     def add_outcome(self, name, outcome_id=None):
@@ -352,7 +402,7 @@ class LibraryState(State):
     @lock_state_machine
     @Observable.observed
     def set_input_runtime_value(self, input_data_port_id, value):
-        checked_value = self.state_copy.input_data_ports[input_data_port_id].check_default_value(value)
+        checked_value = self.input_data_ports[input_data_port_id].check_default_value(value)
         self._input_data_port_runtime_values[input_data_port_id] = checked_value
 
     @lock_state_machine
@@ -363,7 +413,7 @@ class LibraryState(State):
     @lock_state_machine
     @Observable.observed
     def set_output_runtime_value(self, output_data_port_id, value):
-        checked_value = self.state_copy.output_data_ports[output_data_port_id].check_default_value(value)
+        checked_value = self.output_data_ports[output_data_port_id].check_default_value(value)
         self._output_data_port_runtime_values[output_data_port_id] = checked_value
 
     @lock_state_machine
@@ -406,7 +456,7 @@ class LibraryState(State):
 
     def update_hash(self, obj_hash):
         super(LibraryState, self).update_hash(obj_hash)
-        self.state_copy.update_hash(obj_hash)
+        self._get_library_content().update_hash(obj_hash)
 
     @staticmethod
     def state_to_dict(state):
@@ -424,26 +474,29 @@ class LibraryState(State):
         }
         return dict_representation
 
+    def _get_child_states_with_paths(self):
+        return (self._state_copy,) if self._state_copy is not None else ()
+
     def get_states_statistics(self, hierarchy_level):
         """
         Returns the numer of child states. As per default states do not have child states return 1.
         :return:
         """
-        return self.state_copy.get_states_statistics(hierarchy_level)
+        return self._get_library_content().get_states_statistics(hierarchy_level)
 
     def get_number_of_transitions(self):
         """
         Return the number of transitions for a state. Per default states do not have transitions.
         :return:
         """
-        return self.state_copy.get_number_of_transitions()
+        return self._get_library_content().get_number_of_transitions()
 
     def get_number_of_data_flows(self):
         """
         Return the number of data flows for a state. Per default states do not have data flows.
         :return:
         """
-        return self.state_copy.get_number_of_data_flows()
+        return self._get_library_content().get_number_of_data_flows()
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
@@ -501,7 +554,10 @@ class LibraryState(State):
     def state_copy(self):
         """Property for the _state_copy field
 
+        If the library state still shares the library template, its own copy is created first.
         """
+        if self._state_copy is None and self._state_template is not None:
+            self._create_state_copy()
         return self._state_copy
 
     @state_copy.setter
@@ -23,6 +23,7 @@
 import queue
 import os
 import threading
+import time
 from weakref import ref
 import copy
 
@@ -32,6 +33,7 @@ from jsonconversion.jsonobject import JSONObject
 from yaml import YAMLObject
 
 from rafcon.core.id_generator import *
+from rafcon.core.data_passing import get_default_data_passing_policy
 from rafcon.core.state_elements.state_element import StateElement
 from rafcon.core.state_elements.data_port import DataPort, InputDataPort, OutputDataPort
 from rafcon.core.state_elements.logical_port import Income, Outcome
@@ -48,6 +50,33 @@ from rafcon.core.decorators import lock_state_machine
 logger = log.get_logger(__name__)
 PATH_SEPARATOR = '/'
 
+# guards the invalidation and the storing of cached paths of states
+_path_cache_lock = threading.Lock()
+
+
+class PathAttribute(object):
+    """A descriptor for the attributes of a state, which its path and the paths of its child states depend on
+
+    Setting such an attribute to a new value invalidates the cached paths of the state and its descendants. As
+    paths only change when a state machine is edited, the cached paths stay valid during the execution.
+    """
+
+    def __set_name__(self, owner, name):
+        self.storage_name = name + '_value'
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self.storage_name)
+
+    def __set__(self, instance, value):
+        # identity is compared, as comparing weak references compares the referenced states
+        if instance.__dict__.get(self.storage_name) is not value:
+            instance.__dict__[self.storage_name] = value
+            with _path_cache_lock:
+                instance._path_generation += 1
+                instance._invalidate_cached_paths()
+
 
 class State(Observable, YAMLObject, JSONObject, Hashable):
 
@@ -66,7 +95,12 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
 
     """
 
-    _parent = None
+    _parent = PathAttribute()
+    _state_id = PathAttribute()
+    _name = PathAttribute()
+    _path_cache = None
+    _path_by_name_cache = None
+    _path_generation = 0
     _state_element_attrs = ['income', 'outcomes', 'input_data_ports', 'output_data_ports']
 
     def __init__(self, name=None, state_id=None, input_data_ports=None, output_data_ports=None,
@@ -257,7 +291,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
 
     # give the state the appearance of a thread that can be started several times
     def start(self, execution_history, backward_execution=False, generate_run_id=True):
-        """ Starts the execution of the state in a new thread.
+        """ Starts the execution of the state in a thread of the thread pool of the execution engine.
 
         :return:
         """
@@ -265,15 +299,22 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         if generate_run_id:
             self._run_id = run_id_generator()
 
+        from rafcon.core.singleton import state_machine_execution_engine
+        execution_profiler = state_machine_execution_engine.execution_profiler
+
         def run_wrapper():
             try:
-                self.run()
+                if execution_profiler is None:
+                    self.run()
+                else:
+                    start_time = time.time()
+                    self.run()
+                    execution_profiler.record_run(self, time.time() - start_time)
             finally:
                 plugins.run_hook('state_thread_joined')
 
         self.backward_execution = copy.copy(backward_execution)
-        self.thread = threading.Thread(target=run_wrapper)
-        self.thread.start()
+        self.thread = state_machine_execution_engine.thread_pool.start_task(run_wrapper)
 
     def generate_run_id(self):
         self._run_id = run_id_generator()
@@ -366,7 +407,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
             # if the user sets the default value to a string starting with $, try to retrieve the value
             # from the global variable manager
             if isinstance(default, str) and len(default) > 0 and default[0] == '$':
-                from rafcon.core.singleton import global_variable_manager as gvm
+                gvm = state.get_global_variable_manager()
                 var_name = default[1:]
                 if not gvm.variable_exist(var_name):
                     logger.error("The global variable '{0}' does not exist".format(var_name))
@@ -394,6 +435,24 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
             else:
                 result_dict[data_port.name] = copy.copy(data_port.default_value)
         return result_dict
+
+    def get_data_passing_policy(self, data_port=None):
+        """Determines the data passing policy for the data of the state
+
+        The policy of the data port takes precedence over the policy of the state machine, which itself takes
+        precedence over the globally configured policy.
+
+        :param rafcon.core.state_elements.data_port.DataPort data_port: an optional data port of the state
+        :return: the data passing policy
+        :rtype: rafcon.core.data_passing.DataPassingPolicy
+        """
+        if data_port is not None and data_port.data_passing_policy is not None:
+            return data_port.data_passing_policy
+        state_machine = self.get_state_machine()
+        if state_machine is not None and state_machine.data_passing_policy is not None:
+            return state_machine.data_passing_policy
+        return get_default_data_passing_policy()
+
     # ---------------------------------------------------------------------------------------------
     # ----------------------------------- data port functions -------------------------------------
     # ---------------------------------------------------------------------------------------------
@@ -564,26 +623,53 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         concatenates either State.state_id (always unique) or State.name (maybe not unique but human readable) as
         state identifier for the path.
 
+        The path is cached until the state machine is changed, see :class:`PathAttribute`.
+
         :param str appendix: the part of the path that was already calculated by previous function calls
         :param bool by_name: The boolean enables name usage to generate the path
         :rtype: str
         :return: the full path to the root state
         """
-        if by_name:
-            state_identifier = self.name
-        else:
-            state_identifier = self.state_id
-
-        if not self.is_root_state:
-            if appendix is None:
-                return self.parent.get_path(state_identifier, by_name)
+        path = self._path_by_name_cache if by_name else self._path_cache
+        if path is None:
+            generation = self._path_generation
+            state_identifier = self.name if by_name else self.state_id
+            parent_path = None
+            if not self.is_root_state:
+                parent_path = self.parent.get_path(by_name=by_name)
+                path = parent_path + PATH_SEPARATOR + state_identifier
             else:
-                return self.parent.get_path(state_identifier + PATH_SEPARATOR + appendix, by_name)
-        else:
-            if appendix is None:
-                return state_identifier
-            else:
-                return state_identifier + PATH_SEPARATOR + appendix
+                path = state_identifier
+            with _path_cache_lock:
+                # the path is only cached, if neither the state nor one of its parents was changed in the meantime
+                if generation == self._path_generation and \
+                        (parent_path is None or parent_path is self.parent._get_cached_path(by_name)):
+                    if by_name:
+                        self._path_by_name_cache = path
+                    else:
+                        self._path_cache = path
+
+        if appendix is None:
+            return path
+        return path + PATH_SEPARATOR + appendix
+
+    def _get_cached_path(self, by_name):
+        return self._path_by_name_cache if by_name else self._path_cache
+
+    def _get_child_states_with_paths(self):
+        """Returns the states whose paths start with the path of this state"""
+        return ()
+
+    def _invalidate_cached_paths(self):
+        """Removes the cached paths of the state and its descendants
+
+        Must be called with the path cache lock being held. Descendants without cached paths are skipped, as a path is
+        only cached together with the path of the parent.
+        """
+        self._path_cache = self._path_by_name_cache = None
+        for child_state in self._get_child_states_with_paths():
+            if child_state._path_cache is not None or child_state._path_by_name_cache is not None:
+                child_state._invalidate_cached_paths()
 
     def get_storage_path(self, appendix=None):
         """ Recursively create the storage path of the state.
@@ -622,6 +708,21 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
 
         return None
 
+    def get_global_variable_manager(self):
+        """Get the global variable manager used by the execution of the state
+
+        The runs of a parameter sweep use a global variable manager of their own, all other executions use the
+        singleton.
+
+        :rtype rafcon.core.global_variable_manager.GlobalVariableManager
+        :return: the global variable manager of the state machine or the singleton
+        """
+        state_machine = self.get_state_machine()
+        if state_machine is not None and state_machine.global_variable_manager is not None:
+            return state_machine.global_variable_manager
+        from rafcon.core.singleton import global_variable_manager
+        return global_variable_manager
+
     @property
     def file_system_path(self):
         """Provides the path in the file system where the state is stored
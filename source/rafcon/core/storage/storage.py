@@ -17,6 +17,8 @@
 """
 
 from weakref import ref
+from concurrent.futures import ThreadPoolExecutor
+import json
 import os
 import re
 import math
@@ -401,14 +403,107 @@ def get_meta_data_path(state_path):
     return os.path.join(state_path, FILE_NAME_META_DATA)
 
 
-def load_state_recursively(parent, state_path=None, dirty_states=[]):
+class StateFiles(object):
+    """The content of the files of a state, read in advance of the creation of the state
+
+    The json files are parsed, but not yet converted into objects.
+
+    :ivar str state_path: the path of the state
+    :ivar core_data: the parsed core data or the exception raised while reading it
+    :ivar str script_text: the content of the default script file or None if not existing
+    :ivar semantic_data: the parsed semantic data, the exception raised while reading it or None if not existing
+    :ivar list child_state_paths: the paths of the child states in the order of `os.listdir`
+    """
+
+    def __init__(self, state_path):
+        self.state_path = state_path
+        self.core_data = None
+        self.script_text = None
+        self.semantic_data = None
+        self.child_state_paths = []
+
+    @staticmethod
+    def _parse_json_file(path_of_file):
+        with open(path_of_file, 'r') as f:
+            return json.load(f)
+
+    def read(self):
+        """Reads and parses all files of the state and finds the child states
+
+        Errors are stored, to be raised when the state is created.
+        """
+        try:
+            path_core_data = get_core_data_path(self.state_path)
+            if not os.path.exists(path_core_data):
+                raise ValueError("Data file not found: {0}".format(path_core_data))
+            self.core_data = self._parse_json_file(path_core_data)
+        except Exception as e:
+            self.core_data = e
+            # the state cannot be created, thus neither its script nor its child states are required
+            return self
+        self.script_text = read_file(self.state_path, SCRIPT_FILE)
+        path_semantic_data = os.path.join(self.state_path, SEMANTIC_DATA_FILE)
+        if os.path.exists(path_semantic_data):
+            try:
+                self.semantic_data = self._parse_json_file(path_semantic_data)
+            except Exception as e:
+                self.semantic_data = e
+        for p in os.listdir(self.state_path):
+            child_state_path = os.path.join(self.state_path, p)
+            if os.path.isdir(child_state_path) and os.path.exists(os.path.join(child_state_path, FILE_NAME_CORE_DATA)):
+                self.child_state_paths.append(child_state_path)
+        return self
+
+    def get_core_data(self):
+        """Returns the core data converted into objects, see :func:`load_data_file`"""
+        if isinstance(self.core_data, Exception):
+            raise self.core_data
+        return storage_utils.decode_json_objects(self.core_data)
+
+    def get_semantic_data(self):
+        """Returns the semantic data converted into objects"""
+        if self.semantic_data is None:
+            raise ValueError("Data file not found: {0}".format(os.path.join(self.state_path, SEMANTIC_DATA_FILE)))
+        if isinstance(self.semantic_data, Exception):
+            raise self.semantic_data
+        return storage_utils.decode_json_objects(self.semantic_data)
+
+
+def read_state_files_recursively(state_path, max_workers=None):
+    """Reads the files of a state and all its child states in parallel
+
+    The state directories are discovered level by level, while the files of all known states are read concurrently.
+
+    :param str state_path: the path of the root state
+    :param int max_workers: the number of threads, if None the ``LOAD_SM_THREAD_POOL_SIZE`` config value is used
+    :return: a dict mapping the state paths to :class:`StateFiles`
+    :rtype: dict
+    """
+    if max_workers is None:
+        max_workers = global_config.get_config_value("LOAD_SM_THREAD_POOL_SIZE", 0)
+    state_files = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        pending = [executor.submit(StateFiles(state_path).read)]
+        while pending:
+            files = pending.pop(0).result()
+            state_files[files.state_path] = files
+            pending.extend(executor.submit(StateFiles(child_state_path).read)
+                           for child_state_path in files.child_state_paths)
+    return state_files
+
+
+def load_state_recursively(parent, state_path=None, dirty_states=[], state_files=None):
     """Recursively loads the state
 
     It calls this method on each sub-state of a container state.
 
+    If the config value ``LOAD_SM_THREAD_POOL_SIZE`` is greater than 1, the files of all states are first read in
+    parallel, see :func:`read_state_files_recursively`. Only the creation of the states is done sequentially.
+
     :param parent:  the root state of the last load call to which the loaded state will be added
     :param state_path: the path on the filesystem where to find the meta file for the state
     :param dirty_states: a dict of states which changed during loading
+    :param state_files: a dict of the files of the states read in advance, see :func:`read_state_files_recursively`
     :return:
     """
     from rafcon.core.states.execution_state import ExecutionState
@@ -421,8 +516,15 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
 
     logger.debug("Load state recursively: {0}".format(str(state_path)))
 
+    if state_files is None and global_config.get_config_value("LOAD_SM_THREAD_POOL_SIZE", 0) > 1:
+        state_files = read_state_files_recursively(state_path)
+    files = state_files.get(state_path) if state_files is not None else None
+
     try:
-        state_info = load_data_file(path_core_data)
+        if files is not None:
+            state_info = files.get_core_data()
+        else:
+            state_info = load_data_file(path_core_data)
     except ValueError as e:
         logger.exception("Error while loading state data: {0}".format(e))
         return
@@ -477,28 +579,41 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
 
     # read script file if state is an ExecutionState
     if isinstance(state, ExecutionState):
-        script_text = read_file(state_path, state.script.filename)
+        if files is not None and state.script.filename == SCRIPT_FILE:
+            script_text = files.script_text
+        else:
+            script_text = read_file(state_path, state.script.filename)
         state.script.set_script_without_compilation(script_text)
 
     # load semantic data
     try:
-        semantic_data = load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
+        if files is not None:
+            semantic_data = files.get_semantic_data()
+        else:
+            semantic_data = load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
         state.semantic_data = semantic_data
     except Exception as e:
         # semantic data file does not have to be there
         pass
 
     # load child states
-    for p in os.listdir(state_path):
-        child_state_path = os.path.join(state_path, p)
-        if os.path.isdir(child_state_path):
-            if not os.path.exists(os.path.join(child_state_path, FILE_NAME_CORE_DATA)):
-                # this means that child_state_path is a folder, not containing a valid state
-                # this also happens when pip creates __pycache__ folders for the script.py files upon installing rafcon
-                continue
-            child_state = load_state_recursively(state, child_state_path, dirty_states)
-            if not child_state:
-                return None
+    if files is not None:
+        child_state_paths = files.child_state_paths
+    else:
+        child_state_paths = []
+        for p in os.listdir(state_path):
+            child_state_path = os.path.join(state_path, p)
+            if os.path.isdir(child_state_path):
+                if not os.path.exists(os.path.join(child_state_path, FILE_NAME_CORE_DATA)):
+                    # this means that child_state_path is a folder, not containing a valid state
+                    # this also happens when pip creates __pycache__ folders for the script.py files upon installing
+                    # rafcon
+                    continue
+                child_state_paths.append(child_state_path)
+    for child_state_path in child_state_paths:
+        child_state = load_state_recursively(state, child_state_path, dirty_states, state_files)
+        if not child_state:
+            return None
 
     # Now we can add transitions and data flows, as all child states were added
     if isinstance(state_info, tuple):
@@ -16,6 +16,13 @@ class Singleton:
             self._instance = self._cls(*args, **kwargs)
         return self._instance
 
+    def create_independent_instance(self, *args, **kwargs):
+        """
+        Returns a new instantiation of the class, which is independent of the single instantiation
+        """
+
+        return self._cls(*args, **kwargs)
+
     def __call__(self):
         raise TypeError('The singleton must be accessed through instance()')
 
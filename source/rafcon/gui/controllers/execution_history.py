@@ -27,6 +27,7 @@ from gi.repository import Gtk
 from gi.repository import Gdk
 from gi.repository import GObject
 from threading import RLock
+from collections import deque
 
 import rafcon
 
@@ -58,6 +59,7 @@ class ExecutionHistoryTreeController(ExtendedController):
     """
     HISTORY_ITEM_STORAGE_ID = 1
     TOOL_TIP_STORAGE_ID = 2
+    SECTION_STORAGE_ID = 3
     TOOL_TIP_TEXT = "Right click for more details\n" \
                     "Middle click for external more detailed viewer\n" \
                     "Double click to select corresponding state"
@@ -67,7 +69,8 @@ class ExecutionHistoryTreeController(ExtendedController):
         assert isinstance(view, ExecutionHistoryView)
 
         super(ExecutionHistoryTreeController, self).__init__(model, view)
-        self.history_tree_store = Gtk.TreeStore(GObject.TYPE_STRING, GObject.TYPE_PYOBJECT, GObject.TYPE_STRING)
+        self.history_tree_store = Gtk.TreeStore(GObject.TYPE_STRING, GObject.TYPE_PYOBJECT, GObject.TYPE_STRING,
+                                                GObject.TYPE_PYOBJECT)
         # a TreeView
         self.history_tree = view['history_tree']
         self.history_tree.set_model(self.history_tree_store)
@@ -76,6 +79,10 @@ class ExecutionHistoryTreeController(ExtendedController):
         self.observe_model(state_machine_execution_model)
         self._expansion_state = {}
         self._update_lock = RLock()
+        # the state machine shown by the tree, the sections of its runs and the sections whose rows are loaded
+        self._shown_state_machine = None
+        self._run_sections = []
+        self._loaded_sections = []
 
         self.update()
 
@@ -86,6 +93,7 @@ class ExecutionHistoryTreeController(ExtendedController):
     def register_view(self, view):
         super(ExecutionHistoryTreeController, self).register_view(view)
         self.history_tree.connect('button_press_event', self.mouse_click)
+        self.history_tree.connect('test-expand-row', self._on_test_expand_row)
         view['reload_button'].connect('clicked', self.reload_history)
         view['clean_button'].connect('clicked', self.clean_history)
         view['open_separately_button'].connect('clicked', self.open_selected_history_separately)
@@ -252,7 +260,10 @@ class ExecutionHistoryTreeController(ExtendedController):
         """
         history_item = self.history_tree_store[child_tree_iter][self.HISTORY_ITEM_STORAGE_ID]
         if history_item is None:  # is dummy item
-            if self.history_tree_store.iter_n_children(child_tree_iter) > 0:
+            section = self.history_tree_store[child_tree_iter][self.SECTION_STORAGE_ID]
+            if section is not None:
+                history_item = section.first_history_item
+            elif self.history_tree_store.iter_n_children(child_tree_iter) > 0:
                 child_iter = self.history_tree_store.iter_nth_child(child_tree_iter, 0)
                 history_item = self.history_tree_store[child_iter][self.HISTORY_ITEM_STORAGE_ID]
             else:
@@ -268,7 +279,7 @@ class ExecutionHistoryTreeController(ExtendedController):
             history_item = self.get_history_item_for_tree_iter(child_tree_iter)
 
             # store expansion state if tree item path is valid and expansion state was not stored already
-            if tree_item_path is not None:
+            if tree_item_path is not None and history_item is not None:
                 # if first element of sub-tree has same history_item as the parent ignore it's expansion state
                 if history_item not in expansion_state:
                     expansion_state[history_item] = self.history_tree.row_expanded(tree_item_path)
@@ -330,6 +341,11 @@ class ExecutionHistoryTreeController(ExtendedController):
         for state_machine_id in list(self._expansion_state.keys()):
             if state_machine_id not in self.model.state_machines:
                 del self._expansion_state[state_machine_id]
+        if self._shown_state_machine is not None and \
+                self._shown_state_machine.state_machine_id not in self.model.state_machines:
+            with self._update_lock:
+                self._clear_tree()
+                self._shown_state_machine = None
 
     @ExtendedController.observe("execution_engine", after=True)
     def execution_history_focus(self, model, prop_name, info):
@@ -354,7 +370,7 @@ class ExecutionHistoryTreeController(ExtendedController):
 
         Empties the execution history tree by adjusting the start index and updates tree store and view.
         """
-        self.history_tree_store.clear()
+        self._clear_tree()
         selected_sm_m = self.model.get_selected_state_machine_model()
         if selected_sm_m:
             # the core may continue running without the GUI and for this it needs its execution histories
@@ -367,43 +383,242 @@ class ExecutionHistoryTreeController(ExtendedController):
         self.update()
 
     def update(self):
+        """Appends the history items added since the last update to the tree view
+
+        The rows of the items, which are already shown, are kept together with their expansion state. Only if another
+        state machine is selected or the execution histories were removed, the tree is rebuilt. The rows of older runs
+        and of concurrency branches are only loaded when they are expanded.
         """
-        rebuild the tree view of the history item tree store
-        :return:
-        """
-        # with self._update_lock:
         with self._update_lock:
-            self._store_expansion_state()
-            self.history_tree_store.clear()
             selected_sm_m = self.model.get_selected_state_machine_model()
-            if not selected_sm_m:
+            state_machine = selected_sm_m.state_machine if selected_sm_m else None
+            restore_expansion_state = False
+            if state_machine is not self._shown_state_machine:
+                self._store_expansion_state()
+                self._clear_tree()
+                self._shown_state_machine = state_machine
+                restore_expansion_state = True
+            if state_machine is None:
                 return
 
-            for execution_number, execution_history in enumerate(selected_sm_m.state_machine.execution_histories):
-                if len(execution_history) > 0:
-                    first_history_item = execution_history[0]
-                    # the next lines filter out the StateMachineStartItem, which is not intended to
-                    # be displayed, but merely as convenient entry point in the saved log file
-                    if isinstance(first_history_item, StateMachineStartItem):
-                        if len(execution_history) > 1:
-                            first_history_item = execution_history[1]
-                            tree_item = self.history_tree_store.insert_after(
-                                None,
-                                None,
-                                (first_history_item.state_reference.name + " - Run " + str(execution_number + 1),
-                                 first_history_item, self.TOOL_TIP_TEXT))
-                            self.insert_execution_history(tree_item, execution_history[1:], is_root=True)
-                        else:
-                            pass  # there was only the Start item in the history
-                    else:
-                        tree_item = self.history_tree_store.insert_after(
-                            None,
-                            None,
-                            (first_history_item.state_reference.name + " - Run " + str(execution_number + 1),
-                             first_history_item, self.TOOL_TIP_TEXT))
-                        self.insert_execution_history(tree_item, execution_history, is_root=True)
+            execution_histories = list(state_machine.execution_histories)
+            if len(execution_histories) < len(self._run_sections) or \
+                    any(section is not None and section.execution_history is not execution_histories[execution_number]
+                        for execution_number, section in enumerate(self._run_sections)):
+                self._clear_tree()
+
+            for execution_number, execution_history in enumerate(execution_histories):
+                if execution_number == len(self._run_sections):
+                    self._run_sections.append(None)
+                if self._run_sections[execution_number] is None:
+                    # only the latest run is loaded immediately, the older runs are loaded when they are expanded
+                    self._run_sections[execution_number] = self._insert_run(
+                        execution_number, execution_history, load=execution_number == len(execution_histories) - 1)
+
+            for section in list(self._loaded_sections):
+                self._append_new_history_items(section)
+
+            if restore_expansion_state:
+                self._restore_expansion_state()
 
-            self._restore_expansion_state()
+    def _clear_tree(self):
+        self.history_tree_store.clear()
+        self._run_sections = []
+        self._loaded_sections = []
+
+    def _insert_run(self, execution_number, execution_history, load):
+        """Inserts the row of a run, the items of the run are inserted by :meth:`_load_section`
+
+        :param int execution_number: the index of the execution history of the run
+        :param ExecutionHistory execution_history: the execution history of the run
+        :param bool load: True, if the items of the run are inserted immediately, else the row is a collapsed
+            placeholder until it is expanded
+        :return: the section of the run or None, if the run has no item to be shown, yet
+        :rtype: HistoryTreeSection
+        """
+        if len(execution_history) == 0:
+            return None
+        first_history_item = execution_history[0]
+        # the StateMachineStartItem is not intended to be displayed, but merely as convenient entry point in the
+        # saved log file
+        if isinstance(first_history_item, StateMachineStartItem):
+            if len(execution_history) < 2:
+                return None
+            first_history_item = execution_history[1]
+        tree_item = self.history_tree_store.insert_after(
+            None,
+            None,
+            (first_history_item.state_reference.name + " - Run " + str(execution_number + 1),
+             first_history_item, self.TOOL_TIP_TEXT, None))
+        section = HistoryTreeSection(execution_history, tree_item, first_history_item, is_run=True)
+        self._add_section(section, load)
+        return section
+
+    def _add_section(self, section, load):
+        self.history_tree_store.set_value(section.tree_item, self.SECTION_STORAGE_ID, section)
+        if load:
+            self._load_section(section)
+        else:
+            # the placeholder lets the row be expanded
+            self.history_tree_store.insert_before(section.tree_item, None, ("...", None, None, None))
+
+    def _load_section(self, section):
+        """Replaces the placeholder of a section by the rows of its history items"""
+        if section.loaded:
+            return
+        placeholder_iter = self.history_tree_store.iter_children(section.tree_item)
+        if placeholder_iter is not None:
+            self.history_tree_store.remove(placeholder_iter)
+        section.loaded = True
+        self._loaded_sections.append(section)
+        self._append_new_history_items(section)
+
+    def _reset_section(self, section):
+        """Removes the rows of all history items of a section"""
+        child_iter = self.history_tree_store.iter_children(section.tree_item)
+        while child_iter is not None and self.history_tree_store.remove(child_iter):
+            pass
+        for child_section in section.child_sections:
+            self._remove_loaded_section(child_section)
+        section.reset()
+
+    def _remove_loaded_section(self, section):
+        if section in self._loaded_sections:
+            self._loaded_sections.remove(section)
+        for child_section in section.child_sections:
+            self._remove_loaded_section(child_section)
+
+    def _on_test_expand_row(self, tree_view, tree_iter, tree_path):
+        """Loads the rows of a run or concurrency branch, when it is expanded the first time"""
+        section = self.history_tree_store.get_value(tree_iter, self.SECTION_STORAGE_ID)
+        if section is not None and not section.loaded:
+            with self._update_lock:
+                self._load_section(section)
+        return False
+
+    def _append_new_history_items(self, section):
+        """Inserts the history items of a section, which were added since the last update
+
+        If the oldest items were evicted from a bounded history, their rows are removed, see
+        :meth:`_remove_evicted_rows`.
+        """
+        execution_history = section.execution_history
+        if execution_history.destroyed:
+            return
+        history_items = section.get_new_history_items()
+        if history_items is None:
+            # the last inserted item was removed from the history, e.g. by a backward step, thus the section is rebuilt
+            self._reset_section(section)
+            history_items = list(execution_history)
+        if section.last_item is None:
+            # the counter is read after the items, thus a concurrent eviction can only delay the removal of rows
+            section.next_index = getattr(execution_history, 'number_of_evicted_items', 0)
+        self._insert_pending_branches(section)
+        for history_item in history_items:
+            section.pending_branches = []
+            self._insert_section_history_item(section, history_item, section.next_index)
+            section.next_index += 1
+            section.last_item = history_item
+        if getattr(execution_history, 'truncated', False):
+            self._remove_evicted_rows(section)
+
+    def _remove_evicted_rows(self, section):
+        """Removes the rows of the history items of a section, which were evicted from its bounded history
+
+        The rows of concurrency branches are removed together with their items. The row of a state is kept as long as
+        it contains rows of retained items.
+        """
+        number_of_evicted_items = section.execution_history.number_of_evicted_items
+        evicted_rows = []
+        while section.inserted_rows and section.inserted_rows[0][0] < number_of_evicted_items:
+            evicted_rows.append(section.inserted_rows.popleft())
+        kept_rows = []
+        # the newest rows are removed first, thus the rows of a state have been removed when its row is checked
+        for index, tree_item, branch_section in reversed(evicted_rows):
+            if branch_section is not None:
+                section.child_sections.remove(branch_section)
+                self._remove_loaded_section(branch_section)
+            elif self.history_tree_store.iter_has_child(tree_item):
+                kept_rows.append((index, tree_item, branch_section))
+                continue
+            self.history_tree_store.remove(tree_item)
+        section.inserted_rows.extendleft(kept_rows)
+
+    def _insert_section_history_item(self, section, history_item, index):
+        """Inserts a history item into the rows of its section
+
+        Each CallItem of type EXECUTE, which is followed by a CallItem of type CONTAINER, opens a new hierarchy in the
+        tree view, which is closed by the ReturnItem of type CONTAINER.
+
+        :param HistoryTreeSection section: the section of the execution history of the item
+        :param HistoryItem history_item: the history item to be inserted
+        :param int index: the index of the item in its execution history, including the evicted items
+        """
+        if isinstance(history_item, StateMachineStartItem):
+            return
+
+        execute_call_tree_item = section.execute_call_tree_item
+        section.execute_call_tree_item = None
+        is_root = section.is_root
+        section.is_root = False
+
+        tree_item = None
+        if isinstance(history_item, ConcurrencyItem):
+            section.pending_branches = [(section.current_parent, execution_history, index)
+                                        for execution_history in history_item.execution_histories]
+            self._insert_pending_branches(section)
+
+        elif isinstance(history_item, CallItem):
+            if history_item.call_type is CallType.CONTAINER and execute_call_tree_item is not None:
+                section.current_parent = execute_call_tree_item
+                tree_item = self.insert_history_item(section.current_parent, history_item, "Enter")
+            else:
+                tree_item = self.insert_history_item(section.current_parent, history_item,
+                                                     "Enter" if is_root else "Call")
+                if tree_item and history_item.call_type is CallType.EXECUTE:
+                    section.execute_call_tree_item = tree_item
+
+        else:  # history_item is ReturnItem
+            if section.current_parent is None:
+                # The reasons here can be: missing history items, items in the wrong order etc.
+                # Does not happen when using RAFCON without plugins
+                logger.error("Invalid execution history: current_parent is None")
+                return
+            if history_item.call_type is CallType.EXECUTE:
+                tree_item = self.insert_history_item(section.current_parent, history_item, "Return")
+            else:  # CONTAINER
+                tree_item = self.insert_history_item(section.current_parent, history_item, "Exit")
+                if self.history_tree_store.get_path(section.current_parent) != \
+                        self.history_tree_store.get_path(section.tree_item):
+                    section.current_parent = self.history_tree_store.iter_parent(section.current_parent)
+                # else the state was entered before the oldest retained item of a bounded history
+
+        if tree_item is not None:
+            section.inserted_rows.append((index, tree_item, None))
+
+    def _insert_pending_branches(self, section):
+        """Inserts the rows of the concurrency branches of a section, which have items by now
+
+        The branches of a concurrency state are shown as collapsed rows, their items are loaded when they are expanded.
+        Branches without items, e.g. the one of the decider state of a barrier concurrency state, remain pending until
+        the next item of the section.
+        """
+        pending_branches = []
+        for parent, execution_history, index in section.pending_branches:
+            if len(execution_history) == 0:
+                pending_branches.append((parent, execution_history, index))
+                continue
+            first_history_item = execution_history[0]
+            # this is just a dummy item to have an extra parent for each branch
+            # gives better overview in case that one of the child state is a simple execution state
+            tree_item = self.insert_history_item(parent, first_history_item, "Concurrency Branch", dummy=True)
+            if tree_item is None:
+                continue
+            branch_section = HistoryTreeSection(execution_history, tree_item, first_history_item)
+            section.child_sections.append(branch_section)
+            section.inserted_rows.append((index, tree_item, branch_section))
+            self._add_section(branch_section, load=False)
+        section.pending_branches = pending_branches
 
     def insert_history_item(self, parent, history_item, description, dummy=False):
         """Enters a single history item into the tree store
@@ -423,73 +638,68 @@ class ExecutionHistoryTreeController(ExtendedController):
             content = (history_item.state_reference.name + " - " +
                            history_item.state_reference.get_path() + " - " +
                            description, None if dummy else history_item,
-                           None if dummy else self.TOOL_TIP_TEXT)
+                           None if dummy else self.TOOL_TIP_TEXT, None)
         else:
             content = (history_item.state_reference.name + " - " +
                            description, None if dummy else history_item,
-                           None if dummy else self.TOOL_TIP_TEXT)
+                           None if dummy else self.TOOL_TIP_TEXT, None)
 
         tree_item = self.history_tree_store.insert_before(
             parent, None, content)
         return tree_item
 
-    def insert_execution_history(self, parent, execution_history, is_root=False):
-        """Insert a list of history items into a the tree store
-
-        If there are concurrency history items, the method is called recursively.
 
-        :param Gtk.TreeItem parent: the parent to add the next history item to
-        :param ExecutionHistory execution_history: all history items of a certain state machine execution
-        :param bool is_root: Whether this is the root execution history
-        """
-        current_parent = parent
-        execution_history_iterator = iter(execution_history)
-        for history_item in execution_history_iterator:
-            if isinstance(history_item, ConcurrencyItem):
-                self.insert_concurrent_execution_histories(current_parent, history_item.execution_histories)
-
-            elif isinstance(history_item, CallItem):
-                tree_item = self.insert_history_item(current_parent, history_item, "Enter" if is_root else "Call")
-                if not tree_item:
-                    return
-                if history_item.call_type is CallType.EXECUTE:
-                    # this is necessary that already the CallType.EXECUTE item opens a new hierarchy in the
-                    # tree view and not the CallType.CONTAINER item
-                    next_history_item = history_item.next
-                    if next_history_item and next_history_item.call_type is CallType.CONTAINER:
-                        current_parent = tree_item
-                        self.insert_history_item(current_parent, next_history_item, "Enter")
-                        try:
-                            next(execution_history_iterator)  # skips the next history item in the iterator
-                        except StopIteration as e:
-                            # the execution engine does not have another item
-                            return
-
-            else:  # history_item is ReturnItem
-                if current_parent is None:
-                    # The reasons here can be: missing history items, items in the wrong order etc.
-                    # Does not happen when using RAFCON without plugins
-                    logger.error("Invalid execution history: current_parent is None")
-                    return
-                if history_item.call_type is CallType.EXECUTE:
-                    self.insert_history_item(current_parent, history_item, "Return")
-                else:  # CONTAINER
-                    self.insert_history_item(current_parent, history_item, "Exit")
-                    current_parent = self.history_tree_store.iter_parent(current_parent)
+class HistoryTreeSection(object):
+    """The rows of an execution history of a run or of a concurrency branch in the execution history tree
 
-            is_root = False
+    The section remembers the last inserted history item and the parent row of the next one. Thus, an update of the
+    tree only inserts the items added since then, following the links of the history items.
 
-    def insert_concurrent_execution_histories(self, parent, concurrent_execution_histories):
-        """Adds the child execution histories of a concurrency state.
+    :param ExecutionHistory execution_history: the execution history shown by the section
+    :param Gtk.TreeIter tree_item: the row, the rows of the history items are inserted into
+    :param HistoryItem first_history_item: the item representing the section, e.g. if its row is collapsed
+    :param bool is_run: True, if the section shows a run and not a concurrency branch
+    """
 
-        :param Gtk.TreeItem parent: the parent to add the next history item to
-        :param list[ExecutionHistory] concurrent_execution_histories: a list of all child execution histories
-        :return:
+    def __init__(self, execution_history, tree_item, first_history_item, is_run=False):
+        self.execution_history = execution_history
+        self.tree_item = tree_item
+        self.first_history_item = first_history_item
+        self.is_run = is_run
+        self.loaded = False
+        self.reset()
+
+    def reset(self):
+        """Forgets all inserted history items"""
+        self.last_item = None
+        self.current_parent = self.tree_item
+        self.execute_call_tree_item = None
+        self.is_root = self.is_run
+        # the index of the next item in the execution history, including the evicted items
+        self.next_index = 0
+        # the index of the item, the row and the section of a concurrency branch of each inserted row in the order of
+        # insertion
+        self.inserted_rows = deque()
+        # the parent rows, execution histories and indices of the branches of the last concurrency item, which had no
+        # items, yet
+        self.pending_branches = []
+        self.child_sections = []
+
+    def get_new_history_items(self):
+        """Returns the history items added after the last inserted item
+
+        :return: the new history items or None, if the last inserted item was removed from the history, e.g. by a
+            backward step or by the eviction from a bounded history
+        :rtype: list
         """
-        for execution_history in concurrent_execution_histories:
-            if len(execution_history) >= 1:
-                first_history_item = execution_history[0]
-                # this is just a dummy item to have an extra parent for each branch
-                # gives better overview in case that one of the child state is a simple execution state
-                tree_item = self.insert_history_item(parent, first_history_item, "Concurrency Branch", dummy=True)
-                self.insert_execution_history(tree_item, execution_history)
+        if self.last_item is None:
+            return list(self.execution_history)
+        history_items = []
+        history_item = self.last_item.next
+        while history_item is not None:
+            history_items.append(history_item)
+            history_item = history_item.next
+        if history_items or self.last_item is self.execution_history.get_last_history_item():
+            return history_items
+        # the last inserted item was popped or evicted from a bounded history, like all other inserted items
+        return None
@@ -425,7 +425,11 @@ class GraphicalEditorController(ExtendedController):
 
             if method_name == 'state_execution_status':
                 state_v = self.canvas.get_view_for_model(model)
-                if state_v:  # Children of LibraryStates are not modeled, yet
+                # Children of LibraryStates are not modeled, yet
+                # States outside of the viewport or within collapsed states are not updated, as the execution status
+                # does not change the geometry and is drawn, as soon as the state becomes visible
+                if state_v and self.view.editor.is_in_viewport(state_v) and \
+                        not (state_v.parent and state_v.parent.content_hidden()):
                     self.canvas.request_update(state_v, matrix=False)
             elif method_name == 'add_state':
                 new_state = arguments[1]
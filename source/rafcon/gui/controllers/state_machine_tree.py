@@ -163,7 +163,8 @@ class StateMachineTreeController(TreeViewController):
         # TODO check the work around for get_library_root_state -> maybe the notifications can be avoided if upper lib
         elif overview.get_affected_property() == 'state' and not overview.get_affected_model().state.get_next_upper_library_root_state() and \
                 overview.get_cause() in ["add_state", "remove_state"]:
-            self.update(overview.get_affected_model())
+            if not self.update_incrementally(overview):
+                self.update(overview.get_affected_model())
 
     @TreeViewController.observe("state_meta_signal", signal=True)
     def state_meta_update(self, model, prop_name, info):
@@ -320,6 +321,48 @@ class StateMachineTreeController(TreeViewController):
         # do recursive update
         self.insert_and_update_recursively(parent_row_iter, changed_state_model, with_expand)
 
+    def update_incrementally(self, overview):
+        """Inserts or removes only the row of the added or removed child state
+
+        In contrast to :meth:`update`, the rows of the siblings are not checked and keep their expansion state.
+
+        :param rafcon.gui.utils.notification_overview.NotificationOverview overview: The overview of the after
+            notification of an add_state or remove_state call
+        :return: True if the tree is up to date, False if the container state has to be updated by :meth:`update`
+        :rtype: bool
+        """
+        if not self.view_is_registered:
+            return True
+
+        container_m = overview.get_affected_model()
+        result = overview.get_result()
+        if isinstance(result, Exception) or not isinstance(container_m, ContainerStateModel):
+            return False
+        container_path = container_m.state.get_path()
+        if container_path not in self.state_row_iter_dict_by_state_path:
+            return False
+
+        if overview.get_cause() == "add_state":
+            child_m = container_m.states.get(result)
+            if child_m is None:
+                return False
+            self.insert_and_update_recursively(self.state_row_iter_dict_by_state_path[container_path], child_m)
+            return True
+
+        # the removed state has no parent anymore, thus its former path is derived from the container state
+        state_path = container_m.state.get_path(appendix=result.state_id)
+        if state_path not in self.state_row_iter_dict_by_state_path:
+            # e.g. a library state shown by the row of its library root state
+            return False
+        state_row_iter = self.state_row_iter_dict_by_state_path.pop(state_path)
+        self._state_which_is_updated = container_m
+        try:
+            self.remove_tree_children(state_row_iter)
+            self.tree_store.remove(state_row_iter)
+        finally:
+            self._state_which_is_updated = None
+        return True
+
     def get_row_iter_for_state_model(self, state_model):
         if state_model.state.get_path() not in self.state_row_iter_dict_by_state_path:
             if isinstance(state_model, LibraryStateModel) and \
@@ -11,6 +11,7 @@
 # Sebastian Brunner <sebastian.brunner@dlr.de>
 
 import os.path
+import threading
 from copy import copy, deepcopy
 from weakref import ref
 from rafcon.design_patterns.mvc.model import ModelMT
@@ -19,6 +20,7 @@ import rafcon.design_patterns.observer.wrappers as wrappers
 
 from rafcon.gui.models.signals import MetaSignalMsg, Notification
 from rafcon.gui.models.meta import MetaModel
+from rafcon.gui.utils.notification_coalescer import execution_status_coalescer
 
 from rafcon.core.states.container_state import ContainerState
 from rafcon.core.states.library_state import LibraryState
@@ -118,6 +120,25 @@ class AbstractStateModel(MetaModel, Hashable):
     def __str__(self):
         return "Model of state: {0}".format(self.state)
 
+    def notify_observer(self, observer, method, *args, **kwargs):
+        """Notifies an observer
+
+        The execution status changes of states executed in other threads are not notified one by one, but coalesced
+        and notified at a limited rate, see :class:`rafcon.gui.utils.notification_coalescer.NotificationCoalescer`.
+        """
+        info = args[-1] if args else None
+        if isinstance(info, dict) and info.get('method_name') == 'state_execution_status' and \
+                self._threads.get(observer) is not threading.currentThread() and execution_status_coalescer.rate > 0:
+            key = (self, method, 'before' in info)
+            execution_status_coalescer.add(key, self._notify_coalesced_observer, observer, method, args, kwargs)
+            return
+        return super(AbstractStateModel, self).notify_observer(observer, method, *args, **kwargs)
+
+    def _notify_coalesced_observer(self, observer, method, args, kwargs):
+        # the observer could have been relieved since the notification
+        if observer in self._threads:
+            self._idle_notify_observer(method, args, kwargs)
+
     def __eq__(self, other):
         if type(self) != type(other):
             return False
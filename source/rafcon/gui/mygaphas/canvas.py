@@ -12,13 +12,24 @@
 # Rico Belder <rico.belder@dlr.de>
 # Sebastian Brunner <sebastian.brunner@dlr.de>
 
+from itertools import chain
+
 import gaphas.canvas
 from gaphas.item import Item
+from gaphas.quadtree import Quadtree
+from gaphas.geometry import rectangle_contains
 
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
 
+def transform_rectangle(transform_point, x0, y0, x1, y1):
+    """Transforms the corners of a rectangle and returns the rectangle spanned by them as (x, y, width, height)"""
+    x0, y0 = transform_point(x0, y0)
+    x1, y1 = transform_point(x1, y1)
+    return min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0)
+
+
 class MyCanvas(gaphas.canvas.Canvas):
 
     _core_view_map = None
@@ -29,6 +40,13 @@ class MyCanvas(gaphas.canvas.Canvas):
         self._core_view_map = {}
         self._model_view_map = {}
 
+        # Spatial index of the bounding boxes of the states and their ports in canvas coordinates. The states, which
+        # were moved, resized or got new ports, are only collected and indexed with the next query.
+        self._state_index = Quadtree()
+        self._port_index = Quadtree()
+        self._indexed_ports = {}
+        self._states_to_index = set()
+
     def _add_view_maps(self, view):
         model = view.model
         if model.core_element in self._core_view_map:
@@ -64,11 +82,16 @@ class MyCanvas(gaphas.canvas.Canvas):
             logger.info("The destruct of gaphas items has to be fixed!")
 
     def add_port(self, port_v):
+        self._states_to_index.add(port_v.parent)
         # The LibraryState and its state_copy share the same port core_elements
         if not port_v.parent.is_root_state_of_library:
             self._add_view_maps(port_v)
 
     def remove_port(self, port_v):
+        indexed_ports = self._indexed_ports.get(port_v.parent)
+        if indexed_ports and port_v.port in indexed_ports:
+            indexed_ports.remove(port_v.port)
+            self._port_index.remove(port_v.port)
         # The LibraryState and its state_copy share the same port core_elements
         if not port_v.parent.is_root_state_of_library:
             self._remove_view_maps(port_v)
@@ -80,6 +103,98 @@ class MyCanvas(gaphas.canvas.Canvas):
         self._core_view_map[new_model.core_element] = view
         self._model_view_map[new_model] = view
 
+    def _update_views(self, dirty_items=(), dirty_matrix_items=(), removed_items=()):
+        from rafcon.gui.mygaphas.items.state import StateView
+        for item in removed_items:
+            self._remove_from_spatial_index(item)
+        self._states_to_index.update(item for item in chain(dirty_items, dirty_matrix_items)
+                                     if isinstance(item, StateView))
+        super(MyCanvas, self)._update_views(dirty_items, dirty_matrix_items, removed_items)
+
+    def _remove_from_spatial_index(self, item):
+        self._states_to_index.discard(item)
+        if item in self._state_index:
+            self._state_index.remove(item)
+        for port in self._indexed_ports.pop(item, ()):
+            self._port_index.remove(port)
+
+    def _get_item_bounds(self, item):
+        """Returns the rectangle of an element in canvas coordinates"""
+        return transform_rectangle(self.get_matrix_i2c(item).transform_point, 0, 0, item.width, item.height)
+
+    def _update_spatial_index_bounds(self):
+        """Resizes the spatial index, if the root states exceed its bounds
+
+        The items outside the bounds of a quadtree are not found, thus the bounds include a margin around the root
+        states, in which they can grow without rebuilding the index.
+        """
+        root_bounds = [self._get_item_bounds(item) for item in self.get_root_items() if hasattr(item, 'width')]
+        if not root_bounds:
+            return
+        x0 = min(bounds[0] for bounds in root_bounds)
+        y0 = min(bounds[1] for bounds in root_bounds)
+        x1 = max(bounds[0] + bounds[2] for bounds in root_bounds)
+        y1 = max(bounds[1] + bounds[3] for bounds in root_bounds)
+        if rectangle_contains((x0, y0, x1 - x0, y1 - y0), self._state_index.bounds):
+            return
+        margin = max(x1 - x0, y1 - y0) / 2.
+        bounds = (x0 - margin, y0 - margin, x1 - x0 + 2 * margin, y1 - y0 + 2 * margin)
+        self._state_index.resize(bounds)
+        self._port_index.resize(bounds)
+
+    def _index_state(self, state_v):
+        """Updates the bounding boxes of a state and its ports in the spatial index"""
+        i2c = self.get_matrix_i2c(state_v).transform_point
+        ports = set(state_v.ports())
+        for port in self._indexed_ports.get(state_v, set()) - ports:
+            self._port_index.remove(port)
+        x0, y0, width, height = self._get_item_bounds(state_v)
+        x1, y1 = x0 + width, y0 + height
+        for port in ports:
+            port_x, port_y = float(port.point.x), float(port.point.y)
+            half_width, half_height = port.width / 2., port.height / 2.
+            port_bounds = transform_rectangle(i2c, port_x - half_width, port_y - half_height,
+                                              port_x + half_width, port_y + half_height)
+            self._port_index.add(port, port_bounds, state_v)
+            # the ports can stick out of the state
+            x0, y0 = min(x0, port_bounds[0]), min(y0, port_bounds[1])
+            x1, y1 = max(x1, port_bounds[0] + port_bounds[2]), max(y1, port_bounds[1] + port_bounds[3])
+        self._indexed_ports[state_v] = ports
+        self._state_index.add(state_v, (x0, y0, x1 - x0, y1 - y0))
+
+    def update_spatial_index(self):
+        """Updates the spatial index for all states, which were changed since the last update"""
+        if not self._states_to_index:
+            return
+        self._update_spatial_index_bounds()
+        states_to_index, self._states_to_index = self._states_to_index, set()
+        for state_v in states_to_index:
+            if state_v.canvas is self:
+                self._index_state(state_v)
+
+    def get_states_in_rectangle(self, rect, intersect=True):
+        """Returns the states, whose bounding boxes (including their ports) intersect with the rectangle
+
+        :param rect: the rectangle (x, y, width, height) in canvas coordinates
+        :param bool intersect: if False, only the states inside of the rectangle are returned
+        :return: the found states
+        :rtype: set
+        """
+        self.update_spatial_index()
+        if intersect:
+            return self._state_index.find_intersect(rect)
+        return self._state_index.find_inside(rect)
+
+    def get_ports_in_rectangle(self, rect):
+        """Returns the ports of states, whose bounding boxes intersect with the rectangle
+
+        :param rect: the rectangle (x, y, width, height) in canvas coordinates
+        :return: a list of tuples of the state and the port
+        :rtype: list
+        """
+        self.update_spatial_index()
+        return [(self._port_index.get_data(port), port) for port in self._port_index.find_intersect(rect)]
+
     def update_root_items(self):
         for root_item in self.get_root_items():
             self.request_update(root_item)
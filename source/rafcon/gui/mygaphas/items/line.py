@@ -180,6 +180,13 @@ class PerpLine(Line):
     def draw(self, context):
         if self.parent and self.parent.moving:
             return
+        # Level of detail: connections within collapsed states are not drawn and connections within small states are
+        # drawn without waypoints and labels
+        show_details = True
+        if self.parent and not context.draw_all:
+            if self.parent.content_hidden():
+                return
+            show_details = self.parent.show_labels()
 
         def draw_line_end(pos, angle, port, draw):
             cr.save()
@@ -206,12 +213,15 @@ class PerpLine(Line):
 
         # Draw connection line from waypoint to waypoint
         cr.move_to(*self._handles[start_segment_index].pos)
-        for h in self._handles[start_segment_index+1:end_segment_index]:
-            cr.line_to(*h.pos)
+        if show_details:
+            for h in self._handles[start_segment_index+1:end_segment_index]:
+                cr.line_to(*h.pos)
+        else:
+            cr.line_to(*self._handles[end_segment_index - 1].pos)
         cr.set_source_rgba(*self._line_color)
         cr.stroke()
 
-        if self.name and (isinstance(self.from_port, LogicPortView) or
+        if show_details and self.name and (isinstance(self.from_port, LogicPortView) or
                           global_gui_config.get_config_value("SHOW_NAMES_ON_DATA_FLOWS", default=True)):
             self._draw_name(context)
 
@@ -286,7 +286,8 @@ class PortView(object):
             # Copy image surface to current cairo context
             self._port_image_cache.copy_image_to_context(context.cairo, upper_left_corner, zoom=current_zoom)
 
-        if self.name and self.has_label():
+        # Level of detail: the labels of ports of small states are not drawn
+        if self.name and self.has_label() and (context.draw_all or self.parent.show_labels()):
             self.draw_name(context, transparency, value)
 
         if self.is_selected() or self.handle is view.hovered_handle or context.draw_all:
@@ -692,6 +693,7 @@ class ScopedVariablePortView(PortView):
             'side_length': side_length,
             'selected': self.is_selected(),
             'transparency': state.transparency,
+            'show_label': state.show_labels(),
             'draw_all': context.draw_all
         }
         current_zoom = view.get_zoom_factor()
@@ -732,7 +734,7 @@ class ScopedVariablePortView(PortView):
 
             # Second, write the text in the rectangle (scoped variable name)
             # Set the current point to be in the center of the rectangle
-            if not context.draw_all:
+            if not context.draw_all and parameters['show_label']:
                 c.move_to(port_size[0] / 2., port_size[1] / 2.)
                 self.draw_name(c, state.transparency)
 
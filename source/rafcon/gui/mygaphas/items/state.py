@@ -93,6 +93,7 @@ class StateView(Element):
 
         self.__symbol_size_cache = {}
         self._image_cache = ImageCache()
+        self._content_hidden_cache = None
 
         self._border_width = Variable(min(self.width, self.height) / constants.BORDER_WIDTH_STATE_SIZE_FACTOR)
         border_width_constraint = BorderWidthConstraint(self._handles[NW].pos, self._handles[SE].pos,
@@ -331,6 +332,43 @@ class StateView(Element):
             return not with_content or isinstance(self.model.state_copy, ContainerStateModel)
         return False
 
+    def _get_minimum_view_size(self):
+        view_width, view_height = self.view.get_matrix_i2v(self).transform_distance(self.width, self.height)
+        return min(abs(view_width), abs(view_height))
+
+    def content_collapsed(self):
+        """Checks if the level of detail collapses the content of the state into a single box
+
+        This is the case for container states and libraries with shown content, which are smaller than
+        LEVEL_OF_DETAIL_MINIMUM_CONTENT_SIZE pixels in the view.
+
+        :return: Whether the child states and connections of the state are not drawn
+        """
+        if not isinstance(self.model, ContainerStateModel) and not self.show_content():
+            return False
+        return self._get_minimum_view_size() < gui_config.get_config_value('LEVEL_OF_DETAIL_MINIMUM_CONTENT_SIZE', 0)
+
+    def content_hidden(self):
+        """Checks if the content of the state or of one of its parents is collapsed
+
+        The result is computed once per draw pass and zoom factor of the view. The parents reuse their cached
+        results, so the level of detail of every ancestor is only evaluated once.
+
+        :return: Whether the child states and connections of the state are not drawn
+        """
+        cache_key = (self.view.draw_pass, self.view.get_zoom_factor())
+        if self._content_hidden_cache is None or self._content_hidden_cache[0] != cache_key:
+            content_hidden = self.content_collapsed() or bool(self.parent and self.parent.content_hidden())
+            self._content_hidden_cache = (cache_key, content_hidden)
+        return self._content_hidden_cache[1]
+
+    def show_labels(self):
+        """Checks if the state is large enough in the view to show the labels of its ports and connections
+
+        :return: Whether port labels, connection labels and connection waypoints are drawn
+        """
+        return self._get_minimum_view_size() >= gui_config.get_config_value('LEVEL_OF_DETAIL_MINIMUM_LABEL_SIZE', 0)
+
     @staticmethod
     def get_state_drawing_area(state):
         assert isinstance(state, StateView)
@@ -402,6 +440,9 @@ class StateView(Element):
         if min(view_width, view_height) < constants.MINIMUM_STATE_SIZE_FOR_DISPLAY and self.parent and not \
                 context.draw_all:
             return
+        # Do not draw the state if the level of detail collapses the content of one of its parents
+        if self.parent and self.parent.content_hidden() and not context.draw_all:
+            return
 
         c = context.cairo
         nw = self._handles[NW].pos
@@ -411,6 +452,7 @@ class StateView(Element):
             'moving': self.moving,
             'border_width': border_width,
             'transparency': self.transparency,
+            'content_collapsed': self.content_collapsed() and not context.draw_all,
             'draw_all': context.draw_all
         }
 
@@ -464,6 +506,13 @@ class StateView(Element):
                 c.stroke()
                 self.background_changed = False
 
+                if parameters['content_collapsed']:
+                    # The child states are not drawn, instead a single box represents the content of the state
+                    c.rectangle(inner_nw.x + border_width, inner_nw.y + border_width,
+                                inner_se.x - inner_nw.x - 2 * border_width, inner_se.y - inner_nw.y - 2 * border_width)
+                    c.set_source_rgba(*get_col_rgba(state_border_color, transparency=.5))
+                    c.fill()
+
             # Copy image surface to current cairo context
             self._image_cache.copy_image_to_context(context.cairo, upper_left_corner, zoom=current_zoom)
 
@@ -961,6 +1010,10 @@ class NameView(Element):
         view_width, view_height = self.view.get_matrix_i2v(self).transform_distance(width, height)
         if min(view_width, view_height) < constants.MINIMUM_NAME_SIZE_FOR_DISPLAY and not context.draw_all:
             return
+        # Do not draw the name if the level of detail collapses the content of one of the parents of the state
+        parent_state_v = self.parent.parent
+        if parent_state_v and parent_state_v.content_hidden() and not context.draw_all:
+            return
         font_transparency = self.transparency
 
         c = context.cairo
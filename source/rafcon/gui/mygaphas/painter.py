@@ -134,6 +134,9 @@ class LineSegmentPainter(ItemPaintHovered):
         view = self.view
         item = self.item
         cr = context.cairo
+        # Level of detail: the waypoints of connections within small states are not drawn
+        if item.parent and not item.parent.show_labels():
+            return
         h = item.handles()
         side_length = get_side_length_of_resize_handle(self.view, item.parent) / 1.5
         for h1, h2 in zip(h[1:-2], h[2:-1]):
@@ -13,12 +13,15 @@
 
 from contextlib import contextmanager
 from weakref import ref
+from cairo import Matrix
 from rafcon.design_patterns.observer.observer import Observer
 
 from gaphas.view import GtkView
 from gaphas.item import Element
+from gaphas.geometry import rectangle_intersects
 
-from rafcon.gui.mygaphas.items.state import StateView
+from rafcon.gui.mygaphas.canvas import transform_rectangle
+from rafcon.gui.mygaphas.items.state import StateView, NameView
 from rafcon.gui.mygaphas.utils.cache.value_cache import ValueCache
 
 
@@ -27,6 +30,7 @@ class ExtendedGtkView(GtkView, Observer):
     hovered_handle = None
     _selection = None
     _widget_pos = None
+    draw_pass = 0
 
     def __init__(self, graphical_editor_v, state_machine_m, *args):
         GtkView.__init__(self, *args)
@@ -79,17 +83,27 @@ class ExtendedGtkView(GtkView, Observer):
         item = None
 
         rect = (vx - distance, vy - distance, distance * 2, distance * 2)
-        items = self.get_items_in_rectangle(rect, reverse=True)
-        for i in items:
+        # The ports of the states are looked up in the spatial index of the canvas, only the few other items at the
+        # point, e.g. connections, are checked port by port
+        ports_by_item = {}
+        for i, p in self.canvas.get_ports_in_rectangle(self.get_canvas_rectangle(rect)):
+            ports_by_item.setdefault(i, []).append(p)
+        for i in self._qtree.find_intersect(rect):
+            if not isinstance(i, StateView):
+                ports_by_item[i] = i.ports()
+
+        for i in self.canvas.sort(ports_by_item, reverse=True):
             if exclude and i in exclude:
                 continue
-            for p in i.ports():
+            if self.is_hidden(i):
+                continue
+            ix, iy = v2i(i).transform_point(vx, vy)
+            for p in ports_by_item[i]:
                 if not p.connectable:
                     continue
                 if exclude_port_fun and exclude_port_fun(p):
                     continue
 
-                ix, iy = v2i(i).transform_point(vx, vy)
                 pg, d = p.glue((ix, iy))
                 if d > max_dist:
                     continue
@@ -108,11 +122,55 @@ class ExtendedGtkView(GtkView, Observer):
     def get_state_at_point(self, vpos, distance=10):
         vx, vy = vpos
         rect = (vx - distance, vy - distance, distance * 2, distance * 2)
-        items = self.get_items_in_rectangle(rect, reverse=True)
-        for item in items:
-            if isinstance(item, StateView):
-                return item
-        return None
+        states = [state_v for state_v in self.canvas.get_states_in_rectangle(self.get_canvas_rectangle(rect))
+                  if not self.is_hidden(state_v)]
+        if not states:
+            return None
+        return self.canvas.sort(states, reverse=True)[0]
+
+    def get_canvas_rectangle(self, rect):
+        """Transforms a rectangle from view to canvas coordinates
+
+        :param rect: the rectangle (x, y, width, height) in view coordinates
+        :return: the rectangle (x, y, width, height) in canvas coordinates
+        """
+        v2c = Matrix(*self.matrix)
+        v2c.invert()
+        return transform_rectangle(v2c.transform_point, rect[0], rect[1], rect[0] + rect[2], rect[1] + rect[3])
+
+    def is_in_viewport(self, item):
+        """Checks if the bounding box of the item intersects the visible part of the view
+
+        :param item: the item to be checked
+        :return: Whether the item is (partly) visible, True if the item has no bounding box, yet
+        """
+        try:
+            bounds = self.get_item_bounding_box(item)
+        except KeyError:
+            return True
+        allocation = self.get_allocation()
+        return rectangle_intersects(tuple(bounds), (0, 0, allocation.width, allocation.height))
+
+    def is_hidden(self, item):
+        """Checks if the level of detail hides the item, as the content of one of its parents is collapsed
+
+        :param item: the state, name or connection to be checked
+        :return: Whether the item is not drawn and must not be found at a point
+        """
+        if isinstance(item, NameView):
+            item = item.parent
+        parent = self.canvas.get_parent(item)
+        return isinstance(parent, StateView) and parent.content_hidden()
+
+    def update_back_buffer(self):
+        """Extends the base class method to count the requested draw passes
+
+        The base class method draws the back buffer asynchronously, thus the counter does not change while the items
+        are drawn. The level of detail of the states is computed once per draw pass, see
+        :meth:`StateView.content_hidden`.
+        """
+        self.draw_pass += 1
+        super(ExtendedGtkView, self).update_back_buffer()
 
     def get_zoom_factor(self):
         """Returns the current zoom factor of the view
@@ -150,6 +208,8 @@ class ExtendedGtkView(GtkView, Observer):
         for item in self._canvas.sort(items, reverse=True):
             if not selected and item in self.selected_items:
                 continue  # skip selected items
+            if self.is_hidden(item):
+                continue  # skip items hidden by the level of detail
 
             v2i = self.get_matrix_v2i(item)
             i2v = self.get_matrix_i2v(item)
@@ -0,0 +1,85 @@
+# Copyright (C) 2014-2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: notification_coalescer
+   :synopsis: Rate limited delivery of frequent notifications of other threads to the GTK main loop
+
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from gi.repository import GLib
+
+from rafcon.gui.config import global_gui_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+
+class NotificationCoalescer(object):
+    """Collects notifications of other threads and delivers them at a limited rate in the GTK main loop
+
+    Instead of adding an idle callback for each notification, the notifications are stored in a dirty set by a key.
+    A newer notification with the same key replaces the older one. At most ``rate`` times per second, the latest
+    notification of each key is delivered in one batch, in the order of their last change. The notifying threads only
+    store the notification and never wait for the GUI.
+
+    :param str rate_config_key: the key of the GUI config value defining the maximum number of batches per second
+    """
+
+    def __init__(self, rate_config_key):
+        self.rate_config_key = rate_config_key
+        self._dirty_notifications = OrderedDict()
+        self._lock = threading.Lock()
+        self._flush_scheduled = False
+        self._last_flush_time = 0.
+
+    @property
+    def rate(self):
+        return global_gui_config.get_config_value(self.rate_config_key, 0)
+
+    def add(self, key, callback, *args):
+        """Stores a notification to be delivered with the next batch
+
+        :param key: the key of the notification, only the latest notification of a key is delivered
+        :param callback: the function delivering the notification in the GTK main loop
+        :param args: the arguments of the callback
+        """
+        with self._lock:
+            self._dirty_notifications.pop(key, None)
+            self._dirty_notifications[key] = (callback, args)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            delay = self._last_flush_time + 1. / max(self.rate, 1) - time.time()
+        GLib.timeout_add(max(0, int(delay * 1000)), self.flush)
+
+    def flush(self):
+        """Delivers the latest notification of each key"""
+        with self._lock:
+            notifications = self._dirty_notifications
+            self._dirty_notifications = OrderedDict()
+            self._flush_scheduled = False
+            self._last_flush_time = time.time()
+        for callback, args in notifications.values():
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception("Error while delivering a notification")
+        return False  # only call once per schedule
+
+    def clear(self):
+        """Drops all notifications, which were not delivered yet"""
+        with self._lock:
+            self._dirty_notifications.clear()
+
+
+# coalesces the state_execution_status notifications of the states executed in other threads than the GTK thread
+execution_status_coalescer = NotificationCoalescer("EXECUTION_STATUS_UPDATE_RATE")
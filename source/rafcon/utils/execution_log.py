@@ -12,17 +12,24 @@
 
 import json
 import pickle
+from collections import OrderedDict
+from collections.abc import Mapping
 
+from rafcon.utils.execution_log_file import ExecutionLogReader
 from rafcon.utils.vividict import Vividict
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
+# keys of the collapsed items holding the data of the execution
+DATA_KEYS = ('data_ins', 'data_outs', 'scoped_data_ins', 'scoped_data_outs', 'semantic_data')
+
 
 def log_to_raw_structure(execution_history_items):
     """
     Logging with raw structure.
     :param dict execution_history_items: history items, in the simplest case
-    directly the opened shelve log file
+    directly the opened shelve log file or execution log file, see
+    :func:`rafcon.utils.execution_log_file.open_execution_log`
     :return: 
     - start_item, the StateMachineStartItem of the log file
     - previous, a dict mapping history_item_id --> history_item_id of previous history item
@@ -83,7 +90,7 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
     The collapsed items hold input as well as output data (direct and scoped), and the outcome
     the state execution.
     :param dict execution_history_items: history items, in the simplest case directly the opened
-    shelve log file
+    shelve log file or execution log file, see :func:`rafcon.utils.execution_log_file.open_execution_log`
     :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
     :param bool include_erroneous_data_ports: flag if to include erroneous data ports
     :param bool full_next: flag to indicate if the next relationship has also to be created at the end 
@@ -106,103 +113,27 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
     collapsed_hierarchy = {}
     collapsed_items = {}
 
+    def unpickle_data(data_dict):
+        return _unpickle_data(data_dict, throw_on_pickle_error, include_erroneous_data_ports)
+
     # single state executions are not supported
     if len(next_) == 0 or len(next_) == 1:
         for rid, gitems in grouped.items():
             if gitems[0]['item_type'] == 'StateMachineStartItem':
-                item = gitems[0]
-                execution_item = {}
-                ## add base properties will throw if not existing
-                for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type',
-                          'path', 'timestamp', 'root_state_storage_id', 'state_machine_version',
-                          'used_rafcon_version', 'creation_time', 'os_environment']:
-                    try:
-                        execution_item[l] = item[l]
-                    except KeyError:
-                        logger.warning("Key {} not in history start item".format(str(l)))
-
-                for l, default in [('semantic_data', {}),
-                                     ('is_library', None),
-                                     ('library_state_name', None),
-                                     ('library_name', None),
-                                     ('library_path', None)]:
-                    execution_item[l] = item.get(l, default)
-
-                start_item = execution_item
+                start_item = _collapse_start_item(gitems[0])
         return start_item, collapsed_next, collapsed_concurrent, collapsed_hierarchy, collapsed_items
 
     # build collapsed items
     for rid, gitems in grouped.items():
         if gitems[0]['item_type'] == 'StateMachineStartItem':
-            item = gitems[0]
-            execution_item = {}
-            ## add base properties will throw if not existing
-            for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type',
-                      'path', 'timestamp', 'root_state_storage_id', 'state_machine_version',
-                      'used_rafcon_version', 'creation_time', 'os_environment']:
-                try:
-                    execution_item[l] = item[l]
-                except KeyError:
-                    logger.warning("Key {} not in history start item".format(str(l)))
-
-            for l, default in [('semantic_data', {}),
-                                 ('is_library', None),
-                                 ('library_state_name', None),
-                                 ('library_name', None),
-                                 ('library_path', None)]:
-                execution_item[l] = item.get(l, default)
-
+            execution_item = _collapse_start_item(gitems[0])
             start_item = execution_item
 
             collapsed_next[rid] = execution_history_items[next_[gitems[0]['history_item_id']]]['run_id']
             collapsed_items[rid] = execution_item
-        elif gitems[0]['state_type'] == 'ExecutionState' or \
-             gitems[0]['state_type'] == 'HierarchyState' or \
-             gitems[0]['state_type'] == 'LibraryState' or \
-             'Concurrency' in gitems[0]['state_type']:
+        elif _is_collapsible(gitems):
 
-            # select call and return items for this state
-            try:
-                call_item = gitems[[gitems[i]['item_type'] == 'CallItem' and \
-                                    gitems[i]['call_type'] == 'EXECUTE' \
-                                    for i in range(len(gitems))].index(True)]
-            except ValueError:
-                # fall back to container call, should only happen for root state
-                try:
-                    call_item = gitems[[gitems[i]['item_type'] == 'CallItem' and \
-                                        gitems[i]['call_type'] == 'CONTAINER' \
-                                        for i in range(len(gitems))].index(True)]
-                except ValueError:
-                    logger.warning('Could not find a CallItem in run_id group %s\nThere will probably be log information missing on this execution branch!' % str(rid))
-                    call_item = dict(description=None,
-                                     history_item_id=None,
-                                     path_by_name=None,
-                                     state_name=None,
-                                     run_id=None,
-                                     state_type=None,
-                                     path=None,
-                                     timestamp=None,
-                                     input_output_data={},
-                                     scoped_data={})
-
-            try:
-                return_item = gitems[[gitems[i]['item_type'] == 'ReturnItem' and \
-                                      gitems[i]['call_type'] == 'EXECUTE' \
-                                      for i in range(len(gitems))].index(True)]
-            except ValueError:
-                # fall back to container call, should only happen for root state
-                try:
-                    return_item = gitems[[gitems[i]['item_type'] == 'ReturnItem' and \
-                                          gitems[i]['call_type'] == 'CONTAINER' \
-                                          for i in range(len(gitems))].index(True)]
-                except ValueError:
-                    logger.warning('Could not find a ReturnItem in run_id group %s\nThere will probably be log information missing on this execution branch!' % str(rid))
-                    return_item = dict(history_item_id=None,
-                                       outcome_name=None,
-                                       outcome_id=None,
-                                       timestamp=None,
-                                       input_output_data={},
-                                       scoped_data={})
+            call_item, return_item = _select_call_and_return_item(rid, gitems)
 
             # next item (on same hierarchy level) is always after return item
             if return_item['history_item_id'] in next_:
@@ -229,71 +160,84 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
                     else:
                         collapsed_concurrent[prev_rid] = [rid]
 
-            # assemble grouped item
-            execution_item = {}
-            # add base properties will throw if not existing
-            for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type', 'path']:
-                execution_item[l] = call_item[l]
-
-            # add extended properties (added in later rafcon versions),
-            # will add default value if not existing instead
-            for l, default in [('semantic_data', {}),
-                                 ('is_library', None),
-                                 ('library_state_name', None),
-                                 ('library_name', None),
-                                 ('library_path', None)]:
-                execution_item[l] = return_item.get(l, default)
-
-            for l in ['outcome_name', 'outcome_id']:
-                execution_item[l] = return_item[l]
-            for l in ['timestamp']:
-                execution_item[l+'_call'] = call_item[l]
-                execution_item[l+'_return'] = return_item[l]
-
-            def unpickle_data(data_dict):
-                r = dict()
-                # support backward compatibility
-                if isinstance(data_dict, str):  # formerly data dict was a json string
-                    r = json.loads(data_dict)
-                else:
-                    for k, v in data_dict.items():
-                        if not k.startswith('!'):  # ! indicates storage error
-                            try:
-                                r[k] = pickle.loads(v)
-                            except Exception as e:
-                                if throw_on_pickle_error:
-                                    raise
-                                # Ensure compatibility when loading log data recorded by python2
-                                elif 'a bytes-like object is required' in str(e):   
-                                    v = bytes(v, 'ascii')
-                                    try:
-                                        r[k] = pickle.loads(v, encoding='ascii')
-                                    except (UnicodeDecodeError, TypeError) as e:
-                                        r['!' + k] = (str(e), v)
-                                elif include_erroneous_data_ports:
-                                    r['!' + k] = (str(e), v)
-                                else:
-                                    pass  # ignore
-                        elif include_erroneous_data_ports:
-                            r[k] = v
-
-                return r
-
-            execution_item['data_ins'] = unpickle_data(call_item['input_output_data'])
-            execution_item['data_outs'] = unpickle_data(return_item['input_output_data'])
-            execution_item['scoped_data_ins'] = unpickle_data(call_item['scoped_data'])
-            execution_item['scoped_data_outs'] = unpickle_data(return_item['scoped_data'])
-            # backward compatibility
-            if isinstance(execution_item['semantic_data'], Vividict):
-                execution_item['semantic_data'] = execution_item['semantic_data']
-            else:
-                execution_item['semantic_data'] = unpickle_data(execution_item['semantic_data'])
-
-            collapsed_items[rid] = execution_item
+            collapsed_items[rid] = _collapse_execution_item(call_item, return_item, unpickle_data)
 
     return start_item, collapsed_next, collapsed_concurrent, collapsed_hierarchy, collapsed_items
 
 
+def iter_execution_history_items(execution_history_items):
+    """
+    Yields the history items ordered by their timestamp, without keeping them in memory.
+    :param dict execution_history_items: history items, in the simplest case directly the opened
+    shelve log file or execution log file, see :func:`rafcon.utils.execution_log_file.open_execution_log`
+    :return: generator of history items
+    """
+    if isinstance(execution_history_items, ExecutionLogReader):
+        # the index of the execution log file holds the timestamps, thus only the records are read
+        for record in execution_history_items.iter_records(ordered_by_timestamp=True):
+            yield record
+        return
+    # a shelve has no order, thus all items have to be read once to sort them by their timestamps
+    keys = sorted((item.get('timestamp') or 0., key) for key, item in execution_history_items.items())
+    for _, key in keys:
+        yield execution_history_items[key]
+
+
+def iter_collapsed_items(execution_history_items, throw_on_pickle_error=True, include_erroneous_data_ports=False,
+                         lazy=True):
+    """
+    Streaming variant of :func:`log_to_collapsed_structure`. The history items are processed in the order of
+    their timestamps and the collapsed representation of a state execution is yielded as soon as the return item
+    of its run_id has been processed. Only the history items of the currently running states are kept in memory.
+    The relations between the state executions (next, concurrent, hierarchy) are not determined.
+    :param dict execution_history_items: history items, in the simplest case directly the opened
+    shelve log file or execution log file, see :func:`rafcon.utils.execution_log_file.open_execution_log`
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    :param bool lazy: flag if the port and semantic data is only un-pickled on access, see :class:`LazyDataDict`
+    :return: generator of tuples of the run_id and the collapsed representation of the execution of the state with
+    that run_id, the first one being the collapsed StateMachineStartItem
+    """
+    if lazy:
+        def unpickle_data(data_dict):
+            return LazyDataDict(data_dict, throw_on_pickle_error, include_erroneous_data_ports)
+    else:
+        def unpickle_data(data_dict):
+            return _unpickle_data(data_dict, throw_on_pickle_error, include_erroneous_data_ports)
+
+    running = OrderedDict()
+
+    def collapse(rid, gitems):
+        if not _is_collapsible(gitems):
+            return None
+        call_item, return_item = _select_call_and_return_item(rid, gitems)
+        return _collapse_execution_item(call_item, return_item, unpickle_data)
+
+    for item in iter_execution_history_items(execution_history_items):
+        rid = item['run_id']
+        if item['item_type'] == 'StateMachineStartItem':
+            yield rid, _collapse_start_item(item)
+            continue
+        gitems = running.setdefault(rid, [])
+        gitems.append(item)
+        if item['item_type'] != 'ReturnItem':
+            continue
+        # the execution of a state is finished with the return item of its EXECUTE call; root states and states
+        # executed with "run only selected state" only have CONTAINER calls
+        if item['call_type'] == 'EXECUTE' or \
+                not any(i['item_type'] == 'CallItem' and i['call_type'] == 'EXECUTE' for i in gitems):
+            del running[rid]
+            execution_item = collapse(rid, gitems)
+            if execution_item is not None:
+                yield rid, execution_item
+
+    # executions that were not finished, e.g. because the log is incomplete
+    for rid, gitems in running.items():
+        execution_item = collapse(rid, gitems)
+        if execution_item is not None:
+            yield rid, execution_item
+
+
 def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_columns=[], scoped_in_columns=[],
                      scoped_out_columns=[], semantic_data_columns=[], throw_on_pickle_error=True):
     """
@@ -305,7 +249,7 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
     data to be exported as table column, given they are primitive-valued, by including the port / key
     names in the {*}_selected-parameters. These table-columns will obviously only be well-defined for
     states having this kind of port-name-/semantic-key and otherwise will contain a None-like value,
-    indicating missing data.
+    indicating missing data. Only the data of the selected columns is un-pickled.
 
     The available data per execution item (row in the table) can be printed using pandas.DataFrame.columns.
     """
@@ -314,41 +258,34 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
     except ImportError:
         raise ImportError("The Python package 'pandas' is required for log_to_DataFrame.")
 
-    start, next_, concurrency, hierarchy, gitems = log_to_collapsed_structure(
-        execution_history_items, throw_on_pickle_error=throw_on_pickle_error)
-    gitems.pop(start['run_id'])
-    if len(gitems) == 0:
-        return pd.DataFrame()
-
-    # remove columns which are not generic over all states (basically the
-    # data flow stuff)
-    df_keys = list(next(iter(gitems.values())).keys())
-    df_keys.remove('data_ins')
-    df_keys.remove('data_outs')
-    df_keys.remove('scoped_data_ins')
-    df_keys.remove('scoped_data_outs')
-    df_keys.remove('semantic_data')
-    df_keys.sort()
-
+    selected_data_columns = [('data_ins', data_in_columns),
+                             ('data_outs', data_out_columns),
+                             ('scoped_data_ins', scoped_in_columns),
+                             ('scoped_data_outs', scoped_out_columns),
+                             ('semantic_data', semantic_data_columns)]
+    df_keys = None
     df_items = []
 
-    for rid, item in gitems.items():
+    for rid, item in iter_collapsed_items(execution_history_items, throw_on_pickle_error=throw_on_pickle_error):
+        if 'data_ins' not in item:
+            # the collapsed StateMachineStartItem
+            continue
+        if df_keys is None:
+            # remove columns which are not generic over all states (basically the
+            # data flow stuff)
+            df_keys = sorted(k for k in item.keys() if k not in DATA_KEYS)
+
         row_data = [item[k] for k in df_keys]
 
-        for key, selected_columns in [('data_ins', data_in_columns),
-                                      ('data_outs', data_out_columns),
-                                      ('scoped_data_ins', scoped_in_columns),
-                                      ('scoped_data_outs', scoped_out_columns),
-                                      ('semantic_data', semantic_data_columns)]:
+        for key, selected_columns in selected_data_columns:
             for column_key in selected_columns:
                 row_data.append(item[key].get(column_key, None))
         df_items.append(row_data)
 
-    for key, selected_columns in [('data_ins', data_in_columns),
-                                  ('data_outs', data_out_columns),
-                                  ('scoped_data_ins', scoped_in_columns),
-                                  ('scoped_data_outs', scoped_out_columns),
-                                  ('semantic_data', semantic_data_columns)]:
+    if df_keys is None:
+        return pd.DataFrame()
+
+    for key, selected_columns in selected_data_columns:
         df_keys.extend([key + '__' + s for s in selected_columns])
     df = pd.DataFrame(df_items, columns=df_keys)
     # convert epoch to datetime
@@ -362,6 +299,202 @@ def log_to_DataFrame(execution_history_items, data_in_columns=[], data_out_colum
     return df_timed
 
 
+def _collapse_start_item(item):
+    execution_item = {}
+    ## add base properties will throw if not existing
+    for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type',
+              'path', 'timestamp', 'root_state_storage_id', 'state_machine_version',
+              'used_rafcon_version', 'creation_time', 'os_environment']:
+        try:
+            execution_item[l] = item[l]
+        except KeyError:
+            logger.warning("Key {} not in history start item".format(str(l)))
+
+    for l, default in [('semantic_data', {}),
+                         ('is_library', None),
+                         ('library_state_name', None),
+                         ('library_name', None),
+                         ('library_path', None)]:
+        execution_item[l] = item.get(l, default)
+    return execution_item
+
+
+def _is_collapsible(gitems):
+    return gitems[0]['state_type'] == 'ExecutionState' or \
+           gitems[0]['state_type'] == 'HierarchyState' or \
+           gitems[0]['state_type'] == 'LibraryState' or \
+           'Concurrency' in gitems[0]['state_type']
+
+
+def _select_call_and_return_item(rid, gitems):
+    # select call and return items for this state
+    try:
+        call_item = gitems[[gitems[i]['item_type'] == 'CallItem' and \
+                            gitems[i]['call_type'] == 'EXECUTE' \
+                            for i in range(len(gitems))].index(True)]
+    except ValueError:
+        # fall back to container call, should only happen for root state
+        try:
+            call_item = gitems[[gitems[i]['item_type'] == 'CallItem' and \
+                                gitems[i]['call_type'] == 'CONTAINER' \
+                                for i in range(len(gitems))].index(True)]
+        except ValueError:
+            logger.warning('Could not find a CallItem in run_id group %s\nThere will probably be log information missing on this execution branch!' % str(rid))
+            call_item = dict(description=None,
+                             history_item_id=None,
+                             path_by_name=None,
+                             state_name=None,
+                             run_id=None,
+                             state_type=None,
+                             path=None,
+                             timestamp=None,
+                             input_output_data={},
+                             scoped_data={})
+
+    try:
+        return_item = gitems[[gitems[i]['item_type'] == 'ReturnItem' and \
+                              gitems[i]['call_type'] == 'EXECUTE' \
+                              for i in range(len(gitems))].index(True)]
+    except ValueError:
+        # fall back to container call, should only happen for root state
+        try:
+            return_item = gitems[[gitems[i]['item_type'] == 'ReturnItem' and \
+                                  gitems[i]['call_type'] == 'CONTAINER' \
+                                  for i in range(len(gitems))].index(True)]
+        except ValueError:
+            logger.warning('Could not find a ReturnItem in run_id group %s\nThere will probably be log information missing on this execution branch!' % str(rid))
+            return_item = dict(history_item_id=None,
+                               outcome_name=None,
+                               outcome_id=None,
+                               timestamp=None,
+                               input_output_data={},
+                               scoped_data={})
+    return call_item, return_item
+
+
+def _collapse_execution_item(call_item, return_item, unpickle_data):
+    # assemble grouped item
+    execution_item = {}
+    # add base properties will throw if not existing
+    for l in ['description', 'path_by_name', 'state_name', 'run_id', 'state_type', 'path']:
+        execution_item[l] = call_item[l]
+
+    # add extended properties (added in later rafcon versions),
+    # will add default value if not existing instead
+    for l, default in [('semantic_data', {}),
+                         ('is_library', None),
+                         ('library_state_name', None),
+                         ('library_name', None),
+                         ('library_path', None)]:
+        execution_item[l] = return_item.get(l, default)
+
+    for l in ['outcome_name', 'outcome_id']:
+        execution_item[l] = return_item[l]
+    for l in ['timestamp']:
+        execution_item[l+'_call'] = call_item[l]
+        execution_item[l+'_return'] = return_item[l]
+
+    execution_item['data_ins'] = unpickle_data(call_item['input_output_data'])
+    execution_item['data_outs'] = unpickle_data(return_item['input_output_data'])
+    execution_item['scoped_data_ins'] = unpickle_data(call_item['scoped_data'])
+    execution_item['scoped_data_outs'] = unpickle_data(return_item['scoped_data'])
+    # backward compatibility
+    if isinstance(execution_item['semantic_data'], Vividict):
+        execution_item['semantic_data'] = execution_item['semantic_data']
+    else:
+        execution_item['semantic_data'] = unpickle_data(execution_item['semantic_data'])
+    return execution_item
+
+
+def _unpickle_entry(key, value, throw_on_pickle_error, include_erroneous_data_ports):
+    """Returns the un-pickled entry of a data dict as tuple of key and value or None if it is omitted"""
+    if key.startswith('!'):  # ! indicates storage error
+        return (key, value) if include_erroneous_data_ports else None
+    try:
+        return key, pickle.loads(value)
+    except Exception as e:
+        if throw_on_pickle_error:
+            raise
+        # Ensure compatibility when loading log data recorded by python2
+        elif 'a bytes-like object is required' in str(e):
+            value = bytes(value, 'ascii')
+            try:
+                return key, pickle.loads(value, encoding='ascii')
+            except (UnicodeDecodeError, TypeError) as e:
+                return '!' + key, (str(e), value)
+        elif include_erroneous_data_ports:
+            return '!' + key, (str(e), value)
+        else:
+            return None  # ignore
+
+
+def _unpickle_data(data_dict, throw_on_pickle_error, include_erroneous_data_ports):
+    r = dict()
+    # support backward compatibility
+    if isinstance(data_dict, str):  # formerly data dict was a json string
+        r = json.loads(data_dict)
+    else:
+        for k, v in data_dict.items():
+            entry = _unpickle_entry(k, v, throw_on_pickle_error, include_erroneous_data_ports)
+            if entry is not None:
+                r[entry[0]] = entry[1]
+    return r
+
+
+class LazyDataDict(Mapping):
+    """
+    Read-only dictionary of pickled port or semantic data, which un-pickles a value only when it is accessed.
+    Iterating over the dictionary un-pickles all values, as erroneous values change their key to '!' + key.
+    :param dict data_dict: the pickled data of a history item
+    :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
+    :param bool include_erroneous_data_ports: flag if to include erroneous data ports
+    """
+
+    def __init__(self, data_dict, throw_on_pickle_error=True, include_erroneous_data_ports=False):
+        self._throw_on_pickle_error = throw_on_pickle_error
+        self._include_erroneous_data_ports = include_erroneous_data_ports
+        if isinstance(data_dict, str):  # formerly data dict was a json string
+            self._data_dict = {}
+            self._data = json.loads(data_dict)
+        else:
+            self._data_dict = dict(data_dict)
+            self._data = None
+        self._unpickled = {}
+
+    def _unpickle(self, key):
+        if key not in self._unpickled:
+            self._unpickled[key] = _unpickle_entry(key, self._data_dict[key], self._throw_on_pickle_error,
+                                                   self._include_erroneous_data_ports)
+        return self._unpickled[key]
+
+    def _get_data(self):
+        if self._data is None:
+            self._data = dict(entry for entry in map(self._unpickle, self._data_dict) if entry is not None)
+        return self._data
+
+    def __getitem__(self, key):
+        if self._data is not None:
+            return self._data[key]
+        if key in self._data_dict:
+            entry = self._unpickle(key)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+        elif key.startswith('!') and key[1:] in self._data_dict:
+            entry = self._unpickle(key[1:])
+            if entry is not None and entry[0] == key:
+                return entry[1]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._get_data())
+
+    def __len__(self):
+        return len(self._get_data())
+
+    def __repr__(self):
+        return repr(self._get_data())
+
+
 def log_to_ganttplot(execution_history_items):
     """
     Example how to use the DataFrame representation
@@ -0,0 +1,349 @@
+# Copyright (C) 2014-2018 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: execution_log_file
+   :synopsis: A module for writing and reading execution logs in an append-only binary format
+
+An execution log file consists of a header, a sequence of blocks and, if the file was closed properly, a footer index
+and a trailer:
+
+* header: the magic bytes ``RAFCONLOG``, the format version and the compression (0: none, 1: zlib, 2: lzma)
+* block: the block type (0: records, 1: footer index), the length of the payload and the number of records, followed
+  by the (compressed) payload. The payload of a record block is a sequence of length-prefixed pickled records.
+* footer index: a single record listing the history item id, run id, timestamp and position of each record
+* trailer: the offset of the footer block and the magic bytes ``RLOGEND``
+
+The blocks are only appended, thus a file of a crashed process can still be read up to the last complete block. The
+:class:`ExecutionLogReader` provides the same mapping interface as the shelve files of the former log format, so that
+both can be passed to the functions of :mod:`rafcon.utils.execution_log`.
+"""
+
+import lzma
+import os
+import pickle
+import shelve
+import struct
+import zlib
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from rafcon.utils import log
+logger = log.get_logger(__name__)
+
+MAGIC = b'RAFCONLOG'
+END_MAGIC = b'RLOGEND\x00'
+FORMAT_VERSION = 1
+FILE_EXTENSION = 'rafconlog'
+
+_HEADER = struct.Struct('<9sBB')
+_BLOCK_HEADER = struct.Struct('<BII')
+_RECORD_LENGTH = struct.Struct('<I')
+_TRAILER = struct.Struct('<Q8s')
+
+RECORD_BLOCK = 0
+FOOTER_BLOCK = 1
+
+COMPRESSIONS = OrderedDict([
+    (None, (lambda data: data, lambda data: data)),
+    ('zlib', (zlib.compress, zlib.decompress)),
+    ('lzma', (lzma.compress, lzma.decompress))
+])
+_COMPRESSION_IDS = list(COMPRESSIONS.keys())
+
+
+def _get_compression_id(compression):
+    if isinstance(compression, str):
+        compression = compression.lower()
+        if compression == 'none':
+            compression = None
+    if compression not in COMPRESSIONS:
+        raise ValueError("Unknown compression '{0}', valid compressions are: {1}".format(
+            compression, ", ".join(str(c) for c in COMPRESSIONS)))
+    return _COMPRESSION_IDS.index(compression)
+
+
+def is_execution_log_file(filename):
+    """Checks whether the file is an execution log file of the binary format
+
+    :param str filename: the path of the file
+    :rtype: bool
+    """
+    if not os.path.isfile(filename):
+        return False
+    with open(filename, 'rb') as log_file:
+        return log_file.read(len(MAGIC)) == MAGIC
+
+
+class ExecutionLogWriter(object):
+    """Writes execution history records to an append-only binary execution log file
+
+    Each call of :meth:`write_records` appends one block, so that records should be written in batches.
+
+    :ivar str filename: the path of the log file
+    :ivar str compression: the block compression, either None, 'zlib' or 'lzma'
+    """
+
+    def __init__(self, filename, compression=None):
+        self.filename = filename
+        self.compression = compression
+        self._compression_id = _get_compression_id(compression)
+        self._compress = COMPRESSIONS[_COMPRESSION_IDS[self._compression_id]][0]
+        self._index = []
+        self._file = open(filename, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self._compression_id))
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def _write_block(self, block_type, payload, number_of_records):
+        offset = self._file.tell()
+        payload = self._compress(payload)
+        self._file.write(_BLOCK_HEADER.pack(block_type, len(payload), number_of_records))
+        self._file.write(payload)
+        return offset
+
+    def write_records(self, records):
+        """Appends a block of records to the file
+
+        :param list records: the dictionaries of the execution history items
+        """
+        if not records:
+            return
+        chunks = []
+        for record in records:
+            data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+            chunks.append(_RECORD_LENGTH.pack(len(data)))
+            chunks.append(data)
+        offset = self._write_block(RECORD_BLOCK, b''.join(chunks), len(records))
+        for index_in_block, record in enumerate(records):
+            self._index.append((record.get('history_item_id'), record.get('run_id'), record.get('timestamp'),
+                                offset, index_in_block))
+
+    def flush(self):
+        """Writes all buffered blocks to the disk"""
+        if not self._file.closed:
+            self._file.flush()
+
+    def close(self):
+        """Writes the footer index and closes the file"""
+        if self._file.closed:
+            return
+        footer = pickle.dumps(self._index, protocol=pickle.HIGHEST_PROTOCOL)
+        footer_offset = self._write_block(FOOTER_BLOCK, footer, len(self._index))
+        self._file.write(_TRAILER.pack(footer_offset, END_MAGIC))
+        self._file.close()
+
+
+class ExecutionLogReader(Mapping):
+    """Reads an execution log file written by :class:`ExecutionLogWriter`
+
+    The reader is a mapping from history item ids to the records of the history items. Iterating over the reader
+    yields the history item ids in the order the items were written. Only the footer index is kept in memory, blocks
+    are read on demand and the last recently used blocks are cached.
+
+    :ivar str filename: the path of the log file
+    :ivar int block_cache_size: the number of decoded blocks kept in memory
+    """
+
+    def __init__(self, filename, block_cache_size=8):
+        self.filename = filename
+        self.block_cache_size = block_cache_size
+        self._block_cache = OrderedDict()
+        self._file = open(filename, 'rb')
+        magic, version, compression_id = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("{0} is not an execution log file".format(filename))
+        if version > FORMAT_VERSION:
+            raise ValueError("The execution log file {0} has the unsupported version {1}".format(filename, version))
+        self.compression = _COMPRESSION_IDS[compression_id]
+        self._decompress = COMPRESSIONS[self.compression][1]
+        self._index = self._read_footer_index()
+        if self._index is None:
+            logger.warning("The execution log file {0} was not closed properly, "
+                           "its blocks are scanned to restore the index".format(filename))
+            self._index = self._scan_blocks()
+        self._positions = OrderedDict((entry[0], (entry[3], entry[4])) for entry in self._index)
+
+    def _read_footer_index(self):
+        file_size = os.fstat(self._file.fileno()).st_size
+        if file_size < _HEADER.size + _TRAILER.size:
+            return None
+        self._file.seek(file_size - _TRAILER.size)
+        footer_offset, end_magic = _TRAILER.unpack(self._file.read(_TRAILER.size))
+        if end_magic != END_MAGIC:
+            return None
+        block_type, payload = self._read_block_payload(footer_offset)
+        if block_type != FOOTER_BLOCK:
+            return None
+        return pickle.loads(payload)
+
+    def _scan_blocks(self):
+        index = []
+        for offset, block_type, records in self._iter_blocks():
+            if block_type == RECORD_BLOCK:
+                for index_in_block, record in enumerate(records):
+                    index.append((record.get('history_item_id'), record.get('run_id'), record.get('timestamp'),
+                                  offset, index_in_block))
+        return index
+
+    def _iter_blocks(self):
+        offset = _HEADER.size
+        while True:
+            try:
+                block_type, payload = self._read_block_payload(offset)
+            except (struct.error, EOFError, zlib.error, lzma.LZMAError):
+                # the last block is incomplete
+                return
+            next_offset = self._file.tell()
+            if block_type == FOOTER_BLOCK:
+                return
+            yield offset, block_type, self._decode_records(payload)
+            offset = next_offset
+
+    def _read_block_payload(self, offset):
+        self._file.seek(offset)
+        block_type, length, _ = _BLOCK_HEADER.unpack(self._file.read(_BLOCK_HEADER.size))
+        payload = self._file.read(length)
+        if len(payload) != length:
+            raise EOFError("Incomplete block at offset {0}".format(offset))
+        return block_type, self._decompress(payload)
+
+    @staticmethod
+    def _decode_records(payload):
+        records = []
+        position = 0
+        while position < len(payload):
+            length, = _RECORD_LENGTH.unpack_from(payload, position)
+            position += _RECORD_LENGTH.size
+            records.append(pickle.loads(payload[position:position + length]))
+            position += length
+        return records
+
+    def _get_block(self, offset):
+        if offset in self._block_cache:
+            self._block_cache.move_to_end(offset)
+            return self._block_cache[offset]
+        _, payload = self._read_block_payload(offset)
+        records = self._decode_records(payload)
+        self._block_cache[offset] = records
+        if len(self._block_cache) > self.block_cache_size:
+            self._block_cache.popitem(last=False)
+        return records
+
+    def __getitem__(self, history_item_id):
+        offset, index_in_block = self._positions[history_item_id]
+        return self._get_block(offset)[index_in_block]
+
+    def __contains__(self, history_item_id):
+        return history_item_id in self._positions
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def items(self):
+        """Yields the history item ids and records in the order they were written, reading each block once"""
+        for record in self.iter_records():
+            yield record['history_item_id'], record
+
+    def values(self):
+        return self.iter_records()
+
+    def iter_records(self, run_ids=None, start_time=None, end_time=None, ordered_by_timestamp=False):
+        """Yields the records in the order they were written
+
+        The filters are applied using the footer index, thus only blocks containing matching records are read.
+
+        :param run_ids: an iterable of run ids, if given only records of these runs are yielded
+        :param float start_time: if given, only records with a timestamp not earlier are yielded
+        :param float end_time: if given, only records with a timestamp not later are yielded
+        :param bool ordered_by_timestamp: if True, the records are yielded in the order of their timestamps instead
+        """
+        run_ids = set(run_ids) if run_ids is not None else None
+        index = self._index
+        if ordered_by_timestamp:
+            # items of concurrent states can be written slightly out of order, the sort is stable for equal timestamps
+            index = sorted(index, key=lambda entry: entry[2] or 0.)
+        for _, run_id, timestamp, offset, index_in_block in index:
+            if run_ids is not None and run_id not in run_ids:
+                continue
+            if start_time is not None and (timestamp is None or timestamp < start_time):
+                continue
+            if end_time is not None and (timestamp is None or timestamp > end_time):
+                continue
+            yield self._get_block(offset)[index_in_block]
+
+    def get_run_ids(self):
+        """Returns the run ids of all records in the order of their first appearance
+
+        :rtype: list
+        """
+        return list(OrderedDict.fromkeys(entry[1] for entry in self._index))
+
+    def get_time_range(self):
+        """Returns the timestamps of the first and the last record
+
+        :rtype: tuple
+        """
+        timestamps = [entry[2] for entry in self._index if entry[2] is not None]
+        if not timestamps:
+            return None, None
+        return min(timestamps), max(timestamps)
+
+    def close(self):
+        self._block_cache.clear()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open_execution_log(filename):
+    """Opens an execution log file for reading, independent of its format
+
+    :param str filename: the path of either a binary execution log file or a shelve file
+    :return: a mapping of history item ids to the records of the history items, which must be closed after usage
+    """
+    if is_execution_log_file(filename):
+        return ExecutionLogReader(filename)
+    return shelve.open(filename, flag='r')
+
+
+def convert_shelve_log(shelve_filename, target_filename=None, compression=None, block_size=1000):
+    """Converts an execution log shelve file into the binary execution log format
+
+    The records are sorted by their timestamp, the order in which they were created.
+
+    :param str shelve_filename: the path of the shelve file
+    :param str target_filename: the path of the new file, by default the extension of the shelve file is replaced
+    :param str compression: the block compression, either None, 'zlib' or 'lzma'
+    :param int block_size: the number of records per block
+    :return: the path of the new file
+    :rtype: str
+    """
+    if target_filename is None:
+        target_filename = os.path.splitext(shelve_filename)[0] + '.' + FILE_EXTENSION
+    store = shelve.open(shelve_filename, flag='r')
+    try:
+        records = sorted(store.values(), key=lambda record: (record.get('timestamp') or 0.,
+                                                             record.get('history_item_id')))
+    finally:
+        store.close()
+    writer = ExecutionLogWriter(target_filename, compression)
+    try:
+        for start in range(0, len(records), block_size):
+            writer.write_records(records[start:start + block_size])
+    finally:
+        writer.close()
+    return target_filename
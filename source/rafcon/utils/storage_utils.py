@@ -62,6 +62,9 @@ substitute_modules = {
 
 TIME_STRING_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# the decoder holds no state between calls, creating it for each file costs more than parsing small json files
+_json_object_decoder = JSONObjectDecoder(substitute_modules=substitute_modules)
+
 
 def get_current_time_string():
     return strftime(TIME_STRING_FORMAT, gmtime())
@@ -94,16 +97,34 @@ def write_dict_to_json(dictionary, path, **kwargs):
         f.write(result_string)
 
 
+def decode_json_objects(data):
+    """Converts plain JSON data into objects, like they are returned by :func:`load_objects_from_json`
+
+    This allows to separate the parsing of a json file (e.g. with `json.loads`) from the creation of the objects.
+
+    :param data: the data as returned by `json.load`
+    :return: the data with all JSON objects being converted
+    """
+    object_hook = _json_object_decoder.object_hook
+
+    def decode(value):
+        # the object hook is applied bottom-up, as done by the json decoder
+        if isinstance(value, dict):
+            return object_hook({key: decode(item) for key, item in value.items()})
+        if isinstance(value, list):
+            return [decode(item) for item in value]
+        return value
+
+    return decode(data)
+
+
 def load_objects_from_json(path, as_dict=False):
     """Loads a dictionary from a json file.
 
     :param path: The relative path of the json file.
     :return: The dictionary specified in the json file
     """
-    f = open(path, 'r')
-    if as_dict:
-        result = json.load(f)
-    else:
-        result = json.load(f, cls=JSONObjectDecoder, substitute_modules=substitute_modules)
-    f.close()
-    return result
+    with open(path, 'r') as f:
+        if as_dict:
+            return json.load(f)
+        return json.load(f, object_hook=_json_object_decoder.object_hook)
@@ -8,7 +8,7 @@
 # Contributors:
 # Sebastian Brunner <sebastian.brunner@dlr.de>
 
-from threading import RLock
+from threading import RLock, Lock
 from threading import Condition
 
 
@@ -85,3 +85,79 @@ class ReaderWriterLock:
             state.writer_conditions[0].notify()
         elif state.pending_writers == 0:
             state.reader_condition.notify_all()
+
+
+class SharedLock(object):
+    """
+    A lock, which can either be acquired exclusively or shared by several threads at the same time. In contrast to the
+    :class:`ReaderWriterLock` it is not bound to a resource and can be acquired with a timeout and released by any
+    thread, like a :class:`threading.Lock`. Threads waiting for the exclusive lock have priority over threads waiting
+    for the shared lock to avoid starvation.
+    """
+
+    def __init__(self):
+        self._condition = Condition(Lock())
+        self._exclusive = False
+        self._shared = 0
+        self._pending_exclusive = 0
+
+    def _is_free(self):
+        return not self._exclusive and self._shared == 0
+
+    def acquire(self, blocking=True, timeout=-1):
+        """Acquires the lock exclusively
+
+        :param bool blocking: whether to wait for the lock
+        :param float timeout: the maximum time to wait for the lock, -1 waits infinitely
+        :return: True if the lock was acquired, False otherwise
+        """
+        with self._condition:
+            if self._is_free():
+                self._exclusive = True
+                return True
+            if not blocking:
+                return False
+            self._pending_exclusive += 1
+            acquired = False
+            try:
+                acquired = self._condition.wait_for(self._is_free, None if timeout < 0 else timeout)
+                if acquired:
+                    self._exclusive = True
+            finally:
+                self._pending_exclusive -= 1
+                if not acquired and self._pending_exclusive == 0:
+                    # threads waiting for the shared lock might have been blocked by this thread
+                    self._condition.notify_all()
+            return acquired
+
+    def release(self):
+        """Releases the exclusive lock"""
+        with self._condition:
+            if not self._exclusive:
+                raise RuntimeError("Cannot release an unlocked lock")
+            self._exclusive = False
+            self._condition.notify_all()
+
+    def acquire_shared(self):
+        """Acquires the lock shared with other threads, waits as long as the lock is or shall be held exclusively"""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._exclusive and self._pending_exclusive == 0)
+            self._shared += 1
+
+    def release_shared(self):
+        """Releases the shared lock"""
+        with self._condition:
+            if self._shared == 0:
+                raise RuntimeError("Cannot release an unlocked lock")
+            self._shared -= 1
+            if self._shared == 0:
+                self._condition.notify_all()
+
+    def locked(self):
+        """Returns whether the lock is held exclusively"""
+        return self._exclusive
+
+    __enter__ = acquire
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.batch_execution import run_batch, create_jobs
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    if inputs['factor'] < 0:
+        raise ValueError("negative factor")
+    gvm.set_variable('counter', (gvm.get_variable('counter') or 0) + 1)
+    outputs['product'] = inputs['factor'] * 2
+    outputs['counter'] = gvm.get_variable('counter')
+    return 0
+"""
+
+
+def create_state_machine_path():
+    root_state = ExecutionState("double")
+    root_state.script_text = SCRIPT
+    root_state.add_input_data_port("factor", "int", 1)
+    root_state.add_output_data_port("product", "int")
+    root_state.add_output_data_port("counter", "int")
+    path = os.path.join(testing_utils.get_unique_temp_path(), "double")
+    storage.save_state_machine_to_path(StateMachine(root_state), path)
+    return path
+
+
+def test_batch_execution(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine_path = create_state_machine_path()
+        input_sets = [{'factor': factor} for factor in range(6)] + [{'factor': -1}, {'unknown': 1}]
+        jobs = create_jobs([state_machine_path], input_sets)
+        summary = run_batch(jobs, number_of_workers=2, config_path=None)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+    assert summary['jobs'] == 8
+    assert summary['succeeded'] == 6 and summary['failed'] == 2
+    results = summary['results']
+    for factor, result in enumerate(results[:6]):
+        assert result['outcome'] == "success"
+        assert result['output_data']['product'] == 2 * factor
+        # the global variables are reset between the runs of a worker
+        assert result['output_data']['counter'] == 1
+        assert result['duration'] > 0
+    assert results[6]['outcome'] == "aborted"
+    assert "ValueError" in results[7]['error']
+    assert len(set(result['worker'] for result in results)) <= 2
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
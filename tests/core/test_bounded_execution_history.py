@@ -0,0 +1,176 @@
+import os
+
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.storage import storage
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.execution.execution_history_items import ReturnItem
+
+# singleton elements
+import rafcon.core.singleton
+from rafcon.core.singleton import state_machine_execution_engine
+from rafcon.utils import log
+
+# test environment elements
+from tests import utils as testing_utils
+from tests.utils import wait_for_execution_engine_sync_counter
+
+logger = log.get_logger(__name__)
+
+SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs['data'] = list(range(100))
+    return 0
+"""
+
+
+def initialize_environment(max_items=0, max_bytes=0, spill_path=None):
+    testing_utils.initialize_environment_core(core_config={'IN_MEMORY_EXECUTION_HISTORY_MAX_ITEMS': max_items,
+                                                           'IN_MEMORY_EXECUTION_HISTORY_MAX_BYTES': max_bytes,
+                                                           'IN_MEMORY_EXECUTION_HISTORY_SPILL_PATH': spill_path})
+
+
+def shutdown_environment(caplog, expected_warnings=0):
+    # the config is not reset by the test environment, thus the history is unbounded again for the other tests
+    global_config.set_config_value('IN_MEMORY_EXECUTION_HISTORY_MAX_ITEMS', 0)
+    global_config.set_config_value('IN_MEMORY_EXECUTION_HISTORY_MAX_BYTES', 0)
+    global_config.set_config_value('IN_MEMORY_EXECUTION_HISTORY_SPILL_PATH', None)
+    testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=expected_warnings)
+
+
+def create_state_machine(number_of_states):
+    root_state = HierarchyState("root")
+    last_state = None
+    for i in range(number_of_states):
+        state = ExecutionState("state{0}".format(i))
+        state.script_text = SCRIPT
+        state.add_output_data_port("data", "list")
+        root_state.add_state(state)
+        if last_state is None:
+            root_state.set_start_state(state)
+        else:
+            root_state.add_transition(last_state.state_id, 0, state.state_id, None)
+        last_state = state
+    root_state.add_transition(last_state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def run_state_machine(state_machine):
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    state_machine_execution_engine.start(state_machine.state_machine_id)
+    state_machine_execution_engine.join()
+    return state_machine.execution_histories[-1]
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_bounded_number_of_items(caplog, spill):
+    initialize_environment(max_items=10, spill_path=testing_utils.get_unique_temp_path() if spill else None)
+    try:
+        state_machine = create_state_machine(20)
+        execution_history = run_state_machine(state_machine)
+        memory_usage = execution_history.get_memory_usage()
+        assert len(execution_history) == memory_usage['items'] == 10
+        # start item, call and return item of the root state and of each child
+        assert memory_usage['evicted_items'] == 1 + 2 + 2 * 20 - 10
+        assert memory_usage['bytes'] > 0
+        assert execution_history[0].prev is None
+        assert isinstance(execution_history[-1], ReturnItem)
+
+        if spill:
+            records = list(execution_history.get_spilled_records())
+            assert len(records) == memory_usage['spilled_items'] == memory_usage['evicted_items']
+            assert records[0]['item_type'] == 'StateMachineStartItem'
+            assert records[-1]['history_item_id'] < execution_history[0].history_item_id
+            spill_file_path = memory_usage['spill_file']
+            assert os.path.exists(spill_file_path)
+            state_machine.destroy_execution_histories()
+            assert not os.path.exists(spill_file_path)
+        else:
+            assert memory_usage['spill_file'] is None
+    finally:
+        shutdown_environment(caplog)
+
+
+def test_bounded_number_of_bytes(caplog):
+    initialize_environment(max_bytes=200000)
+    try:
+        execution_history = run_state_machine(create_state_machine(20))
+        memory_usage = execution_history.get_memory_usage()
+        assert 0 < memory_usage['bytes'] <= 200000
+        assert memory_usage['evicted_items'] > 0
+        assert memory_usage['items'] + memory_usage['evicted_items'] == 1 + 2 + 2 * 20
+    finally:
+        shutdown_environment(caplog)
+
+
+def test_pop_last_item(caplog):
+    initialize_environment(max_bytes=10 ** 9)
+    try:
+        execution_history = run_state_machine(create_state_machine(2))
+        number_of_items = len(execution_history)
+        estimated_bytes = execution_history.estimated_bytes
+        last_history_item = execution_history[-1]
+        previous_history_item = execution_history[-2]
+        assert previous_history_item.next is last_history_item
+
+        assert execution_history.pop_last_item() is last_history_item
+        assert len(execution_history) == number_of_items - 1
+        assert execution_history.get_last_history_item() is previous_history_item
+        # the previous item is unlinked from the popped one, like the last item of a history
+        assert previous_history_item.next is None
+        assert last_history_item.prev is previous_history_item
+        assert 0 < execution_history.estimated_bytes < estimated_bytes
+    finally:
+        shutdown_environment(caplog)
+
+
+def test_backward_stepping_in_retained_window(caplog):
+    initialize_environment(max_items=5)
+    state_machine = storage.load_state_machine_from_path(
+        testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "stepping_test")))
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    root_state = state_machine.root_state
+    try:
+        with state_machine_execution_engine._status.execution_condition_variable:
+            state_machine_execution_engine.synchronization_counter = 0
+        state_machine_execution_engine.step_mode(state_machine.state_machine_id)
+        wait_for_execution_engine_sync_counter(1, logger)
+
+        # history: start, call root, call and return of PXTKIH, NDIVLD and SFZGMH
+        for _ in range(3):
+            state_machine_execution_engine.step_over()
+            wait_for_execution_engine_sync_counter(1, logger)
+        assert root_state.child_state is state_machine.get_state_by_path("GLSUJY/SMCOIB")
+        execution_history = state_machine.execution_histories[-1]
+        assert len(execution_history) == 5 and execution_history.truncated
+
+        # the call and return items of SFZGMH and NDIVLD are retained
+        for state_id in ("SFZGMH", "NDIVLD"):
+            state_machine_execution_engine.backward_step()
+            wait_for_execution_engine_sync_counter(1, logger)
+            assert root_state.child_state is state_machine.get_state_by_path("GLSUJY/" + state_id)
+
+        # the call item of PXTKIH was evicted, thus the execution remains in the step mode
+        assert len(execution_history) == 1
+        state_machine_execution_engine.backward_step()
+        wait_for_execution_engine_sync_counter(1, logger)
+        assert state_machine_execution_engine.status.execution_mode is StateMachineExecutionStatus.STEP_MODE
+        assert len(execution_history) == 1
+
+        # forward stepping is not affected
+        state_machine_execution_engine.step_over()
+        wait_for_execution_engine_sync_counter(1, logger)
+        assert len(execution_history) == 3
+    finally:
+        state_machine_execution_engine.stop()
+        state_machine_execution_engine.join()
+        shutdown_environment(caplog, expected_warnings=1)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
@@ -0,0 +1,150 @@
+import pickle
+from copy import deepcopy
+
+import pytest
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_elements.data_port import InputDataPort
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.execution.execution_history_items import CallItem
+from rafcon.core.data_passing import DataPassingPolicy, pass_value, take_snapshot, is_frozen
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def create_state_machine():
+    producer = ExecutionState("producer", state_id="PRODUCER")
+    producer_output_id = producer.add_output_data_port("data", "list")
+    producer.script_text = 'def execute(self, inputs, outputs, gvm):\n' \
+                           '    outputs["data"] = [1, 2, 3]\n' \
+                           '    return 0'
+
+    consumer = ExecutionState("consumer", state_id="CONSUMER")
+    consumer_input_id = consumer.add_input_data_port("data", "list")
+    consumer_output_id = consumer.add_output_data_port("sum", "int")
+    consumer.script_text = 'def execute(self, inputs, outputs, gvm):\n' \
+                           '    outputs["sum"] = sum(inputs["data"])\n' \
+                           '    return 0'
+
+    root_state = HierarchyState("root", state_id="ROOT")
+    root_state.add_state(producer)
+    root_state.add_state(consumer)
+    root_state.set_start_state(producer.state_id)
+    root_output_id = root_state.add_output_data_port("sum", "int")
+    root_state.add_transition(producer.state_id, 0, consumer.state_id, None)
+    root_state.add_transition(consumer.state_id, 0, root_state.state_id, 0)
+    root_state.add_data_flow(producer.state_id, producer_output_id, consumer.state_id, consumer_input_id)
+    root_state.add_data_flow(consumer.state_id, consumer_output_id, root_state.state_id, root_output_id)
+    return StateMachine(root_state)
+
+
+def execute_state_machine(state_machine):
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    rafcon.core.singleton.state_machine_execution_engine.join()
+
+    scoped_data_value = [scoped_data.value for scoped_data in state_machine.root_state.scoped_data.values()
+                         if scoped_data.from_state == "PRODUCER"][0]
+    consumer_call_item = [item for item in state_machine.execution_histories[-1]
+                          if isinstance(item, CallItem) and item.state_reference.state_id == "CONSUMER"][0]
+    history_value = consumer_call_item.child_state_input_output_data["data"]
+    rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    return scoped_data_value, history_value
+
+
+def test_policy_conversion():
+    assert pass_value([1], None) == [1]
+    with pytest.raises(ValueError):
+        StateMachine().data_passing_policy = "NO_POLICY"
+
+    state_machine = StateMachine(ExecutionState("root"))
+    state_machine.data_passing_policy = "copy_on_write"
+    assert state_machine.data_passing_policy is DataPassingPolicy.COPY_ON_WRITE
+    assert StateMachine.from_dict(StateMachine.state_machine_to_dict(state_machine)).data_passing_policy is \
+        DataPassingPolicy.COPY_ON_WRITE
+
+    port = InputDataPort("data", list, None, 1, force_type=True)
+    assert 'data_passing_policy' not in port.to_dict()
+    port.data_passing_policy = DataPassingPolicy.BY_REFERENCE
+    assert InputDataPort.from_dict(port.to_dict()).data_passing_policy is DataPassingPolicy.BY_REFERENCE
+
+
+def test_value_passing():
+    value = [[1, 2], 3]
+    assert pass_value(value, DataPassingPolicy.DEEPCOPY) is not value
+    assert take_snapshot(value, DataPassingPolicy.DEEPCOPY) is value
+
+    snapshot = take_snapshot(value, DataPassingPolicy.COPY_ON_WRITE)
+    assert snapshot == value and snapshot is not value
+    assert pass_value(snapshot, DataPassingPolicy.COPY_ON_WRITE) is snapshot
+
+    # the snapshot and its elements cannot be modified in-place
+    with pytest.raises(TypeError):
+        snapshot.append(4)
+    with pytest.raises(TypeError):
+        snapshot[0][0] = 5
+    assert value == [[1, 2], 3]
+    # copies of the snapshot are mutable
+    mutable_copy = deepcopy(snapshot)
+    mutable_copy[0].append(3)
+    assert type(mutable_copy) is list and mutable_copy == [[1, 2, 3], 3]
+    assert type(pickle.loads(pickle.dumps(snapshot))) is list
+
+    snapshot = take_snapshot({'a': [1], 'b': {2}, 'c': (3, [4])}, DataPassingPolicy.COPY_ON_WRITE)
+    assert is_frozen(snapshot)
+    assert isinstance(snapshot, dict) and isinstance(snapshot['a'], list) and isinstance(snapshot['b'], set)
+    for modify in (lambda: snapshot.update(d=4), lambda: snapshot['b'].add(3), lambda: snapshot['c'][1].pop()):
+        with pytest.raises(TypeError):
+            modify()
+    assert pass_value(snapshot, DataPassingPolicy.COPY_ON_WRITE) is snapshot
+
+    # values that cannot be frozen are copied for each consumer
+    class Custom(object):
+        pass
+    snapshot = take_snapshot([Custom()], DataPassingPolicy.COPY_ON_WRITE)
+    assert not is_frozen(snapshot)
+    assert pass_value(snapshot, DataPassingPolicy.COPY_ON_WRITE) is not snapshot
+
+    # lists are not registered as reference types
+    assert pass_value(value, DataPassingPolicy.BY_REFERENCE) is not value
+    text = "immutable"
+    assert pass_value(text, DataPassingPolicy.BY_REFERENCE) is text
+
+
+def test_numpy_value_passing():
+    numpy = pytest.importorskip("numpy")
+    array = numpy.zeros(10)
+    assert pass_value(array, DataPassingPolicy.BY_REFERENCE) is array
+
+    snapshot = take_snapshot(array, DataPassingPolicy.COPY_ON_WRITE)
+    assert snapshot is not array
+    assert take_snapshot(snapshot, DataPassingPolicy.COPY_ON_WRITE) is snapshot
+    with pytest.raises(ValueError):
+        snapshot[0] = 1.
+
+
+@pytest.mark.parametrize("policy", [None, DataPassingPolicy.DEEPCOPY, DataPassingPolicy.COPY_ON_WRITE])
+def test_data_passing_policy_execution(caplog, policy):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine()
+        state_machine.data_passing_policy = policy
+        scoped_data_value, history_value = execute_state_machine(state_machine)
+        assert state_machine.root_state.output_data["sum"] == 6
+        assert history_value == scoped_data_value == [1, 2, 3]
+        if policy is DataPassingPolicy.COPY_ON_WRITE:
+            assert history_value is scoped_data_value
+        else:
+            assert history_value is not scoped_data_value
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.state_machine import StateMachine
+import rafcon.core.start as start
+
+# singleton elements
+import rafcon.core.singleton
+from rafcon.core.singleton import state_machine_execution_engine
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT = """
+import time
+
+def execute(self, inputs, outputs, gvm):
+    time.sleep({0})
+    return 0
+"""
+
+
+def start_state_machine(duration=0.):
+    root_state = ExecutionState("root")
+    root_state.script_text = SCRIPT.format(duration)
+    state_machine = StateMachine(root_state)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    start.start_state_machine(state_machine)
+    return state_machine
+
+
+def test_wait_for_state_machine_finished(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        start_time = time.time()
+        state_machine = start_state_machine()
+        start.wait_for_state_machine_finished(state_machine)
+        # the polling intervals of the former implementation caused a latency of at least 0.5 s
+        assert time.time() - start_time < 0.4
+        assert state_machine.root_state.final_outcome.outcome_id == 0
+        assert state_machine_execution_engine.execution_finished.result() is state_machine
+        assert state_machine_execution_engine.finished_or_stopped()
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_await_state_machine_finished(caplog):
+    testing_utils.initialize_environment_core()
+
+    async def start_and_await():
+        state_machine = start_state_machine(duration=0.2)
+        assert not await state_machine_execution_engine.join_async(timeout=0.01)
+        # the timeout does not cancel the execution
+        assert not state_machine_execution_engine.execution_finished.cancelled()
+        await start.wait_for_state_machine_finished_async(state_machine)
+        assert await state_machine_execution_engine.join_async()
+        return state_machine
+
+    try:
+        state_machine = asyncio.run(start_and_await())
+        assert state_machine.root_state.final_outcome.outcome_id == 0
+        assert state_machine_execution_engine.execution_finished.done()
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from rafcon.core.execution.history_item_queue import HistoryItemQueue, QueueOverflowPolicy
+from rafcon.core.execution.consumers.abstract_execution_history_consumer import \
+    AbstractExecutionHistoryRecordConsumer
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+class Item(object):
+
+    def __init__(self, history_item_id):
+        self.history_item_id = history_item_id
+
+    def to_dict(self):
+        return {'history_item_id': self.history_item_id}
+
+
+class RecordingConsumer(AbstractExecutionHistoryRecordConsumer):
+
+    def __init__(self):
+        super(RecordingConsumer, self).__init__()
+        self.batches = []
+
+    def register(self):
+        pass
+
+    def consume_records(self, records):
+        self.batches.append(records)
+
+    def unregister(self):
+        pass
+
+
+def test_queue_overflow_policies():
+    queue = HistoryItemQueue(max_size=3, overflow_policy="drop_oldest")
+    for i in range(5):
+        queue.put(i)
+    assert [item for item, _ in queue.get_batch()] == [2, 3, 4]
+    assert queue.dropped_count == 2
+
+    queue = HistoryItemQueue(max_size=3, overflow_policy=QueueOverflowPolicy.SAMPLE, sampling_interval=2)
+    for i in range(7):
+        queue.put(i)
+    # only every second item exceeding the queue size replaces the oldest item
+    assert [item for item, _ in queue.get_batch()] == [2, 4, 6]
+    assert queue.dropped_count == 4
+
+    with pytest.raises(ValueError):
+        HistoryItemQueue(overflow_policy="no_policy")
+
+
+def test_queue_blocking():
+    queue = HistoryItemQueue(max_size=2, overflow_policy="BLOCK")
+    queue.put(0)
+    queue.put(1)
+    producer = threading.Thread(target=queue.put, args=(2,))
+    producer.start()
+    producer.join(0.1)
+    assert producer.is_alive()
+    assert [item for item, _ in queue.get_batch(batch_size=1)] == [0]
+    producer.join(1)
+    assert not producer.is_alive()
+    assert [item for item, _ in queue.get_batch()] == [1, 2]
+    assert queue.dropped_count == 0
+
+
+def test_batch_consumer(caplog):
+    testing_utils.initialize_environment_core(core_config={
+        'EXECUTION_HISTORY_CONSUMER_BATCH_SIZE': 10,
+        'EXECUTION_HISTORY_CONSUMER_FLUSH_INTERVAL': 10.})
+    try:
+        consumer = RecordingConsumer()
+        for i in range(25):
+            consumer.enqueue(Item(i))
+        for _ in range(100):
+            if len(consumer.batches) == 2:
+                break
+            threading.Event().wait(0.01)
+        assert [len(batch) for batch in consumer.batches] == [10, 10]
+        # the remaining items are consumed when the consumer is stopped
+        consumer.stop()
+        assert [record['history_item_id'] for batch in consumer.batches for record in batch] == list(range(25))
+        metrics = consumer.get_metrics()
+        assert metrics['received_items'] == metrics['consumed_items'] == 25
+        assert metrics['consumed_batches'] == 3
+        assert metrics['queue_depth'] == metrics['dropped_items'] == 0
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
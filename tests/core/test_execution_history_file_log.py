@@ -1,6 +1,9 @@
 import os
+import shelve
 import time
 
+import pytest
+
 # singleton elements
 import rafcon.core.singleton
 from rafcon.core.storage import storage as global_storage
@@ -63,10 +66,23 @@ def test_execution_log(caplog):
         start_item = collapsed_items[start_id]
         assert 'Starts the factory' in start_item['description']
 
-        df = log_helper.log_to_DataFrame(ss)
+        # the streamed executions are equal to the collapsed structure
+        streamed_items = list(log_helper.iter_collapsed_items(ss))
+        assert streamed_items[0] == (start['run_id'], start)
+        # executions are yielded as soon as they are finished
+        assert streamed_items[1][1]['state_name'] == 'Start'
+        assert streamed_items[-1][1]['state_name'] == 'Root'
+        assert len(streamed_items) == len(collapsed_items)
+        for run_id, item in streamed_items:
+            assert isinstance(item.get('data_ins', {}), (dict, log_helper.LazyDataDict))
+            assert {k: set(v) if k in log_helper.DATA_KEYS else v for k, v in item.items()} == \
+                {k: set(v) if k in log_helper.DATA_KEYS else v for k, v in collapsed_items[run_id].items()}
+
+        df = log_helper.log_to_DataFrame(ss, data_in_columns=['input_1'])
         all_starts = df.groupby('state_name').get_group('Start')
         assert len(all_starts) == 3
         assert list(all_starts['outcome_name']) == ['success', 'success', 'done']
+        assert list(df.groupby('state_name').get_group('MakeProd2')['data_ins__input_1']) == [0]
 
         execution_history = state_machine.execution_histories[0]
 
@@ -191,6 +207,62 @@ def test_execution_log_without_file_system(caplog):
         testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
 
 
+@pytest.mark.parametrize("compression", [None, "zlib", "lzma"])
+def test_binary_execution_log(caplog, compression):
+    from rafcon.utils.execution_log_file import ExecutionLogReader, open_execution_log, convert_shelve_log
+    try:
+        log_path = testing_utils.get_unique_temp_path() + '/test_execution_log'
+        testing_utils.initialize_environment_core(
+            core_config={
+                'IN_MEMORY_EXECUTION_HISTORY_ENABLE': False,
+                'FILE_SYSTEM_EXECUTION_HISTORY_ENABLE': True,
+                'EXECUTION_LOG_FORMAT': 'BINARY',
+                'EXECUTION_LOG_COMPRESSION': compression,
+                'EXECUTION_LOG_PATH': log_path}
+        )
+
+        state_machine = global_storage.load_state_machine_from_path(
+            testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines",
+                                                        "execution_file_log_test")))
+
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+
+        filename = state_machine.get_last_execution_log_filename()
+        assert filename.endswith('.rafconlog')
+        with open_execution_log(filename) as log_file:
+            assert isinstance(log_file, ExecutionLogReader)
+            assert len(log_file) == 36
+            records = list(log_file.values())
+            assert records[0]['item_type'] == 'StateMachineStartItem'
+            timestamps = [record['timestamp'] for record in records]
+            assert timestamps == sorted(timestamps)
+
+            run_id = records[1]['run_id']
+            assert all(record['run_id'] == run_id for record in log_file.iter_records(run_ids=[run_id]))
+
+            start, next_, concurrent, hierarchy, collapsed_items = log_helper.log_to_collapsed_structure(log_file)
+            prod2 = [v for v in collapsed_items.values() if v['state_name'] == 'MakeProd2'][0]
+            assert prod2['data_ins']['input_1'] == 0
+            assert prod2['data_outs']['output_1'] == 3
+            assert len([v for v in collapsed_items.values() if v['state_name'] == 'Start' and
+                        v['state_type'] == 'ExecutionState']) == 3
+
+            # a shelve log converted into the binary format contains the same records
+            shelve_filename = os.path.join(log_path, 'converted.shelve')
+            store = shelve.open(shelve_filename, protocol=2)
+            store.update(log_file.items())
+            store.close()
+            converted_filename = convert_shelve_log(shelve_filename, compression=compression)
+            with ExecutionLogReader(converted_filename) as converted_log_file:
+                assert sorted(converted_log_file.items()) == sorted(log_file.items())
+
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
+
+
 if __name__ == '__main__':
     test_execution_log(None)
     test_execution_log_without_memory(None)
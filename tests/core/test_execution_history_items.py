@@ -0,0 +1,88 @@
+import pytest
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.execution.execution_history_items import CallItem, ReturnItem, CallType
+from rafcon.core.id_generator import experiment_id
+
+# singleton elements
+import rafcon.core.singleton
+from rafcon.core.singleton import state_machine_execution_engine
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs['data'] = list(range(10))
+    return 0
+"""
+
+
+def create_state_machine(number_of_states):
+    root_state = HierarchyState("root")
+    root_state.add_scoped_variable("constant", "int", 42, scoped_variable_id=1)
+    last_state = None
+    for i in range(number_of_states):
+        state = ExecutionState("state{0}".format(i))
+        state.script_text = SCRIPT
+        output_port_id = state.add_output_data_port("data", "list")
+        root_state.add_state(state)
+        if i == 0:
+            scoped_variable_id = root_state.add_scoped_variable("data", "list", scoped_variable_id=2)
+            root_state.add_data_flow(state.state_id, output_port_id, root_state.state_id, scoped_variable_id)
+            root_state.set_start_state(state)
+        else:
+            root_state.add_transition(last_state.state_id, 0, state.state_id, None)
+        last_state = state
+    root_state.add_transition(last_state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def test_compact_history_items(caplog):
+    testing_utils.initialize_environment_core(core_config={'IN_MEMORY_EXECUTION_HISTORY_ENABLE': True})
+    try:
+        state_machine = create_state_machine(4)
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        state_machine_execution_engine.join()
+        execution_history = state_machine.execution_histories[-1]
+        root_path = state_machine.root_state.get_path()
+
+        container_items = [item for item in execution_history
+                           if isinstance(item, (CallItem, ReturnItem)) and item.call_type is CallType.CONTAINER]
+        for item in execution_history:
+            assert not hasattr(item, '__dict__')
+            assert item.path == item.state_reference.get_path()
+        # the paths of all items of a state are the same string object
+        assert all(item.path is container_items[0].path for item in container_items)
+
+        # unchanged scoped data is shared between consecutive items, changed scoped data is copied again
+        def get_scoped_data(item, scoped_variable_id):
+            return item.scoped_data[str(scoped_variable_id) + state_machine.root_state.state_id]
+        constant = get_scoped_data(container_items[0], 1)
+        assert constant.value == 42
+        assert all(get_scoped_data(item, 1) is constant for item in container_items)
+        data = get_scoped_data(container_items[1], 2)
+        assert data.value == list(range(10))
+        assert get_scoped_data(container_items[0], 2) is not data
+        assert all(get_scoped_data(item, 2) is data for item in container_items[1:])
+        # the copies are only kept for reuse until the run ended
+        assert not execution_history._scoped_data_cache
+
+        record = container_items[0].to_dict()
+        assert record['path'] == root_path
+        assert record['state_type'] == 'HierarchyState'
+        assert record['call_type'] == 'CONTAINER'
+        assert record['history_item_id'].startswith(experiment_id + ".history_item_id.")
+        assert len(record['history_item_id']) == len(experiment_id + ".history_item_id.") + 20
+        assert container_items[0].history_item_id < container_items[1].history_item_id
+        state_machine.destroy_execution_histories()
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
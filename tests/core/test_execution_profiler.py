@@ -0,0 +1,96 @@
+import os
+import random
+
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.execution.execution_profiler import Histogram
+
+# singleton elements
+import rafcon.core.singleton
+
+# test environment elements
+from tests import utils as testing_utils
+
+SLEEP_SCRIPT = """
+import time
+
+def execute(self, inputs, outputs, gvm):
+    time.sleep(0.05)
+    return 0
+"""
+
+DECIDER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+
+def create_state_machine():
+    barrier_state = BarrierConcurrencyState("barrier")
+    for name in ("first", "second"):
+        state = ExecutionState(name)
+        state.script_text = SLEEP_SCRIPT
+        barrier_state.add_state(state)
+    decider_state = barrier_state.states[UNIQUE_DECIDER_STATE_ID]
+    decider_state.script_text = DECIDER_SCRIPT
+    barrier_state.add_transition(decider_state.state_id, 0, barrier_state.state_id, 0)
+    return StateMachine(barrier_state)
+
+
+def test_histogram():
+    histogram = Histogram()
+    values = [random.uniform(0.001, 1.) for _ in range(10000)]
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    assert histogram.count == len(values)
+    assert histogram.min == values[0] and histogram.max == values[-1]
+    for percentile in (50, 90, 99):
+        exact_value = values[int(percentile / 100. * len(values)) - 1]
+        assert histogram.get_value_at_percentile(percentile) == pytest.approx(exact_value, rel=0.02)
+
+
+def test_execution_profiling(caplog):
+    report_path = testing_utils.get_unique_temp_path()
+    testing_utils.initialize_environment_core(core_config={'EXECUTION_PROFILING_ENABLE': True,
+                                                           'EXECUTION_PROFILING_REPORT_PATH': report_path})
+    execution_engine = rafcon.core.singleton.state_machine_execution_engine
+    try:
+        state_machine = create_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        execution_engine.start(state_machine.state_machine_id)
+        execution_engine.join()
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+        root_path = state_machine.root_state.get_path()
+        statistics = execution_engine.execution_profiler.to_dict()
+        child_paths = [state.get_path() for state in state_machine.root_state.states.values()
+                       if state.state_id != UNIQUE_DECIDER_STATE_ID]
+        assert statistics['run'][root_path]['count'] == 1
+        assert statistics['run'][root_path]['total'] >= 0.05
+        for path in child_paths:
+            assert statistics['script'][path]['total'] >= 0.05
+            assert statistics['overhead'][path]['count'] == 1
+            assert statistics['overhead'][path]['total'] < statistics['run'][path]['total']
+        assert statistics['join'][root_path]['count'] == 2
+
+        report_files = os.listdir(report_path)
+        assert len(report_files) == 1
+        with open(os.path.join(report_path, report_files[0])) as report_file:
+            report = report_file.read()
+        assert "barrier/first" in report
+    finally:
+        execution_engine.execution_profiler = None
+        global_config.set_config_value('EXECUTION_PROFILING_ENABLE', False)
+        global_config.set_config_value('EXECUTION_PROFILING_REPORT_PATH', None)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
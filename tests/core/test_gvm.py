@@ -1,3 +1,6 @@
+import threading
+import time
+
 from rafcon.core.global_variable_manager import GlobalVariableManager
 import pytest
 from tests import utils as testing_utils
@@ -157,6 +160,93 @@ def test_keys(caplog):
     testing_utils.assert_logger_warnings_and_errors(caplog)
 
 
+def test_lock_contention(caplog):
+    gvm = GlobalVariableManager.instance()
+    gvm.reset()
+    gvm.set_variable('a', 1)
+    access_key = gvm.lock_variable('a')
+    results = []
+
+    def set_and_get():
+        gvm.set_variable('a', 2)
+        results.append(gvm.get_variable('a'))
+
+    threads = [threading.Thread(target=set_and_get) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    # other variables are not blocked by the locked variable
+    gvm.set_variable('b', 3)
+    assert gvm.get_variable('b') == 3
+    time.sleep(0.05)
+    # the threads wait for the locked variable
+    assert not results
+    assert all(thread.is_alive() for thread in threads)
+    gvm.unlock_variable('a', access_key)
+    # the waiting threads are woken up on unlock
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+    assert results == [2] * 4
+    assert not gvm.is_locked('a')
+
+    # reading a variable does not lock it exclusively
+    values = []
+    threads = [threading.Thread(target=lambda: values.append(gvm.get_variable('a'))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert values == [2] * 10
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
+def test_batch_access(caplog):
+    gvm = GlobalVariableManager.instance()
+    gvm.reset()
+    gvm.set_variables({'a': 1, 'b': [1, 2]}, data_types={'a': int})
+    assert gvm.get_variables(['a', 'b', 'c'], default=-1) == {'a': 1, 'b': [1, 2], 'c': -1}
+    assert gvm.get_data_type('a') is int
+
+    # no variable is set, if one value has the wrong type
+    with raises(TypeError):
+        gvm.set_variables({'a': "string", 'b': [3]})
+    assert gvm.get_variables(['a', 'b']) == {'a': 1, 'b': [1, 2]}
+    assert not gvm.is_locked('a') and not gvm.is_locked('b')
+
+    # immutable variables are handed out without copy
+    value = (1, 2, 3)
+    gvm.set_variable('c', value, immutable=True)
+    assert gvm.variable_is_immutable('c')
+    assert gvm.get_variable('c') is value
+    assert gvm.get_variables(['c'])['c'] is value
+    gvm.set_variable('c', [1, 2, 3])
+    assert not gvm.variable_is_immutable('c')
+
+    snapshot = gvm.snapshot()
+    assert dict(snapshot) == {'a': 1, 'b': [1, 2], 'c': [1, 2, 3]}
+    with raises(TypeError):
+        snapshot['a'] = 2
+    snapshot['b'].append(3)
+    assert gvm.get_variable('b') == [1, 2]
+
+    # batch accesses are consistent
+    def write():
+        for i in range(200):
+            gvm.set_variables({'x': i, 'y': i})
+
+    gvm.set_variables({'x': -1, 'y': -1})
+    writer = threading.Thread(target=write)
+    writer.start()
+    while writer.is_alive():
+        values = gvm.get_variables(['x', 'y'])
+        assert values['x'] == values['y']
+        snapshot = gvm.snapshot()
+        assert snapshot['x'] == snapshot['y']
+    writer.join()
+    assert gvm.get_variables(['x', 'y']) == {'x': 199, 'y': 199}
+    testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     test_locks(None)
     test_references(None)
@@ -177,6 +177,34 @@ def test_nested_library_state_machine(caplog):
         testing_utils.assert_logger_warnings_and_errors(caplog)
 
 
+def test_library_states_copy_on_write(caplog):
+    with testing_utils.test_multithreading_lock:
+        rafcon.core.config.global_config.set_config_value("LIBRARY_STATES_COPY_ON_WRITE", True)
+        try:
+            rafcon.core.singleton.library_manager.initialize()
+            library_states = [LibraryState("temporary_libraries", "library_with_nested_library", "0.1",
+                                           "nested_library_state_name", "nested_library_state_id")
+                              for _ in range(2)]
+            # the library states share the library template until their content is accessed
+            assert all(library_state._state_copy is None for library_state in library_states)
+            assert library_states[0] == library_states[1]
+            state_machine = StateMachine(library_states[0])
+            assert state_machine.root_state.get_states_statistics(0) == (4, 3)
+
+            rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+            rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+            rafcon.core.singleton.state_machine_execution_engine.join()
+            assert library_states[0].output_data["data_output_port1"] == 42.0
+            assert library_states[0]._state_copy is not None
+            assert library_states[0].state_copy.outcomes is library_states[0].outcomes
+            assert library_states[1]._state_copy is None
+            assert library_states[0] == library_states[1]
+            rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        finally:
+            rafcon.core.config.global_config.set_config_value("LIBRARY_STATES_COPY_ON_WRITE", False)
+        testing_utils.assert_logger_warnings_and_errors(caplog)
+
+
 def test_rafcon_library_path_variable(caplog):
     rafcon.core.config.global_config.set_config_value("LIBRARY_PATHS", {})
     os.environ['RAFCON_LIBRARY_PATH'] = os.path.join(testing_utils.LIBRARY_SM_PATH, 'generic')
@@ -0,0 +1,139 @@
+import time
+
+import pytest
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.config import global_config
+
+# singleton elements
+import rafcon.core.singleton
+from rafcon.core.singleton import state_machine_execution_engine
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT = """
+import time
+
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable('counter', (gvm.get_variable('counter') or 0) + 1)
+    time.sleep(0.1)
+    outputs['product'] = inputs['factor'] * 2
+    outputs['counter'] = gvm.get_variable('counter')
+    return 0
+"""
+
+CONFIG_SCRIPT = """
+from rafcon.core.config import global_config
+
+def execute(self, inputs, outputs, gvm):
+    outputs['value'] = global_config.get_config_value('PARAMETER_SWEEP_TEST_VALUE')
+    return 0
+"""
+
+
+def create_state_machine():
+    root_state = HierarchyState("sweep")
+    root_input_id = root_state.add_input_data_port("factor", "int", 1)
+    root_output_id = root_state.add_output_data_port("product", "int")
+    root_counter_id = root_state.add_output_data_port("counter", "int")
+    state = ExecutionState("double")
+    state.script_text = SCRIPT
+    input_id = state.add_input_data_port("factor", "int")
+    output_id = state.add_output_data_port("product", "int")
+    counter_id = state.add_output_data_port("counter", "int")
+    root_state.add_state(state)
+    root_state.set_start_state(state)
+    root_state.add_transition(state.state_id, 0, root_state.state_id, 0)
+    root_state.add_data_flow(root_state.state_id, root_input_id, state.state_id, input_id)
+    root_state.add_data_flow(state.state_id, output_id, root_state.state_id, root_output_id)
+    root_state.add_data_flow(state.state_id, counter_id, root_state.state_id, root_counter_id)
+    return StateMachine(root_state)
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_parameter_sweep(caplog, mode):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine()
+        if mode == "process":
+            storage.save_state_machine_to_path(state_machine, testing_utils.get_unique_temp_path())
+        input_sets = [{'factor': factor} for factor in range(8)]
+        results = {}
+        start_time = time.time()
+        for index, result in state_machine_execution_engine.execute_parameter_sweep(
+                state_machine, input_sets, mode=mode, number_of_workers=4):
+            assert index not in results
+            results[index] = result
+        wall_time = time.time() - start_time
+
+        assert sorted(results) == list(range(8))
+        for index, result in results.items():
+            assert result['error'] is None
+            assert result['outcome'] == "success"
+            assert result['output_data']['product'] == 2 * index
+            # each run has its own global variables
+            assert result['output_data']['counter'] == 1
+        assert not rafcon.core.singleton.global_variable_manager.variable_exist('counter')
+        # the loaded state machine is not executed itself
+        assert len(state_machine.execution_histories) == 0
+        if mode == "thread":
+            # the runs were executed concurrently
+            assert wall_time < sum(result['duration'] for result in results.values())
+            assert state_machine_execution_engine.status.execution_mode is StateMachineExecutionStatus.FINISHED
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_parameter_sweep_claims_engine_before_iteration(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        sweep = state_machine_execution_engine.execute_parameter_sweep(create_state_machine(), [{'factor': 1}])
+        assert state_machine_execution_engine.status.execution_mode is StateMachineExecutionStatus.STARTED
+        with pytest.raises(RuntimeError):
+            state_machine_execution_engine.execute_parameter_sweep(create_state_machine(), [{'factor': 2}])
+        sweep.close()
+        assert state_machine_execution_engine.status.execution_mode is StateMachineExecutionStatus.FINISHED
+
+        assert list(state_machine_execution_engine.execute_parameter_sweep(create_state_machine(), [])) == []
+        assert state_machine_execution_engine.status.execution_mode is StateMachineExecutionStatus.FINISHED
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_parameter_sweep_passes_config_to_process_workers(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        root_state = ExecutionState("config")
+        root_state.script_text = CONFIG_SCRIPT
+        root_state.add_output_data_port("value", "int")
+        state_machine = StateMachine(root_state)
+        storage.save_state_machine_to_path(state_machine, testing_utils.get_unique_temp_path())
+        # a value that is only set at runtime and not stored in the config file
+        global_config.set_config_value('PARAMETER_SWEEP_TEST_VALUE', 42)
+        results = list(state_machine_execution_engine.execute_parameter_sweep(
+            state_machine, [{}], mode="process", number_of_workers=1))
+        assert results[0][1]['error'] is None
+        assert results[0][1]['output_data']['value'] == 42
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_parameter_sweep_requires_saved_state_machine_for_process_mode(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        with pytest.raises(ValueError):
+            state_machine_execution_engine.execute_parameter_sweep(create_state_machine(), [{}], mode="process")
+        with pytest.raises(ValueError):
+            state_machine_execution_engine.execute_parameter_sweep(create_state_machine(), [{}], mode="fiber")
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
@@ -68,5 +68,32 @@ def test_scoped_data(caplog):
         testing_utils.assert_logger_warnings_and_errors(caplog)
 
 
+def test_data_flow_index():
+    sm = create_state_machine()
+    root_state = sm.root_state
+    state1, state2 = [state for state in root_state.states.values()]
+    if state1.name != "first_state":
+        state1, state2 = state2, state1
+    input_key = state2.get_io_data_port_id_from_name_and_type("data_input_port1", InputDataPort)
+    output_key = state1.get_io_data_port_id_from_name_and_type("data_output_port1", OutputDataPort)
+
+    incoming = root_state.get_incoming_data_flows(state2.state_id, input_key)
+    assert len(incoming) == 1
+    data_flow, scoped_data_key = incoming[0]
+    assert scoped_data_key == str(output_key) + state1.state_id
+    assert root_state.get_outgoing_data_flows(state1.state_id, output_key) == [data_flow]
+
+    # the index has to follow changes of the data flows
+    root_state.remove_data_flow(data_flow.data_flow_id)
+    assert root_state.get_incoming_data_flows(state2.state_id, input_key) == []
+    assert root_state.get_outgoing_data_flows(state1.state_id, output_key) == []
+
+    root_state.add_data_flow(state1.state_id, output_key, state2.state_id, input_key)
+    assert len(root_state.get_incoming_data_flows(state2.state_id, input_key)) == 1
+
+    root_state.data_flows = {}
+    assert root_state.get_incoming_data_flows(state2.state_id, input_key) == []
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
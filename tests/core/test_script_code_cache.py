@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from rafcon.core.config import global_config
+from rafcon.core.script import Script, CodeCache, code_cache
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT_TEXT = """
+counter = 0
+
+def execute(self, inputs, outputs, gvm):
+    global counter
+    counter += 1
+    outputs['counter'] = counter
+    return 0
+"""
+
+
+def execute_script(script):
+    outputs = {'counter': None}
+    script.compile_module()
+    script.execute(None, {}, outputs)
+    return outputs['counter']
+
+
+def test_recompilation_uses_cached_code():
+    testing_utils.initialize_environment_core()
+    try:
+        code_cache.clear()
+        script = Script()
+        script.script = SCRIPT_TEXT
+        assert execute_script(script) == 1
+        misses = code_cache.misses
+        # the module is executed again, thus the global variables are reset
+        assert execute_script(script) == 1
+        assert code_cache.misses == misses
+
+        # scripts with the same text share the code object
+        other_script = Script()
+        other_script.script = SCRIPT_TEXT
+        assert execute_script(other_script) == 1
+        assert code_cache.misses == misses
+        assert other_script.compiled_module is not script.compiled_module
+
+        script.script = SCRIPT_TEXT.replace("counter += 1", "counter += 2")
+        assert execute_script(script) == 2
+        assert code_cache.misses == misses + 1
+
+        script.script = "def execute(self, inputs, outputs, gvm):\n    return 0 +\n"
+        with pytest.raises(SyntaxError):
+            script.compile_module()
+        assert script.compiled_module is None
+    finally:
+        testing_utils.shutdown_environment_only_core()
+
+
+def test_persistent_code_cache():
+    cache_path = testing_utils.get_unique_temp_path()
+    testing_utils.initialize_environment_core(core_config={'SCRIPT_COMPILATION_CACHE_PATH': cache_path})
+    try:
+        CodeCache().get_code(SCRIPT_TEXT, "script.py")
+        assert len(os.listdir(cache_path)) == 1
+
+        # a new cache, like in another process, loads the stored bytecode
+        cache = CodeCache()
+        code = cache.get_code(SCRIPT_TEXT, "script.py")
+        namespace = {}
+        exec(code, namespace)
+        assert 'execute' in namespace
+        assert cache.get_code(SCRIPT_TEXT, "script.py") is code
+        assert cache.hits == 1
+    finally:
+        global_config.set_config_value('SCRIPT_COMPILATION_CACHE_PATH', None)
+        testing_utils.shutdown_environment_only_core()
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
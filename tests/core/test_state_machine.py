@@ -2,6 +2,7 @@
 from rafcon.core.states.state import State
 from rafcon.core.decorators import global_lock_counter, lock_state_machine
 from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
 from rafcon.core.state_machine import StateMachine
 from rafcon.core.state_machine_manager import StateMachineManager
 
@@ -50,6 +51,39 @@ def test_state_machine_manager(caplog):
     assert_logger_warnings_and_errors(caplog)
 
 
+def test_cached_state_paths(caplog):
+    root_state = HierarchyState("root", state_id="ROOT")
+    container_state = HierarchyState("container", state_id="CONTAINER")
+    state = ExecutionState("state", state_id="STATE")
+    container_state.add_state(state)
+    root_state.add_state(container_state)
+    state_machine = StateMachine(root_state)
+
+    assert state.get_path() == "ROOT/CONTAINER/STATE"
+    assert state.get_path(by_name=True) == "root/container/state"
+    assert state.get_path("CHILD") == "ROOT/CONTAINER/STATE/CHILD"
+    assert state_machine.get_state_by_path("ROOT/CONTAINER/STATE") is state
+
+    # paths are updated on renaming, changing ids and re-parenting
+    sibling_state = ExecutionState("sibling", state_id="SIBLING")
+    root_state.add_state(sibling_state)
+    assert sibling_state.get_path(by_name=True) == "root/sibling"
+    container_state.name = "renamed"
+    assert state.get_path(by_name=True) == "root/renamed/state"
+    # only the cached paths of the changed subtree are invalidated
+    assert sibling_state._path_by_name_cache == "root/sibling"
+
+    container_state.remove_state(state.state_id, recursive=False, destroy=False)
+    assert state.get_path() == "STATE"
+    assert state_machine.get_state_by_path("ROOT/CONTAINER/STATE", as_check=True) is None
+    state.change_state_id("NEW_ID")
+    assert state.get_path() == "NEW_ID"
+    root_state.add_state(state)
+    assert state.get_path() == "ROOT/NEW_ID"
+    assert state_machine.get_state_by_path("ROOT/NEW_ID") is state
+    assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     test_state_machine_manager(None)
     test_lock_state_machine(None)
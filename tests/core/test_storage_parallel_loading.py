@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from rafcon.core.storage import storage
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def load_state_machine(path, thread_pool_size):
+    testing_utils.initialize_environment_core(core_config={'LOAD_SM_THREAD_POOL_SIZE': thread_pool_size})
+    try:
+        return storage.load_state_machine_from_path(path)
+    finally:
+        testing_utils.shutdown_environment_only_core()
+
+
+@pytest.mark.parametrize("state_machine_name", ["99_bottles_of_beer_monitoring", "stepping_test",
+                                                "execution_file_log_test"])
+def test_parallel_loading_equals_sequential_loading(state_machine_name):
+    path = testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", state_machine_name))
+    sequential_sm = load_state_machine(path, 0)
+    parallel_sm = load_state_machine(path, 8)
+
+    assert parallel_sm.root_state == sequential_sm.root_state
+    assert StateMachine.state_machine_to_dict(parallel_sm) == StateMachine.state_machine_to_dict(sequential_sm)
+    assert parallel_sm.marked_dirty == sequential_sm.marked_dirty
+    assert parallel_sm.root_state.get_states_statistics(0) == sequential_sm.root_state.get_states_statistics(0)
+
+
+def test_read_state_files_recursively():
+    path = testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "stepping_test"))
+    root_state_path = [os.path.join(path, p) for p in os.listdir(path) if os.path.isdir(os.path.join(path, p))][0]
+    state_files = storage.read_state_files_recursively(root_state_path, max_workers=4)
+
+    for state_path, files in state_files.items():
+        assert not isinstance(files.core_data, Exception)
+        assert all(child_state_path in state_files for child_state_path in files.child_state_paths)
+    number_of_states = sum(1 for root, dirs, _ in os.walk(root_state_path)
+                           if os.path.exists(os.path.join(root, storage.FILE_NAME_CORE_DATA)))
+    assert len(state_files) == number_of_states
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from rafcon.core.execution.thread_pool import StateThreadPool
+
+
+def test_worker_reuse():
+    pool = StateThreadPool(max_idle_workers=2)
+    thread_names = []
+
+    for _ in range(5):
+        task = pool.start_task(lambda: thread_names.append(threading.current_thread().name))
+        task.join()
+        assert not task.is_alive()
+
+    # all tasks were executed sequentially, thus a single worker is sufficient
+    assert len(set(thread_names)) == 1
+    metrics = pool.get_metrics()
+    assert metrics['tasks_started'] == 5
+    assert metrics['threads_created'] == 1
+    pool.shutdown()
+
+
+def test_nested_tasks_exceeding_pool_size():
+    """Tasks waiting for sub tasks must not block the pool (like hierarchy states waiting for their children)"""
+    pool = StateThreadPool(max_idle_workers=1)
+    results = []
+
+    def nested(depth):
+        if depth == 0:
+            results.append(pool.busy_workers)
+            return
+        pool.start_task(lambda: nested(depth - 1)).join()
+
+    pool.start_task(lambda: nested(5)).join(timeout=5)
+    assert results == [6]
+    # only the configured number of idle workers is kept
+    for _ in range(100):
+        if pool.pool_size == 1:
+            break
+        threading.Event().wait(0.01)
+    assert pool.pool_size == 1
+    assert pool.idle_workers == 1
+    assert pool.queue_depth == 0
+    pool.shutdown()
+
+
+def test_disabled_pool():
+    pool = StateThreadPool(max_idle_workers=0)
+    event = threading.Event()
+    thread = pool.start_task(event.set)
+    thread.join()
+    assert isinstance(thread, threading.Thread)
+    assert event.is_set()
+    assert pool.get_metrics()['threads_created'] == 0
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
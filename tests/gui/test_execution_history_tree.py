@@ -0,0 +1,164 @@
+import pytest
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def create_state_machine():
+    import rafcon.core.singleton
+    import rafcon.gui.singleton
+    from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.state_machine import StateMachine
+
+    root_state = BarrierConcurrencyState("Root", state_id="ROOT")
+    root_state.add_state(ExecutionState("Child1", state_id="CHILD1"))
+    root_state.add_state(ExecutionState("Child2", state_id="CHILD2"))
+    sm = StateMachine(root_state)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(sm)
+    testing_utils.wait_for_gui()
+    rafcon.gui.singleton.state_machine_manager_model.selected_state_machine_id = sm.state_machine_id
+    testing_utils.wait_for_gui()
+    return sm
+
+
+def push_call(execution_history, state, call_type):
+    return execution_history.push_call_history_item(state, call_type, None, {})
+
+
+def push_return(execution_history, state, call_type):
+    return execution_history.push_return_history_item(state, call_type, None, {})
+
+
+def push_child_execution(execution_history, child_state):
+    from rafcon.core.execution.execution_history_items import CallType
+    push_call(execution_history, child_state, CallType.EXECUTE)
+    push_return(execution_history, child_state, CallType.EXECUTE)
+
+
+def count_rows(tree_store, parent_iter=None):
+    number_of_rows = 0
+    for n in range(tree_store.iter_n_children(parent_iter)):
+        number_of_rows += 1 + count_rows(tree_store, tree_store.iter_nth_child(parent_iter, n))
+    return number_of_rows
+
+
+def get_row_texts(tree_store, parent_iter):
+    return [tree_store.get_value(tree_store.iter_nth_child(parent_iter, n), 0)
+            for n in range(tree_store.iter_n_children(parent_iter))]
+
+
+def get_history_items_of_rows(tree_store, parent_iter=None):
+    from rafcon.gui.controllers.execution_history import ExecutionHistoryTreeController
+    history_items = []
+    for n in range(tree_store.iter_n_children(parent_iter)):
+        child_iter = tree_store.iter_nth_child(parent_iter, n)
+        history_item = tree_store.get_value(child_iter, ExecutionHistoryTreeController.HISTORY_ITEM_STORAGE_ID)
+        if history_item is not None:
+            history_items.append(history_item)
+        history_items.extend(get_history_items_of_rows(tree_store, child_iter))
+    return history_items
+
+
+def expand_row(history_ctrl, tree_item):
+    history_ctrl.history_tree.expand_row(history_ctrl.history_tree_store.get_path(tree_item), False)
+
+
+def is_row_expanded(history_ctrl, tree_item):
+    return history_ctrl.history_tree.row_expanded(history_ctrl.history_tree_store.get_path(tree_item))
+
+
+def test_execution_history_tree(gui):
+    import rafcon.gui.singleton
+    from rafcon.core.execution.execution_history_items import CallType
+
+    sm = gui(create_state_machine)
+    root_state = sm.root_state
+    child1, child2 = root_state.states["CHILD1"], root_state.states["CHILD2"]
+    history_ctrl = rafcon.gui.singleton.main_window_controller.get_controller('execution_history_ctrl')
+    tree_store = history_ctrl.history_tree_store
+    try:
+        execution_history = gui(sm._add_new_execution_history)
+        gui(execution_history.push_state_machine_start_history_item, sm, "run")
+        gui(push_call, execution_history, root_state, CallType.EXECUTE)
+        gui(push_call, execution_history, root_state, CallType.CONTAINER)
+        gui(history_ctrl.update)
+        run_section = history_ctrl._run_sections[0]
+        root_row = run_section.inserted_rows[0][1]
+        assert gui(get_row_texts, tree_store, run_section.tree_item) == ["Root - Enter"]
+        assert gui(get_row_texts, tree_store, root_row) == ["Root - Enter"]
+        gui(expand_row, history_ctrl, run_section.tree_item)
+        gui(expand_row, history_ctrl, root_row)
+
+        # the items added since the last update are appended to the existing rows, which stay expanded
+        concurrency_item = gui(execution_history.push_concurrency_history_item, root_state, 2)
+        for branch_history, child_state in zip(concurrency_item.execution_histories, (child1, child2)):
+            gui(push_child_execution, branch_history, child_state)
+        gui(history_ctrl.update)
+        assert history_ctrl._run_sections[0] is run_section
+        assert run_section.inserted_rows[0][1] is root_row
+        assert gui(is_row_expanded, history_ctrl, root_row)
+        assert gui(get_row_texts, tree_store, root_row) == \
+            ["Root - Enter", "Child1 - Concurrency Branch", "Child2 - Concurrency Branch"]
+
+        # the items of a concurrency branch are inserted, when its row is expanded
+        branch_section = run_section.child_sections[0]
+        assert not branch_section.loaded
+        assert gui(get_row_texts, tree_store, branch_section.tree_item) == ["..."]
+        gui(expand_row, history_ctrl, branch_section.tree_item)
+        assert branch_section.loaded
+        assert gui(get_row_texts, tree_store, branch_section.tree_item) == ["Child1 - Call", "Child1 - Return"]
+        assert not run_section.child_sections[1].loaded
+
+        gui(push_return, execution_history, root_state, CallType.CONTAINER)
+        gui(push_return, execution_history, root_state, CallType.EXECUTE)
+        gui(history_ctrl.update)
+        assert gui(get_row_texts, tree_store, run_section.tree_item) == ["Root - Enter", "Root - Return"]
+        assert gui(get_row_texts, tree_store, root_row)[-1] == "Root - Exit"
+        assert gui(is_row_expanded, history_ctrl, branch_section.tree_item)
+
+        # after a backward step, the rows of the run are rebuilt without the popped item
+        popped_history_item = gui(execution_history.pop_last_item)
+        assert run_section.get_new_history_items() is None
+        gui(history_ctrl.update)
+        assert gui(get_row_texts, tree_store, run_section.tree_item) == ["Root - Enter"]
+        assert popped_history_item not in gui(get_history_items_of_rows, tree_store)
+        assert run_section.get_new_history_items() == []
+        number_of_run_rows = gui(count_rows, tree_store, run_section.tree_item)
+
+        # the rows of the items evicted from a bounded history are removed
+        execution_history = gui(sm._add_new_execution_history)
+        execution_history.max_items = 6
+        gui(execution_history.push_state_machine_start_history_item, sm, "bounded run")
+        root_call_item = gui(push_call, execution_history, root_state, CallType.EXECUTE)
+        gui(push_call, execution_history, root_state, CallType.CONTAINER)
+        gui(history_ctrl.update)
+        bounded_run_section = history_ctrl._run_sections[1]
+        for _ in range(20):
+            gui(push_child_execution, execution_history, child1)
+            gui(history_ctrl.update)
+            shown_history_items = gui(get_history_items_of_rows, tree_store, bounded_run_section.tree_item)
+            assert len(shown_history_items) <= execution_history.max_items + 1
+            assert set(execution_history) - set(shown_history_items) <= {execution_history[0]}
+            # the row of the root state is kept, as it contains the rows of the retained items
+            assert set(shown_history_items) - set(execution_history) <= {root_call_item}
+        assert execution_history.truncated
+        assert len(bounded_run_section.inserted_rows) == execution_history.max_items + 1
+        # the rows of the other run are not changed
+        assert gui(count_rows, tree_store, run_section.tree_item) == number_of_run_rows
+
+        # if all inserted items were evicted, the rows are rebuilt from the retained items
+        last_history_item = execution_history[-1]
+        for _ in range(5):
+            gui(push_child_execution, execution_history, child2)
+        assert bounded_run_section.last_item is last_history_item
+        assert bounded_run_section.get_new_history_items() is None
+        gui(history_ctrl.update)
+        assert gui(get_history_items_of_rows, tree_store, bounded_run_section.tree_item) == list(execution_history)
+    finally:
+        gui(sm.destroy_execution_histories)
+        gui(history_ctrl.update)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
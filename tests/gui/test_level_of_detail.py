@@ -0,0 +1,57 @@
+from copy import deepcopy
+
+import pytest
+
+from tests.gui.test_state_resize import open_test_state_machine, config_options, state_path_root, state_path_P, \
+    state_path_PC, state_path_e
+
+level_of_detail_config_options = deepcopy(config_options)
+level_of_detail_config_options["gui_config"].update({
+    'LEVEL_OF_DETAIL_MINIMUM_CONTENT_SIZE': 40,
+    'LEVEL_OF_DETAIL_MINIMUM_LABEL_SIZE': 80
+})
+
+
+def zoom_to_size(view, state_v, size):
+    """Zooms the view, so that the smaller side of the state has the given size in pixels"""
+    view_width, view_height = view.get_matrix_i2v(state_v).transform_distance(state_v.width, state_v.height)
+    view.zoom(size / min(abs(view_width), abs(view_height)))
+    view.canvas.update_now()
+
+
+def get_state_at_center(view, state_v):
+    """Returns the state found at the center of the given state"""
+    center = view.get_matrix_i2v(state_v).transform_point(state_v.width / 2., state_v.height / 2.)
+    return view.get_state_at_point(center, distance=1)
+
+
+@pytest.mark.parametrize("gui", [level_of_detail_config_options], indirect=True)
+def test_level_of_detail(gui):
+    sm_m, canvas, view = open_test_state_machine(gui)
+    root_v, parent_v, child_v, execution_v = [canvas.get_view_for_model(sm_m.get_state_model_by_path(path))
+                                              for path in (state_path_root, state_path_P, state_path_PC, state_path_e)]
+    assert gui(view.is_in_viewport, root_v)
+
+    gui(zoom_to_size, view, parent_v, 200)
+    assert not gui(parent_v.content_collapsed)
+    assert gui(parent_v.show_labels)
+    assert not gui(root_v.content_hidden)
+    assert not gui(view.is_hidden, child_v)
+
+    # the content of the parent state collapses into a single box, which hides all its descendants
+    gui(zoom_to_size, view, parent_v, 20)
+    assert gui(parent_v.content_collapsed)
+    assert not gui(parent_v.show_labels)
+    assert gui(child_v.content_hidden)
+    # an execution state has no content to collapse, but is hidden by its parents
+    assert not gui(execution_v.content_collapsed)
+    assert gui(execution_v.parent.content_hidden)
+    # hidden states are not found at a point
+    assert gui(view.is_hidden, child_v)
+    found_state_v = gui(get_state_at_center, view, child_v)
+    assert found_state_v is not child_v
+    assert found_state_v is None or not gui(view.is_hidden, found_state_v)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
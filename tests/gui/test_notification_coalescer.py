@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+from tests import utils as testing_utils
+
+from rafcon.design_patterns.observer.observer import Observer
+
+
+class ExecutionStatusObserver(Observer):
+    """Records the execution status of the observed state and the thread of each notification"""
+
+    def __init__(self, model):
+        super(ExecutionStatusObserver, self).__init__()
+        self.notifications = []
+        self.observe_model(model)
+
+    @Observer.observe("state", after=True)
+    def on_state_changed(self, model, prop_name, info):
+        if info['method_name'] == 'state_execution_status':
+            self.notifications.append((threading.current_thread(), model.state.state_execution_status))
+
+
+def test_notification_coalescer():
+    from rafcon.gui.utils.notification_coalescer import NotificationCoalescer
+
+    delivered = []
+    coalescer = NotificationCoalescer("EXECUTION_STATUS_UPDATE_RATE")
+
+    def notify(thread_index):
+        for change in range(100):
+            coalescer.add(thread_index % 2, delivered.append, (thread_index, change))
+
+    threads = [threading.Thread(target=notify, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    coalescer.flush()
+    # only the latest notification of each key is delivered
+    assert len(delivered) == 2
+    assert all(change == 99 for _, change in delivered)
+    assert {thread_index % 2 for thread_index, _ in delivered} == {0, 1}
+
+    # the notifications are delivered in the order of their last change
+    del delivered[:]
+    coalescer.add('a', delivered.append, 1)
+    coalescer.add('b', delivered.append, 2)
+    coalescer.add('a', delivered.append, 3)
+    coalescer.flush()
+    assert delivered == [2, 3]
+
+    coalescer.add('a', delivered.append, 4)
+    coalescer.clear()
+    coalescer.flush()
+    assert delivered == [2, 3]
+
+
+def change_execution_status_in_thread(state, execution_states):
+    def change_execution_status():
+        for execution_status in execution_states:
+            state.state_execution_status = execution_status
+    thread = threading.Thread(target=change_execution_status)
+    thread.start()
+    thread.join()
+
+
+def iterate_main_loop_until(condition, timeout=5.):
+    from gi.repository import GLib
+    end_time = time.time() + timeout
+    while not condition() and time.time() < end_time:
+        GLib.MainContext.default().iteration(False)
+
+
+def test_coalesced_execution_status_notifications():
+    testing_utils.dummy_gui(None)
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.states.state import StateExecutionStatus
+    from rafcon.gui.models.state import StateModel
+    from rafcon.gui.config import global_gui_config
+    from rafcon.gui.utils.notification_coalescer import execution_status_coalescer
+
+    state_m = StateModel(ExecutionState("executed"))
+    state = state_m.state
+    observer = ExecutionStatusObserver(state_m)
+    main_thread = threading.current_thread()
+    rate = global_gui_config.get_config_value("EXECUTION_STATUS_UPDATE_RATE")
+    try:
+        global_gui_config.set_config_value("EXECUTION_STATUS_UPDATE_RATE", 30)
+        # changes in the thread of the observer are notified immediately
+        state.state_execution_status = StateExecutionStatus.ACTIVE
+        assert observer.notifications == [(main_thread, StateExecutionStatus.ACTIVE)]
+
+        # changes in other threads are coalesced and delivered in the thread flushing the coalescer
+        del observer.notifications[:]
+        change_execution_status_in_thread(state, [StateExecutionStatus.EXECUTE_CHILDREN,
+                                                  StateExecutionStatus.WAIT_FOR_NEXT_STATE,
+                                                  StateExecutionStatus.ACTIVE])
+        assert observer.notifications == []
+        execution_status_coalescer.flush()
+        assert observer.notifications == [(main_thread, StateExecutionStatus.ACTIVE)]
+
+        # notifications for observers relieved before the flush are dropped
+        del observer.notifications[:]
+        change_execution_status_in_thread(state, [StateExecutionStatus.INACTIVE])
+        observer.relieve_model(state_m)
+        execution_status_coalescer.flush()
+        assert observer.notifications == []
+        observer.observe_model(state_m)
+
+        # without a rate limit, each change of another thread is notified in the main loop
+        global_gui_config.set_config_value("EXECUTION_STATUS_UPDATE_RATE", 0)
+        change_execution_status_in_thread(state, [StateExecutionStatus.ACTIVE, StateExecutionStatus.INACTIVE])
+        iterate_main_loop_until(lambda: len(observer.notifications) >= 2)
+        assert len(observer.notifications) == 2
+        assert all(thread is main_thread for thread, _ in observer.notifications)
+        execution_status_coalescer.flush()
+        assert len(observer.notifications) == 2
+    finally:
+        global_gui_config.set_config_value("EXECUTION_STATUS_UPDATE_RATE", rate)
+        execution_status_coalescer.clear()
+        observer.relieve_model(state_m)
+        state_m.prepare_destruction()
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
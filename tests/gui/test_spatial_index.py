@@ -0,0 +1,52 @@
+import pytest
+
+from tests.gui.test_state_resize import open_test_state_machine, config_options
+
+
+def get_closest_port_distance(view, vpos):
+    """Looks up the distance of the closest port by checking the ports of all states"""
+    from rafcon.gui.mygaphas.items.state import StateView
+    closest_distance = None
+    for state_v in view.canvas.get_all_items():
+        if not isinstance(state_v, StateView):
+            continue
+        ix, iy = view.get_matrix_v2i(state_v).transform_point(*vpos)
+        for port in state_v.ports():
+            _, distance = port.glue((ix, iy))
+            if closest_distance is None or distance < closest_distance:
+                closest_distance = distance
+    return closest_distance
+
+
+def assert_ports_are_found(view, state_views):
+    for state_v in state_views:
+        i2v = view.get_matrix_i2v(state_v).transform_point
+        for port in state_v.ports():
+            vpos = i2v(float(port.point.x), float(port.point.y))
+            found_state_v, found_port, _ = view.get_port_at_point(vpos, distance=10)
+            assert found_port is not None
+            _, distance = found_port.glue(view.get_matrix_v2i(found_state_v).transform_point(*vpos))
+            assert distance == pytest.approx(get_closest_port_distance(view, vpos))
+            assert view.get_state_at_point(vpos, distance=0) is not None
+
+
+@pytest.mark.parametrize("gui", [config_options], indirect=True)
+def test_spatial_index(gui):
+    from rafcon.gui.mygaphas.items.state import StateView
+    sm_m, canvas, view = open_test_state_machine(gui)
+    state_views = [item for item in canvas.get_all_items() if isinstance(item, StateView)]
+    gui(assert_ports_are_found, view, state_views)
+
+    # the index is updated, after a state was moved
+    state_v = canvas.get_view_for_model(sm_m.get_state_model_by_path("YCBQQV/PBUVVY"))
+
+    def move_state():
+        state_v.matrix.translate(5, 5)
+        canvas.request_update(state_v)
+        canvas.update_now()
+    gui(move_state)
+    gui(assert_ports_are_found, view, [state_v])
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
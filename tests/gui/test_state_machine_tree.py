@@ -0,0 +1,126 @@
+import pytest
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def create_state_machine():
+    import rafcon.core.singleton
+    import rafcon.gui.singleton
+    from rafcon.core.states.hierarchy_state import HierarchyState
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.state_machine import StateMachine
+
+    root_state = HierarchyState("Root", state_id="ROOT")
+    for container_name in ("Container1", "Container2"):
+        container_state = HierarchyState(container_name, state_id=container_name.upper())
+        container_state.add_state(ExecutionState(container_name + "Child", state_id=container_name.upper() + "C"))
+        root_state.add_state(container_state)
+
+    sm = StateMachine(root_state)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(sm)
+    testing_utils.wait_for_gui()
+    rafcon.gui.singleton.state_machine_manager_model.selected_state_machine_id = sm.state_machine_id
+    testing_utils.wait_for_gui()
+    return rafcon.gui.singleton.state_machine_manager_model.state_machines[sm.state_machine_id]
+
+
+def get_tree_rows(tree_ctrl):
+    """Returns the state paths of all rows of the tree by the state paths of their parent rows"""
+    rows = {}
+
+    def collect_rows(parent_iter, parent_path):
+        for n in range(tree_ctrl.tree_store.iter_n_children(parent_iter)):
+            child_iter = tree_ctrl.tree_store.iter_nth_child(parent_iter, n)
+            child_path = tree_ctrl.tree_store.get_value(child_iter, tree_ctrl.STATE_PATH_STORAGE_ID)
+            rows.setdefault(parent_path, set()).add(child_path)
+            collect_rows(child_iter, child_path)
+    collect_rows(None, None)
+    return rows
+
+
+def get_expected_rows(state):
+    """Returns the state paths of the expected rows, library states are shown without their content"""
+    from rafcon.core.states.container_state import ContainerState
+    rows = {None: {state.get_path()}}
+
+    def collect_rows(state):
+        if not isinstance(state, ContainerState):
+            return
+        for child_state in state.states.values():
+            rows.setdefault(state.get_path(), set()).add(child_state.get_path())
+            collect_rows(child_state)
+    collect_rows(state)
+    return rows
+
+
+def assert_tree_is_consistent(tree_ctrl, state_machine):
+    rows = get_tree_rows(tree_ctrl)
+    assert rows == get_expected_rows(state_machine.root_state)
+    row_paths = set.union(*rows.values())
+    assert set(tree_ctrl.state_row_iter_dict_by_state_path) == row_paths
+    for state_path, row_iter in tree_ctrl.state_row_iter_dict_by_state_path.items():
+        assert tree_ctrl.tree_store.get_value(row_iter, tree_ctrl.STATE_PATH_STORAGE_ID) == state_path
+
+
+def is_row_expanded(tree_ctrl, state_path):
+    row_iter = tree_ctrl.state_row_iter_dict_by_state_path[state_path]
+    return tree_ctrl.view.row_expanded(tree_ctrl.tree_store.get_path(row_iter))
+
+
+def expand_row(tree_ctrl, state_path):
+    row_iter = tree_ctrl.state_row_iter_dict_by_state_path[state_path]
+    tree_ctrl.view.expand_row(tree_ctrl.tree_store.get_path(row_iter), False)
+
+
+def test_incremental_update(gui):
+    import rafcon.gui.singleton
+    from rafcon.core.states.hierarchy_state import HierarchyState
+    from rafcon.core.states.execution_state import ExecutionState
+    from rafcon.core.states.library_state import LibraryState
+
+    sm_m = gui(create_state_machine)
+    state_machine = sm_m.state_machine
+    root_state = state_machine.root_state
+    container1 = root_state.states["CONTAINER1"]
+    container2 = root_state.states["CONTAINER2"]
+    tree_ctrl = rafcon.gui.singleton.main_window_controller.get_controller('state_machine_tree_controller')
+    gui(assert_tree_is_consistent, tree_ctrl, state_machine)
+
+    gui(tree_ctrl.view.collapse_all)
+    gui(expand_row, tree_ctrl, root_state.get_path())
+    gui(expand_row, tree_ctrl, container1.get_path())
+
+    # add a container state with children to a nested container state
+    nested_state = HierarchyState("Nested", state_id="NESTED")
+    nested_state.add_state(ExecutionState("NestedChild", state_id="NESTEDC"))
+    gui(container2.add_state, nested_state)
+    gui(assert_tree_is_consistent, tree_ctrl, state_machine)
+    assert gui(is_row_expanded, tree_ctrl, container1.get_path())
+    assert not gui(is_row_expanded, tree_ctrl, container2.get_path())
+
+    # add a library state, which is shown without its content
+    library_state = LibraryState("generic", "wait", name="Wait", state_id="WAIT")
+    gui(container2.add_state, library_state)
+    gui(assert_tree_is_consistent, tree_ctrl, state_machine)
+    assert gui(is_row_expanded, tree_ctrl, container1.get_path())
+
+    # remove the states again, which also removes the rows of the children
+    gui(container2.remove_state, "NESTED")
+    gui(assert_tree_is_consistent, tree_ctrl, state_machine)
+    gui(container2.remove_state, "WAIT")
+    gui(assert_tree_is_consistent, tree_ctrl, state_machine)
+    gui(root_state.remove_state, "CONTAINER2")
+    gui(assert_tree_is_consistent, tree_ctrl, state_machine)
+    assert gui(is_row_expanded, tree_ctrl, root_state.get_path())
+    assert gui(is_row_expanded, tree_ctrl, container1.get_path())
+
+    # a full update results in the same rows
+    rows = gui(get_tree_rows, tree_ctrl)
+    gui(tree_ctrl.update)
+    assert gui(get_tree_rows, tree_ctrl) == rows
+    gui(assert_tree_is_consistent, tree_ctrl, state_machine)
+
+
+if __name__ == '__main__':
+    pytest.main(['-s', __file__])
@@ -1,5 +1,8 @@
+import time
+
 # core elements
 import rafcon.core.singleton
+from rafcon.core.execution.execution_status import StateMachineExecutionStatus
 from rafcon.core.states.execution_state import ExecutionState
 from rafcon.core.states.hierarchy_state import HierarchyState
 from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
@@ -12,6 +15,12 @@ from rafcon.utils.timer import measure_time
 
 from tests import utils as testing_utils
 
+NOOP_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    outputs['output1'] = inputs['input1']
+    return 0
+"""
+
 
 @measure_time
 def create_hierarchy_state(number_child_states=10, sleep=False):
@@ -111,9 +120,35 @@ def test_preemption_concurrency_state_execution(number_child_states=10, number_c
     execute_state(preemption_state)
 
 
+@measure_time
+def test_execution_mode_handling_overhead(number_of_calls=100000, number_child_states=100):
+    """Measures the overhead of the execution engine per transition of a free running state machine"""
+    execution_engine = rafcon.core.singleton.state_machine_execution_engine
+    hierarchy_state = create_hierarchy_state(number_child_states)
+    for state in hierarchy_state.states.values():
+        state.script_text = NOOP_SCRIPT
+    child_state = list(hierarchy_state.states.values())[0]
+    execution_engine.set_execution_mode(StateMachineExecutionStatus.STARTED, notify=False)
+    start = time.time()
+    for _ in range(number_of_calls):
+        execution_engine.handle_execution_mode(hierarchy_state, child_state)
+    duration = time.time() - start
+    execution_engine.set_execution_mode(StateMachineExecutionStatus.STOPPED, notify=False)
+    print("handle_execution_mode: {0:.3f} us per call".format(1e6 * duration / number_of_calls))
+
+    state_counter = execution_engine.state_counter
+    start = time.time()
+    execute_state(hierarchy_state)
+    duration = time.time() - start
+    number_of_transitions = execution_engine.state_counter - state_counter
+    print("Execution of {0} states: {1:.1f} us per transition".format(
+        number_child_states, 1e6 * duration / number_of_transitions))
+
+
 if __name__ == '__main__':
     # test_hierarchy_state_execution(10)
     test_hierarchy_state_execution(100)
+    test_execution_mode_handling_overhead()
     # TODO: state creation takes too long (> 100 seconds) => investigate
     # test_hierarchy_state_execution(1000)
     # test_barrier_concurrency_state_execution(10, 10)
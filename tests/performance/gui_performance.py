@@ -1,3 +1,5 @@
+import time
+
 # local
 from rafcon.utils.timer import measure_time
 from tests import utils as testing_utils
@@ -50,6 +52,34 @@ def test_gui(number_child_states=10, number_childs_per_child=10, barrier=False,
         destroy_gui(caplog)
 
 
+@measure_time
+def test_state_machine_tree_update(number_child_states=5000, number_of_changes=10, caplog=None):
+    """Measures the update of the state machine tree for adding and removing states of a large state machine"""
+    create_gui()
+    from rafcon.core.state_machine import StateMachine
+    from rafcon.core.states.execution_state import ExecutionState
+    from .core_performance import create_hierarchy_state
+    try:
+        state_machine = StateMachine(create_hierarchy_state(number_child_states))
+        add_state_machine_to_manager_model(state_machine)
+        root_state = state_machine.root_state
+
+        def add_and_remove_state():
+            state_id = root_state.add_state(ExecutionState("new_state"))
+            testing_utils.wait_for_gui()
+            root_state.remove_state(state_id)
+            testing_utils.wait_for_gui()
+
+        start = time.time()
+        for _ in range(number_of_changes):
+            testing_utils.call_gui_callback(add_and_remove_state)
+        duration = time.time() - start
+        print("Adding and removing a state of {0} states: {1:.1f} ms".format(
+            number_child_states, 1000 * duration / number_of_changes))
+    finally:
+        destroy_gui(caplog)
+
+
 if __name__ == '__main__':
 
     # global_profiling = True
@@ -73,6 +103,7 @@ if __name__ == '__main__':
     # test_gui(30, 10, True)  # around 57.5 seconds
     # test_gui(10, 20, True)  # around 19.6 seconds
     # test_gui(10, 30, True)  # around 40.6 seconds
+    # test_state_machine_tree_update(5000)
     
     if global_profiling:
         profiler.stop("global")
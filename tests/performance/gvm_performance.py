@@ -0,0 +1,86 @@
+import threading
+import time
+
+from rafcon.core.global_variable_manager import GlobalVariableManager
+
+from rafcon.utils.timer import measure_time
+
+from tests import utils as testing_utils
+
+
+def run_threads(target, number_of_threads, *args):
+    threads = [threading.Thread(target=target, args=(i, ) + args) for i in range(number_of_threads)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.time() - start
+
+
+def access_variables(gvm, number_of_threads, number_of_accesses, shared_key, write_ratio):
+    def access(thread_index):
+        key = 'shared' if shared_key else 'variable_{}'.format(thread_index)
+        for i in range(number_of_accesses):
+            if write_ratio and i % write_ratio == 0:
+                gvm.set_variable(key, {'value': i, 'list': list(range(10))})
+            else:
+                gvm.get_variable(key)
+
+    gvm.reset()
+    for i in range(number_of_threads):
+        gvm.set_variable('variable_{}'.format(i), {'value': 0, 'list': list(range(10))})
+    gvm.set_variable('shared', {'value': 0, 'list': list(range(10))})
+    duration = run_threads(access, number_of_threads)
+    throughput = number_of_threads * number_of_accesses / duration
+    print("{0} threads, {1} key, write ratio 1/{2}: {3:.0f} accesses/s".format(
+        number_of_threads, "shared" if shared_key else "own", write_ratio, throughput))
+    return throughput
+
+
+@measure_time
+def test_contended_get_set_throughput(number_of_threads=8, number_of_accesses=500):
+    gvm = GlobalVariableManager.instance()
+    for shared_read_locks in (False, True):
+        testing_utils.initialize_environment_core(
+            core_config={'GLOBAL_VARIABLE_SHARED_READ_LOCKS': shared_read_locks})
+        try:
+            print("Shared read locks: {}".format(shared_read_locks))
+            for shared_key in (False, True):
+                for write_ratio in (0, 10, 1):
+                    access_variables(gvm, number_of_threads, number_of_accesses, shared_key, write_ratio)
+        finally:
+            gvm.reset()
+            testing_utils.shutdown_environment_only_core()
+
+
+@measure_time
+def test_lock_handover_latency(number_of_handovers=20):
+    """Measures the time until a thread waiting for a locked variable gets access after it was unlocked"""
+    gvm = GlobalVariableManager.instance()
+    gvm.reset()
+    gvm.set_variable('a', 0)
+    latencies = []
+    for i in range(number_of_handovers):
+        access_key = gvm.lock_variable('a')
+        unlock = [None]
+
+        def wait_and_set():
+            gvm.set_variable('a', i)
+            latencies.append(time.time() - unlock[0])
+
+        thread = threading.Thread(target=wait_and_set)
+        thread.start()
+        time.sleep(0.01)
+        unlock[0] = time.time()
+        gvm.unlock_variable('a', access_key)
+        thread.join()
+    gvm.reset()
+    print("Lock handover latency: mean {0:.2f} ms, max {1:.2f} ms".format(
+        1000 * sum(latencies) / len(latencies), 1000 * max(latencies)))
+    assert max(latencies) < 0.05
+
+
+if __name__ == '__main__':
+    test_contended_get_set_throughput()
+    test_lock_handover_latency()
@@ -0,0 +1,48 @@
+import time
+
+# core elements
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.storage import storage
+
+from rafcon.utils.timer import measure_time
+
+from tests import utils as testing_utils
+from tests.performance.core_performance import create_barrier_concurrency_state
+
+
+def save_state_machine(number_child_states=10, number_childs_per_child=10):
+    barrier_state = create_barrier_concurrency_state(number_child_states, number_childs_per_child)
+    state_machine = StateMachine(barrier_state)
+    path = testing_utils.get_unique_temp_path()
+    storage.save_state_machine_to_path(state_machine, path)
+    return path
+
+
+def load_state_machine(path, thread_pool_size, repetitions=3):
+    testing_utils.initialize_environment_core(core_config={'LOAD_SM_THREAD_POOL_SIZE': thread_pool_size})
+    try:
+        start = time.time()
+        for _ in range(repetitions):
+            state_machine = storage.load_state_machine_from_path(path)
+        duration = (time.time() - start) / repetitions
+    finally:
+        testing_utils.shutdown_environment_only_core()
+    print("Loading with a thread pool size of {0}: {1:.3f}s".format(thread_pool_size, duration))
+    return state_machine, duration
+
+
+@measure_time
+def test_parallel_state_machine_loading(number_child_states=10, number_childs_per_child=50):
+    path = save_state_machine(number_child_states, number_childs_per_child)
+    sequential_sm, sequential_duration = load_state_machine(path, 0)
+    parallel_sm, parallel_duration = load_state_machine(path, 8)
+    assert isinstance(parallel_sm.root_state, BarrierConcurrencyState)
+    assert StateMachine.state_machine_to_dict(parallel_sm) == StateMachine.state_machine_to_dict(sequential_sm)
+    assert parallel_sm.root_state == sequential_sm.root_state
+    print("Speedup of parallel loading: {0:.2f}".format(sequential_duration / parallel_duration))
+
+
+if __name__ == '__main__':
+    test_parallel_state_machine_loading(10, 50)
+    # test_parallel_state_machine_loading(50, 100)